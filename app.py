@@ -11,8 +11,9 @@ import os
 from aiogram import Bot, Dispatcher
 
 from handlers import setup_routers
-from database import init_db, close_db
+from database import init_db, close_db, warm_up, run_replica_health_loop
 from middlewares.rate_limit import RateLimitMiddleware
+from utils.misc.spatial_index import load_indexes, run_refresh_loop
 
 
 def setup_logging() -> None:
@@ -38,6 +39,7 @@ async def main() -> None:
     try:
         await init_db()
         logging.info("✅ Database initialized successfully")
+        await warm_up()
     except Exception as e:
         logging.error(f"❌ Database initialization error: {e}")
         return
@@ -58,12 +60,19 @@ async def main() -> None:
     # Setup routers
     setup_routers(dp)
     
+    # Load in-memory spatial indexes for nearest-place lookups
+    await load_indexes()
+    refresh_task = asyncio.create_task(run_refresh_loop())
+    replica_task = asyncio.create_task(run_replica_health_loop())
+    
     try:
         logging.info("🤖 Bot starting...")
         await dp.start_polling(bot)
     except Exception as e:
         logging.error(f"❌ Bot startup error: {e}")
     finally:
+        refresh_task.cancel()
+        replica_task.cancel()
         await close_db()
         await bot.session.close()
         logging.info("👋 Bot stopped")
@@ -0,0 +1,6 @@
+"""
+Benchmarks for AutoCare geo-search.
+
+Every benchmark talks to a local PostgreSQL instance only and works on
+its own scratch tables, so it never touches production data.
+"""
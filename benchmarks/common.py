@@ -0,0 +1,93 @@
+# benchmarks/common.py
+"""
+Helpers shared by the benchmark scripts.
+"""
+import math
+import os
+import subprocess
+from typing import List, Sequence
+from urllib.parse import urlparse
+
+import asyncpg
+from dotenv import load_dotenv
+
+# None: no host in the URL, i.e. a local Unix socket
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", None)
+
+# Database the benchmarks that write places use, next to the local server's own
+SCRATCH_DATABASE = os.getenv("BENCH_SCRATCH_DATABASE", "autocare_bench")
+
+
+def local_database_url() -> str:
+    """
+    Return the benchmark database URL, refusing anything but a local server.
+
+    Uses BENCH_DATABASE_URL, falling back to DATABASE_URL.
+    """
+    load_dotenv()
+    database_url = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not database_url or urlparse(database_url).hostname not in LOCAL_HOSTS:
+        raise SystemExit("Benchmarks only run against a local PostgreSQL (BENCH_DATABASE_URL)")
+    return database_url
+
+
+async def scratch_database_url(database_url: str, name: str = SCRATCH_DATABASE) -> str:
+    """
+    Create the scratch database on the server of ``database_url`` if needed.
+
+    Benchmarks that load places write there instead of the live tables.
+    PostGIS is enabled in it when the source database has it, so the
+    same query strategies are measured.
+
+    Returns:
+        str: ``database_url`` pointing at the scratch database.
+    """
+    parsed = urlparse(database_url)
+    if parsed.path.lstrip("/") == name:
+        raise SystemExit(f"Scratch database {name} must differ from the source database")
+    conn = await asyncpg.connect(database_url)
+    try:
+        postgis = await conn.fetchval("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'postgis')")
+        if not await conn.fetchval("SELECT EXISTS (SELECT 1 FROM pg_database WHERE datname = $1)", name):
+            await conn.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await conn.close()
+
+    scratch_url = parsed._replace(path=f"/{name}").geturl()
+    if postgis:
+        conn = await asyncpg.connect(scratch_url)
+        try:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+        finally:
+            await conn.close()
+    return scratch_url
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(pct / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(latencies_ms: List[float]) -> dict:
+    """p50/p95/p99/mean/max of a list of latencies in milliseconds."""
+    ordered = sorted(latencies_ms)
+    return {
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def git_revision() -> str:
+    """Short git revision of the working tree, or "unknown"."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
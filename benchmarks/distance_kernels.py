@@ -0,0 +1,96 @@
+# benchmarks/distance_kernels.py
+"""
+Compare the scalar ``calc_distance`` loop with the NumPy batch kernel.
+
+For each size, computes distances from one origin to N random places in
+Uzbekistan and selects the 10 nearest, first with a Python loop over
+``calc_distance`` + ``sorted``, then with ``distance_batch.nearest_k``.
+Converting the places to arrays is timed separately for dicts and for
+``Place`` objects (what the crud layer returns). No database is needed.
+
+Usage:
+    python -m benchmarks.distance_kernels --sizes 10000 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Place
+from utils.misc.distance_batch import as_coords, nearest_k
+from utils.misc.get_distance import calc_distance
+
+
+def _best_of(repeat: int, func) -> float:
+    """Best wall time of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(size: int, k: int, repeat: int, seed: int) -> Dict[str, float]:
+    rng = np.random.default_rng(seed)
+    places = [
+        {"lat": float(lat), "lon": float(lon)}
+        for lat, lon in zip(rng.uniform(37.2, 45.6, size), rng.uniform(56.0, 73.1, size))
+    ]
+    place_objects = [
+        Place(
+            id=str(index), name="", lat=p["lat"], lon=p["lon"], address=None, phone=None,
+            services=[], working_days=[], working_hours={}, is_24_7=True,
+            weekday_mask=None, open_min=None, close_min=None, updated_at=None,
+        )
+        for index, p in enumerate(places)
+    ]
+    origin = (41.31, 69.28)
+
+    def scalar() -> List[int]:
+        distances = [calc_distance(origin[0], origin[1], p["lat"], p["lon"]) for p in places]
+        return sorted(range(size), key=distances.__getitem__)[:k]
+
+    convert_ms = _best_of(1, lambda: as_coords(places))
+    convert_places_ms = _best_of(1, lambda: as_coords(place_objects))
+    lats, lons = as_coords(places)
+    place_lats, place_lons = as_coords(place_objects)
+    assert np.array_equal(lats, place_lats) and np.array_equal(lons, place_lons), "conversions disagree"
+
+    def vectorized() -> np.ndarray:
+        return nearest_k(origin[0], origin[1], lats, lons, k)[0]
+
+    assert set(vectorized().tolist()) == set(scalar()), "kernels disagree"
+
+    scalar_ms = _best_of(repeat, scalar)
+    vector_ms = _best_of(repeat, vectorized)
+    return {
+        "size": size,
+        "scalar_ms": round(scalar_ms, 3),
+        "vectorized_ms": round(vector_ms, 3),
+        "dicts_to_arrays_ms": round(convert_ms, 3),
+        "places_to_arrays_ms": round(convert_places_ms, 3),
+        "speedup": round(scalar_ms / vector_ms, 1) if vector_ms else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = [run(size, args.k, args.repeat, args.seed) for size in args.sizes]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
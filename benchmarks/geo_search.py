@@ -0,0 +1,200 @@
+# benchmarks/geo_search.py
+"""
+Geo-search latency and throughput benchmark.
+
+Loads synthetic places (see ``benchmarks/synthetic.py``) through the
+crud layer into a scratch database on the local PostgreSQL
+(``BENCH_SCRATCH_DATABASE``, default ``autocare_bench``), so the live
+tables are never touched. Each search strategy is then measured at
+several dataset sizes and concurrency levels. Results are written as
+JSON so query strategies can be compared across releases.
+
+Crud functions return ``[]`` instead of raising, so failed queries are
+counted from the errors recorded in ``database.metrics``; searches that
+came back empty are reported separately as ``empty_results``.
+
+Strategies:
+    nearby_places          database.get_nearby_places (bounding box / KNN)
+    geohash                database.get_places_by_geohash
+    choose_shortest        choose_shortest without the in-memory index
+                           (adaptive radius + nearby-results cache)
+    choose_shortest_index  choose_shortest with the in-memory index loaded
+
+Usage:
+    python -m benchmarks.geo_search --sizes 10000 100000 1000000 \\
+        --concurrency 1 8 32 --queries 2000 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import git_revision, latency_summary, local_database_url, scratch_database_url
+from benchmarks.synthetic import generate_places, random_origin
+from database import (
+    init_db, close_db,
+    batch_insert_autoservices, batch_insert_carwashes,
+    get_nearby_places, get_places_by_geohash,
+)
+from database import metrics
+from database.connection import get_pool, table_for
+from utils.misc import nearby_cache
+from utils.misc.get_distance import choose_shortest
+from utils.misc.spatial_index import place_indexes
+
+LOAD_CHUNK = 5000
+
+Search = Callable[[float, float, str, int], Awaitable[List[Any]]]
+
+
+async def _nearby(lat: float, lon: float, place_type: str, k: int) -> List[Any]:
+    return await get_nearby_places(lat, lon, radius_km=50.0, place_type=place_type, limit=k)
+
+
+async def _geohash(lat: float, lon: float, place_type: str, k: int) -> List[Any]:
+    return await get_places_by_geohash(lat, lon, place_type=place_type, limit=k)
+
+
+async def _choose(lat: float, lon: float, place_type: str, k: int) -> List[Any]:
+    return await choose_shortest({"lat": lat, "lon": lon}, max_results=k, place_type=place_type)
+
+
+STRATEGIES: Dict[str, Search] = {
+    "nearby_places": _nearby,
+    "geohash": _geohash,
+    "choose_shortest": _choose,
+    "choose_shortest_index": _choose,
+}
+
+
+async def load_places(place_type: str, target: int, loaded: int, seed: int) -> int:
+    """Insert synthetic places until ``target`` rows are present."""
+    insert = batch_insert_autoservices if place_type == "autoservice" else batch_insert_carwashes
+    while loaded < target:
+        count = min(LOAD_CHUNK, target - loaded)
+        chunk = list(generate_places(count, place_type, seed=seed, start=loaded))
+        if not await insert(chunk):
+            raise RuntimeError(f"Failed to load places {loaded}..{loaded + count}")
+        loaded += count
+        print(f"  loaded {loaded}/{target}", end="\r", flush=True)
+    print()
+    return loaded
+
+
+async def remove_places(place_type: str) -> None:
+    """Delete every benchmark row of a place type."""
+    async with get_pool().acquire() as conn:  # pyright: ignore[reportOptionalMemberAccess]
+        await conn.execute(f"DELETE FROM {table_for(place_type)} WHERE id LIKE 'bench\\_%'")
+
+
+async def measure(
+    search: Search,
+    origins: List[Tuple[float, float]],
+    place_type: str,
+    k: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Run every origin through ``search`` with ``concurrency`` workers."""
+    latencies: List[float] = []
+    raised = 0
+    empty = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for origin in origins:
+        queue.put_nowait(origin)
+
+    async def worker() -> None:
+        nonlocal raised, empty
+        while not queue.empty():
+            lat, lon = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                if not await search(lat, lon, place_type, k):
+                    empty += 1
+            except Exception:
+                raised += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    db_errors_before = sum(metrics.error_counts().values())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    db_errors = sum(metrics.error_counts().values()) - db_errors_before
+
+    return {
+        **latency_summary(latencies),
+        "queries": len(latencies),
+        "errors": raised + db_errors,
+        "empty_results": empty,
+        "throughput_qps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--place-type", choices=["autoservice", "carwash"], default="autoservice")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="geo_search_results.json")
+    parser.add_argument("--keep", action="store_true", help="Keep benchmark rows after the run")
+    args = parser.parse_args()
+
+    await init_db(await scratch_database_url(local_database_url()))
+    place_type = args.place_type
+    index = place_indexes[place_type]
+    rnd = random.Random(args.seed)
+    origins = [random_origin(rnd) for _ in range(args.queries)]
+
+    report: Dict[str, Any] = {
+        "revision": git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "place_type": place_type,
+        "queries": args.queries,
+        "k": args.k,
+        "results": [],
+    }
+
+    try:
+        await remove_places(place_type)
+        loaded = 0
+        for size in sorted(args.sizes):
+            print(f"⏳ Loading {size} {place_type} places...")
+            loaded = await load_places(place_type, size, loaded, args.seed)
+
+            for strategy in args.strategies:
+                if strategy == "choose_shortest_index":
+                    await index.load()
+                for concurrency in args.concurrency:
+                    nearby_cache.clear()
+                    result = await measure(STRATEGIES[strategy], origins, place_type, args.k, concurrency)
+                    result.update({"size": size, "strategy": strategy, "concurrency": concurrency})
+                    report["results"].append(result)
+                    print(
+                        f"  {strategy:<22} c={concurrency:<3} "
+                        f"p50={result['p50_ms']}ms p99={result['p99_ms']}ms {result['throughput_qps']} q/s"
+                        f"{' errors=' + str(result['errors']) if result['errors'] else ''}"
+                    )
+                # Other strategies must measure the database path
+                index.loaded = False
+    finally:
+        if not args.keep:
+            await remove_places(place_type)
+        await close_db()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
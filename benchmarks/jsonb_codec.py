@@ -0,0 +1,126 @@
+# benchmarks/jsonb_codec.py
+"""
+Compare JSONB decoding strategies on 10k-row result sets.
+
+Decodes the ``services`` and ``working_hours`` values of synthetic places
+(see ``benchmarks/synthetic.py``) with:
+
+    stdlib   json.loads on every value
+    orjson   orjson.loads on every value (if installed)
+    codec    database.jsonb.decode (fast backend + shared decoded objects)
+
+By default only the decoding is timed, in-process. With ``--fetch`` the
+rows are also loaded into a temporary table on a local PostgreSQL and the
+same strategies are timed end to end as asyncpg type codecs on
+``SELECT services, working_hours`` fetches.
+
+Usage:
+    python -m benchmarks.jsonb_codec --rows 10000
+    python -m benchmarks.jsonb_codec --rows 10000 --fetch
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import asyncpg
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import local_database_url
+from benchmarks.synthetic import generate_places
+from database import jsonb
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _decoders() -> Dict[str, Callable[[str], Any]]:
+    decoders: Dict[str, Callable[[str], Any]] = {"stdlib": json.loads}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    decoders["codec"] = jsonb.decode
+    return decoders
+
+
+def _best_of(repeat: int, func) -> float:
+    """Best wall time of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def synthetic_rows(count: int, seed: int) -> List[Tuple[str, str]]:
+    """``(services, working_hours)`` JSON texts of ``count`` synthetic places."""
+    return [
+        (json.dumps(place["services"]), json.dumps(place["working_hours"]))
+        for place in generate_places(count, "autoservice", seed=seed)
+    ]
+
+
+def run_decode(rows: List[Tuple[str, str]], repeat: int) -> Dict[str, float]:
+    """Time decoding both columns of every row, per strategy."""
+    results = {}
+    for name, decode in _decoders().items():
+        results[f"{name}_ms"] = round(_best_of(repeat, lambda: [(decode(s), decode(h)) for s, h in rows]), 3)
+    return results
+
+
+async def run_fetch(rows: List[Tuple[str, str]], repeat: int) -> Dict[str, float]:
+    """Time ``conn.fetch`` of all rows with each decoder registered as the jsonb codec."""
+    results = {}
+    database_url = local_database_url()
+    for name, decode in _decoders().items():
+        conn = await asyncpg.connect(database_url)
+        try:
+            await conn.set_type_codec(
+                "jsonb", schema="pg_catalog", encoder=jsonb.encode, decoder=decode, format="text"
+            )
+            await conn.execute("CREATE TEMP TABLE bench_jsonb (services JSONB, working_hours JSONB)")
+            await conn.copy_records_to_table(
+                "bench_jsonb", records=[(json.loads(s), json.loads(h)) for s, h in rows]
+            )
+            statement = await conn.prepare("SELECT services, working_hours FROM bench_jsonb")
+            await statement.fetch()  # warm-up
+
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await statement.fetch()
+                best = min(best, time.perf_counter() - start)
+            results[f"{name}_ms"] = round(best * 1000, 3)
+        finally:
+            await conn.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fetch", action="store_true", help="Also time fetches from a local PostgreSQL")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.seed)
+    report: Dict[str, Any] = {
+        "rows": args.rows,
+        "backend": jsonb.backend(),
+        "distinct_values": len({value for row in rows for value in row}),
+        "decode": run_decode(rows, args.repeat),
+    }
+    if args.fetch:
+        report["fetch"] = asyncio.run(run_fetch(rows, args.repeat))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/nearby_sql.py
+"""
+Compare the legacy full-scan nearby query with the bounding-box version.
+
+Fills a scratch table with synthetic places around Uzbekistan, then runs
+both queries under EXPLAIN ANALYZE from random origins and reports rows
+scanned and latency.
+
+Usage:
+    python -m benchmarks.nearby_sql --rows 1000000 --queries 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+from typing import Any, Callable, Dict, List
+
+import asyncpg
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import local_database_url
+from database.queries import QUERIES
+
+TABLE = "bench_nearby_places"
+BENCH_COLUMNS = "id, name, lat, lon"
+
+# The query as it was before the bounding-box prefilter
+LEGACY_QUERY = """
+    SELECT *,
+        (6371 * acos(cos(radians($1)) * cos(radians(lat)) *
+        cos(radians(lon) - radians($2)) + sin(radians($1)) *
+        sin(radians(lat)))) AS distance_km
+    FROM {table}
+    WHERE (6371 * acos(cos(radians($1)) * cos(radians(lat)) *
+        cos(radians(lon) - radians($2)) + sin(radians($1)) *
+        sin(radians(lat)))) < $3
+    ORDER BY distance_km
+    LIMIT 10
+"""
+
+SETUP_SQL = f"""
+DROP TABLE IF EXISTS {TABLE};
+CREATE TABLE {TABLE} (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    lat DOUBLE PRECISION NOT NULL,
+    lon DOUBLE PRECISION NOT NULL
+);
+INSERT INTO {TABLE} (id, name, lat, lon)
+SELECT 'bench_' || g, 'Place ' || g,
+       37.2 + random() * 8.4,
+       56.0 + random() * 17.1
+FROM generate_series(1, $ROWS$) AS g;
+CREATE INDEX idx_{TABLE}_coords ON {TABLE}(lat, lon);
+ANALYZE {TABLE};
+"""
+
+
+def _rows_scanned(plan: Dict[str, Any]) -> int:
+    """Sum rows read by every scan node of an EXPLAIN (FORMAT JSON) plan."""
+    total = 0
+    if "Relation Name" in plan:
+        per_loop = (
+            plan.get("Actual Rows", 0)
+            + plan.get("Rows Removed by Filter", 0)
+            + plan.get("Rows Removed by Index Recheck", 0)
+        )
+        total += per_loop * plan.get("Actual Loops", 1)
+    for child in plan.get("Plans", []):
+        total += _rows_scanned(child)
+    return total
+
+
+async def _measure(
+    conn: asyncpg.Connection,
+    query: str,
+    make_args: Callable[[float, float, float], tuple],
+    origins: List[tuple],
+    radius_km: float,
+) -> Dict[str, float]:
+    latencies = []
+    scanned = []
+    for lat, lon in origins:
+        raw = await conn.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", *make_args(lat, lon, radius_km))
+        result = json.loads(raw)[0]
+        latencies.append(result["Execution Time"])
+        scanned.append(_rows_scanned(result["Plan"]))
+    return {
+        "latency_ms_p50": statistics.median(latencies),
+        "latency_ms_max": max(latencies),
+        "rows_scanned_avg": statistics.mean(scanned),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--radius", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(local_database_url())
+    try:
+        print(f"⏳ Generating {args.rows} places...")
+        await conn.execute(SETUP_SQL.replace("$ROWS$", str(int(args.rows))))
+
+        rnd = random.Random(args.seed)
+        origins = [(41.0 + rnd.uniform(-0.5, 0.5), 69.0 + rnd.uniform(-0.5, 0.5)) for _ in range(args.queries)]
+
+        results = {
+            "legacy": await _measure(
+                conn, LEGACY_QUERY.format(table=TABLE),
+                lambda lat, lon, r: (lat, lon, r), origins, args.radius,
+            ),
+            "bounding_box": await _measure(
+                conn, QUERIES["nearby_places"].format(table=TABLE, columns=BENCH_COLUMNS, filters=""),
+                lambda lat, lon, r: (lat, lon, r, 10), origins, args.radius,
+            ),
+        }
+        print(json.dumps({"rows": args.rows, "radius_km": args.radius, "results": results}, indent=2))
+    finally:
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
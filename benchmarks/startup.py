@@ -0,0 +1,53 @@
+# benchmarks/startup.py
+"""
+Measure database start-up time with and without the schema fingerprint.
+
+Runs ``init_db`` + ``close_db`` repeatedly against a local PostgreSQL,
+first forcing the DDL and backfills on every boot (the old behaviour),
+then letting the ``schema_version`` fingerprint skip them.
+
+Usage:
+    python -m benchmarks.startup --boots 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import latency_summary, local_database_url
+from database import connection
+
+
+async def measure(database_url: str, boots: int, force: bool) -> Dict[str, float]:
+    """Boot the database layer ``boots`` times and summarize the latency."""
+    connection.FORCE_SCHEMA = force
+    latencies: List[float] = []
+    for _ in range(boots):
+        start = time.perf_counter()
+        await connection.init_db(database_url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await connection.close_db()
+    return latency_summary(latencies)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boots", type=int, default=10)
+    args = parser.parse_args()
+
+    database_url = local_database_url()
+    report = {
+        "boots": args.boots,
+        "ddl_every_boot": await measure(database_url, args.boots, force=True),
+        "fingerprint": await measure(database_url, args.boots, force=False),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
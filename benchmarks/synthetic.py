@@ -0,0 +1,92 @@
+# benchmarks/synthetic.py
+"""
+Synthetic place generator with realistic density for Uzbekistan.
+
+Places are clustered around cities with a population-like weight, with a
+small share scattered across the country. Services, working days and
+hours are drawn from the same vocabularies the bot uses.
+"""
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+# (name, lat, lon, weight, spread in degrees)
+CITIES: List[Tuple[str, float, float, float, float]] = [
+    ("Toshkent", 41.311, 69.279, 0.38, 0.09),
+    ("Samarqand", 39.654, 66.976, 0.10, 0.05),
+    ("Namangan", 40.998, 71.672, 0.07, 0.04),
+    ("Andijon", 40.783, 72.344, 0.07, 0.04),
+    ("Farg'ona", 40.389, 71.783, 0.06, 0.04),
+    ("Buxoro", 39.767, 64.421, 0.06, 0.04),
+    ("Qarshi", 38.860, 65.790, 0.05, 0.04),
+    ("Nukus", 42.460, 59.610, 0.04, 0.04),
+    ("Urganch", 41.550, 60.630, 0.04, 0.03),
+    ("Termiz", 37.224, 67.278, 0.03, 0.03),
+    ("Jizzax", 40.116, 67.842, 0.03, 0.03),
+    ("Navoiy", 40.103, 65.374, 0.03, 0.03),
+    ("Guliston", 40.490, 68.784, 0.02, 0.03),
+]
+
+# Share of places scattered outside the cities (roadside services)
+RURAL_SHARE = 0.08
+COUNTRY_BBOX = (37.2, 45.6, 56.0, 73.1)  # lat_min, lat_max, lon_min, lon_max
+
+AUTOSERVICE_SERVICES = [
+    "Elektrik", "Kuzov tamiri", "Dvigatel tamiri", "Vulkanizatsiya",
+    "Razval", "Tonirovka", "Shumka", "Universal",
+]
+
+CARWASH_SERVICES = [
+    "Tashqi yuvish", "Ichki tozalash", "Polirovka",
+    "Kimyoviy tozalash", "Dvigatel yuvish", "Quruq tozalash",
+    "Salon tozalash", "Disk tozalash",
+]
+
+HOURS = [
+    ("08:00", "18:00"), ("09:00", "20:00"), ("09:00", "18:00"),
+    ("10:00", "22:00"), ("07:00", "23:00"), ("20:00", "06:00"),
+]
+
+
+def _location(rnd: random.Random) -> Tuple[float, float]:
+    if rnd.random() < RURAL_SHARE:
+        lat_min, lat_max, lon_min, lon_max = COUNTRY_BBOX
+        return rnd.uniform(lat_min, lat_max), rnd.uniform(lon_min, lon_max)
+    _, lat, lon, _, spread = rnd.choices(CITIES, weights=[c[3] for c in CITIES])[0]
+    return rnd.gauss(lat, spread), rnd.gauss(lon, spread)
+
+
+def random_origin(rnd: random.Random) -> Tuple[float, float]:
+    """A user location drawn from the same density as the places."""
+    return _location(rnd)
+
+
+def generate_places(count: int, place_type: str = "autoservice", seed: int = 42, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield ``count`` synthetic places ready for the crud insert functions.
+
+    Args:
+        count: Number of places to generate
+        place_type: "autoservice" or "carwash" (selects the service vocabulary)
+        seed: Random seed; the same seed and start give the same places
+        start: Index of the first place, so larger datasets extend smaller ones
+
+    Ids are prefixed with ``bench_`` so benchmark rows can be removed later.
+    """
+    services = AUTOSERVICE_SERVICES if place_type == "autoservice" else CARWASH_SERVICES
+    for index in range(start, start + count):
+        rnd = random.Random(f"{seed}:{place_type}:{index}")
+        lat, lon = _location(rnd)
+        is_24_7 = rnd.random() < 0.12
+        start_time, end_time = rnd.choice(HOURS)
+        yield {
+            "id": f"bench_{place_type}_{index}",
+            "name": f"Bench {place_type} {index}",
+            "lat": lat,
+            "lon": lon,
+            "address": f"Sintetik manzil {index}",
+            "phone": f"+9989{rnd.randint(0, 99999999):08d}",
+            "services": rnd.sample(services, rnd.randint(1, len(services))),
+            "working_days": sorted(rnd.sample(range(7), rnd.randint(5, 7))),
+            "working_hours": {} if is_24_7 else {"start": start_time, "end": end_time},
+            "is_24_7": is_24_7,
+        }
@@ -2,20 +2,29 @@
 Database module for AutoCare bot.
 Provides PostgreSQL database operations with connection pooling.
 """
-from .connection import init_db, close_db, get_connection, release_connection
+from .connection import init_db, close_db, warm_up, get_connection, release_connection
 from .crud import (
     insert_autoservice, insert_carwash,
     get_all_autoservices, get_all_carwashes,
-    get_nearby_places, search_places_by_service,
-    batch_insert_autoservices, batch_insert_carwashes
+    get_nearby_places, get_nearby_places_after, get_nearby_places_any_type, get_places_by_geohash, get_places_updated_since,
+    iter_places, get_place_by_id, search_places_by_service,
+    batch_insert_autoservices, batch_insert_carwashes,
+    add_upsert_listener
 )
-from .models import CREATE_TABLES_SQL
+from .models import CREATE_TABLES_SQL, Place
+from .statements import get_statement_stats
+from .metrics import snapshot as get_query_metrics
+from .replicas import acquire_read, run_read, get_replica_stats, run_replica_health_loop
 
 __all__ = [
-    "init_db", "close_db", "get_connection", "release_connection",
+    "init_db", "close_db", "warm_up", "get_connection", "release_connection",
     "insert_autoservice", "insert_carwash", 
     "get_all_autoservices", "get_all_carwashes",
-    "get_nearby_places", "search_places_by_service",
+    "get_nearby_places", "get_nearby_places_after", "get_nearby_places_any_type", "get_places_by_geohash", "get_places_updated_since",
+    "iter_places", "get_place_by_id", "search_places_by_service",
     "batch_insert_autoservices", "batch_insert_carwashes",
-    "CREATE_TABLES_SQL"
+    "add_upsert_listener",
+    "get_statement_stats", "get_query_metrics",
+    "acquire_read", "run_read", "get_replica_stats", "run_replica_health_loop",
+    "CREATE_TABLES_SQL", "Place"
 ]
\ No newline at end of file
@@ -1,7 +1,10 @@
 import os
+import time
+import asyncio
+import hashlib
 import asyncpg
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,13 +14,40 @@ logger = logging.getLogger(__name__)
 DATABASE_URL = os.getenv("DATABASE_URL")
 print(f"Loaded DATABASE_URL: {DATABASE_URL}")
 
+# Pool settings
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "60"))
+
 # Global connection pool
 pool: Optional[asyncpg.Pool] = None
 
+# Serializes initialization so concurrent first requests create one pool
+_init_lock = asyncio.Lock()
+
+# Detected once per init_db; enables the KNN search path in crud
+postgis_enabled: bool = False
+
+# Opt-in migration of the per-type tables into the partitioned "places" table
+MIGRATE_TO_UNIFIED = os.getenv("DB_UNIFIED_PLACES", "").lower() in ("1", "true", "yes")
+
+# Detected once per init_db: True when the partitioned "places" table is in use
+unified_places: bool = False
+
+# Advisory lock held while a process applies DDL (arbitrary app-wide key)
+SCHEMA_LOCK_KEY = 727_001
+SCHEMA_NAME = "places"
+
+# Apply the DDL even when the fingerprint matches (e.g. after manual schema changes)
+FORCE_SCHEMA = os.getenv("DB_FORCE_SCHEMA", "").lower() in ("1", "true", "yes")
+
 async def init_db(database_url: Optional[str] = None) -> None:
     """
     Initialize database and create connection pool.
     
+    Only one initialization runs at a time; once the pool exists, further
+    calls return immediately.
+    
     Args:
         database_url: PostgreSQL connection URL. If not provided, uses DATABASE_URL env var.
         
@@ -25,7 +55,27 @@ async def init_db(database_url: Optional[str] = None) -> None:
         ValueError: If database URL is not provided or invalid.
         asyncpg.PostgresError: If database connection or table creation fails.
     """
-    global pool
+    async with _init_lock:
+        if pool is not None:
+            return
+        await _initialize(database_url)
+
+async def ensure_pool() -> asyncpg.Pool:
+    """
+    Return the connection pool, initializing the database on first use.
+    
+    Raises:
+        RuntimeError: If the pool could not be created.
+    """
+    if pool is None:
+        await init_db()
+    if pool is None:
+        raise RuntimeError("Failed to initialize database connection pool")
+    return pool
+
+async def _initialize(database_url: Optional[str]) -> None:
+    """Run schema setup and create the pools (called with _init_lock held)."""
+    global pool, postgis_enabled
     db_url = database_url or DATABASE_URL
     
     if not db_url:
@@ -41,27 +91,213 @@ async def init_db(database_url: Optional[str] = None) -> None:
         logger.error(f"❌ {error_msg}")
         raise ValueError(error_msg)
     
+    from .jsonb import register_jsonb_codec
+    from .statements import configure
+    from .replicas import READ_URLS, open_replicas
+    
     try:
-        pool = await asyncpg.create_pool(
-            db_url,
-            min_size=1,
-            max_size=10,
-            command_timeout=60
-        )
+        # Schema work runs on a standalone connection first: pool connections
+        # prepare their statements on creation, so the tables must exist.
+        started = time.perf_counter()
+        conn = await asyncpg.connect(db_url)
+        try:
+            await register_jsonb_codec(conn)
+            applied = await _setup_schema(conn)
+        finally:
+            await conn.close()
+        schema_ms = (time.perf_counter() - started) * 1000
+        
+        configure(postgis_enabled, unified_places)
+        pool = await _create_pool(db_url)
         
-        from .models import CREATE_TABLES_SQL
-        async with pool.acquire() as conn:
-            await conn.execute(CREATE_TABLES_SQL)
-            logger.info("✅ Database tables created/verified successfully")
+        if READ_URLS:
+            await open_replicas(READ_URLS, _create_pool)
+        
+        logger.info(
+            f"✅ Database ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+            f"(schema {'applied' if applied else 'unchanged'}: {schema_ms:.0f} ms)"
+        )
             
     except Exception as e:
         logger.error(f"❌ Database initialization error: {e}")
         pool = None
         raise
 
+async def _setup_schema(conn: asyncpg.Connection) -> bool:
+    """
+    Detect the optional features and bring the schema up to date.
+    
+    The DDL (and the backfills that follow it) only runs when the
+    fingerprint of the schema SQL differs from the one recorded in
+    ``schema_version``. Applying happens under an advisory lock, so bot
+    processes starting together apply it once and the others skip it.
+    
+    The unified ``places`` table is used when it already exists, or when
+    DB_UNIFIED_PLACES is set; in that case existing per-type tables are
+    migrated once and replaced by compatibility views.
+    
+    Returns:
+        bool: True if the DDL was applied, False if it was unchanged.
+    """
+    global postgis_enabled, unified_places
+    from .models import (
+        CREATE_TABLES_SQL, POSTGIS_TABLES_SQL, UNIFIED_TABLES_SQL, COMPAT_VIEWS_SQL, UNIFIED_POSTGIS_SQL,
+        SCHEMA_VERSION_SQL,
+    )
+    from .queries import QUERIES
+    
+    unified_places = MIGRATE_TO_UNIFIED or await conn.fetchval(
+        "SELECT to_regclass('places') IS NOT NULL"
+    )
+    postgis_enabled = await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'postgis')"
+    )
+    if postgis_enabled:
+        logger.info("✅ PostGIS detected, KNN search enabled")
+    
+    if unified_places:
+        ddl = [UNIFIED_TABLES_SQL, COMPAT_VIEWS_SQL] + ([UNIFIED_POSTGIS_SQL] if postgis_enabled else [])
+    else:
+        ddl = [CREATE_TABLES_SQL] + ([POSTGIS_TABLES_SQL] if postgis_enabled else [])
+    # The service aliases are part of the fingerprint, so changing them reruns backfill_services
+    from .services import SERVICE_ALIASES
+    fingerprint = hashlib.sha256("\n".join(ddl + [repr(sorted(SERVICE_ALIASES.items()))]).encode()).hexdigest()
+    
+    async def stored_fingerprint() -> Optional[str]:
+        if not await conn.fetchval("SELECT to_regclass('schema_version') IS NOT NULL"):
+            return None
+        return await conn.fetchval(QUERIES["schema_fingerprint"], SCHEMA_NAME)
+    
+    if not FORCE_SCHEMA and await stored_fingerprint() == fingerprint:
+        logger.info("ℹ️ Schema unchanged, DDL skipped")
+        return False
+    
+    await conn.execute("SELECT pg_advisory_lock($1)", SCHEMA_LOCK_KEY)
+    try:
+        # Another process may have applied it while we waited for the lock
+        if not FORCE_SCHEMA and await stored_fingerprint() == fingerprint:
+            logger.info("ℹ️ Schema applied by another process, DDL skipped")
+            return False
+        await _apply_schema(conn)
+        
+        from .crud import backfill_schedules, backfill_geohashes, backfill_services
+        backfilled = await backfill_schedules(conn)
+        if backfilled:
+            logger.info(f"✅ Schedules backfilled for {backfilled} places")
+        backfilled = await backfill_geohashes(conn)
+        if backfilled:
+            logger.info(f"✅ Geohashes backfilled for {backfilled} places")
+        backfilled = await backfill_services(conn)
+        if backfilled:
+            logger.info(f"✅ Service names normalized for {backfilled} places")
+        
+        await conn.execute(SCHEMA_VERSION_SQL)
+        await conn.execute(QUERIES["set_schema_fingerprint"], SCHEMA_NAME, fingerprint)
+        return True
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", SCHEMA_LOCK_KEY)
+
+async def _apply_schema(conn: asyncpg.Connection) -> None:
+    """Run the DDL of the detected schema mode (idempotent)."""
+    from .models import (
+        CREATE_TABLES_SQL, POSTGIS_TABLES_SQL, UNIFIED_TABLES_SQL, MIGRATE_TO_UNIFIED_SQL,
+        COMPAT_VIEWS_SQL, UNIFIED_POSTGIS_SQL, PLACE_TYPES,
+    )
+    
+    if unified_places:
+        # relkind 'r': still a plain table from the per-type schema
+        legacy = await conn.fetchval(
+            "SELECT count(*) FROM pg_class WHERE oid = ANY(ARRAY[to_regclass('autoservice'), to_regclass('carwash')]) "
+            "AND relkind = 'r'"
+        )
+        async with conn.transaction():
+            if legacy:
+                # Bring the old tables up to the current columns before copying
+                await conn.execute(CREATE_TABLES_SQL)
+            await conn.execute(UNIFIED_TABLES_SQL)
+            if legacy:
+                for place_type in PLACE_TYPES:
+                    await conn.execute(MIGRATE_TO_UNIFIED_SQL.format(table=place_type))
+                    logger.info(f"✅ {place_type} migrated into places (old table kept as {place_type}_legacy)")
+            await conn.execute(COMPAT_VIEWS_SQL)
+        logger.info("✅ Unified places table created/verified successfully")
+    else:
+        await conn.execute(CREATE_TABLES_SQL)
+        logger.info("✅ Database tables created/verified successfully")
+    
+    if postgis_enabled:
+        await conn.execute(UNIFIED_POSTGIS_SQL if unified_places else POSTGIS_TABLES_SQL)
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Pool ``init`` callback: register codecs, then prepare statements."""
+    from .jsonb import register_jsonb_codec
+    from .statements import prepare_statements
+    # Codecs first: prepared statements keep the codecs they were built with
+    await register_jsonb_codec(conn)
+    await prepare_statements(conn)
+
+async def _create_pool(db_url: str) -> asyncpg.Pool:
+    """Create a pool whose connections carry the codecs and prepared statements."""
+    from .statements import statement_cache_size
+    return await asyncpg.create_pool(
+        db_url,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        command_timeout=COMMAND_TIMEOUT,
+        statement_cache_size=statement_cache_size(),
+        # Statements prepared by _init_connection must not expire from the cache
+        # (default 300 s) and be re-prepared lazily on the hot path
+        max_cached_statement_lifetime=0,
+        init=_init_connection,
+    )
+
+async def warm_up() -> Dict[str, Any]:
+    """
+    Open and verify pool connections before traffic arrives.
+    
+    Acquires ``DB_POOL_MIN_SIZE`` connections at once, so each is opened
+    and has its statements prepared, then runs a canary query on every
+    connection and one real search statement per place type. Finally one
+    connection is acquired again and runs a search, which proves named
+    statements survive a release back to the pool.
+    
+    Returns:
+        Dict[str, Any]: Number of connections warmed and elapsed milliseconds.
+        
+    Raises:
+        asyncpg.PostgresError: If the canary queries fail.
+    """
+    from .statements import PLACE_TYPES, fetch, statement_name
+    
+    started = time.perf_counter()
+    current = await ensure_pool()
+    connections = [await current.acquire() for _ in range(max(POOL_MIN_SIZE, 1))]
+    try:
+        for conn in connections:
+            await conn.fetchval("SELECT 1")
+        # Tashkent center, 1 km: exercises the prepared search path end to end
+        for place_type in PLACE_TYPES:
+            await fetch(connections[0], statement_name("nearby_places", place_type), 41.311, 69.279, 1.0, 1)
+    finally:
+        for conn in connections:
+            await current.release(conn)
+    # Released connections must still run named statements (a statement
+    # bound to a single acquisition would only fail from here on)
+    async with current.acquire() as conn:
+        await fetch(conn, statement_name("nearby_places", PLACE_TYPES[0]), 41.311, 69.279, 1.0, 1)
+    
+    result = {
+        "connections": len(connections),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"✅ Database pool warmed up: {result}")
+    return result
+
 async def close_db() -> None:
     """Close database connection pool gracefully."""
     global pool
+    from .replicas import close_replicas
+    await close_replicas()
     if pool:
         await pool.close()
         pool = None
@@ -77,12 +313,7 @@ async def get_connection() -> asyncpg.Connection:
     Raises:
         RuntimeError: If database pool is not initialized.
     """
-    global pool
-    if pool is None:
-        await init_db()
-    if pool is None:
-        raise RuntimeError("Failed to initialize database connection pool")
-    return await pool.acquire()
+    return await (await ensure_pool()).acquire()
 
 async def release_connection(conn: asyncpg.Connection) -> None:
     """
@@ -96,4 +327,17 @@ async def release_connection(conn: asyncpg.Connection) -> None:
 
 def get_pool() -> Optional[asyncpg.Pool]:
     """Get the current connection pool."""
-    return pool
\ No newline at end of file
+    return pool
+
+def has_postgis() -> bool:
+    """Return True if the PostGIS extension was detected during init_db."""
+    return postgis_enabled
+
+def uses_unified_places() -> bool:
+    """Return True if places live in the partitioned ``places`` table."""
+    return unified_places
+
+def table_for(place_type: str) -> str:
+    """Name of the table to read and write places of one type."""
+    from .models import place_table
+    return place_table(place_type, unified_places)
\ No newline at end of file
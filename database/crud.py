@@ -1,12 +1,43 @@
-import json
 import logging
-from typing import Dict, Any, List
-from .connection import get_pool
-from .models import REQUIRED_FIELDS
-from .queries import QUERIES
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, List, Optional, Callable, Sequence, Union
+from .connection import ensure_pool, has_postgis, table_for, uses_unified_places
+from .replicas import acquire_read, run_read
+from .models import PLACE_TYPES, REQUIRED_FIELDS, Place
+from .queries import QUERIES, PLACE_COLUMNS, SELECTABLE_COLUMNS
+from .schedule import compile_schedule, local_clock
+from .services import SERVICE_ALIASES, normalize_services
+from .statements import statement_name
+from . import geohash, jsonb, metrics, statements
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per server-side cursor round trip when streaming
+STREAM_CHUNK_SIZE = 1000
+
+# Callbacks run after a place is inserted or updated: (place_type, data).
+# data is None after a bulk upsert, meaning any place of that type changed.
+_upsert_listeners: List[Callable[[str, Optional[Dict[str, Any]]], Any]] = []
+
+def add_upsert_listener(listener: Callable[[str, Optional[Dict[str, Any]]], Any]) -> None:
+    """
+    Register a callback to run after every successful place upsert.
+    
+    Used by in-memory caches to invalidate entries affected by the change.
+    The callback receives ``(place_type, data)``; ``data`` is None after a
+    large bulk upsert.
+    """
+    _upsert_listeners.append(listener)
+
+def _notify_upsert(place_type: str, data: Optional[Dict[str, Any]]) -> None:
+    """Run upsert listeners; a failing listener never fails the write."""
+    for listener in _upsert_listeners:
+        try:
+            listener(place_type, data)
+        except Exception as e:
+            logger.error(f"❌ Upsert listener error: {e}")
+
 async def insert_autoservice(data: Dict[str, Any]) -> bool:
     """Insert or update an autoservice in the database."""
     return await _insert_place(data, "autoservice")
@@ -26,11 +57,7 @@ async def _insert_place(data: Dict[str, Any], place_type: str) -> bool:
     Returns:
         bool: True if successful, False otherwise.
     """
-    pool = get_pool()
-    if pool is None:
-        from .connection import init_db
-        await init_db()
-        pool = get_pool()
+    pool = await ensure_pool()
     
     # Validate required fields
     required_fields = REQUIRED_FIELDS.get(place_type, [])
@@ -39,75 +66,264 @@ async def _insert_place(data: Dict[str, Any], place_type: str) -> bool:
             logger.error(f"❌ Missing required field: {field}")
             return False
     
-    query = QUERIES[f"insert_{place_type}"]
+    weekday_mask, open_min, close_min = compile_schedule(
+        data.get("working_days", []),
+        data.get("working_hours", {}),
+        bool(data.get("is_24_7", False)),
+    )
     
+    name = statement_name("insert_place", place_type)
     try:
-        async with pool.acquire() as conn: # pyright: ignore[reportOptionalMemberAccess]
-            await conn.execute(
-                query,
+        async with metrics.acquire(pool, name) as conn:
+            await statements.fetch(
+                conn,
+                name,
                 data["id"],
                 data["name"],
                 float(data["lat"]),
                 float(data["lon"]),
                 data.get("address"),
                 data.get("phone"),
-                data.get("services", []),
+                normalize_services(data.get("services", [])),
                 data.get("working_days", []),
                 data.get("working_hours", {}),
                 bool(data.get("is_24_7", False)),
+                weekday_mask,
+                open_min,
+                close_min,
+                geohash.encode(float(data["lat"]), float(data["lon"])),
             )
-            return True
+        _notify_upsert(place_type, data)
+        return True
     except Exception as e:
         logger.error(f"❌ Error inserting {place_type}: {e}")
         return False
 
-async def get_all_autoservices() -> List[Dict[str, Any]]:
+async def backfill_schedules(conn) -> int:
+    """
+    Fill the compact schedule columns for rows written before they existed.
+    
+    Args:
+        conn: Open connection (called from init_db before the pool is in use)
+        
+    Returns:
+        int: Number of rows updated.
+    """
+    updated = 0
+    for place_type in ("autoservice", "carwash"):
+        rows = await conn.fetch(QUERIES["places_missing_schedule"].format(table=table_for(place_type)))
+        if not rows:
+            continue
+        values = [
+            (row["id"], *compile_schedule(row["working_days"], row["working_hours"], bool(row["is_24_7"])))
+            for row in rows
+        ]
+        await conn.executemany(QUERIES["update_schedule"].format(table=table_for(place_type)), values)
+        updated += len(values)
+    return updated
+
+async def backfill_services(conn) -> int:
+    """
+    Rewrite service lists stored before names were normalized on write
+    (emoji-prefixed partner labels, alias wording).
+    
+    Args:
+        conn: Open connection (called from init_db before the pool is in use)
+        
+    Returns:
+        int: Number of rows updated.
+    """
+    updated = 0
+    for place_type in ("autoservice", "carwash"):
+        rows = await conn.fetch(
+            QUERIES["places_unnormalized_services"].format(table=table_for(place_type)),
+            list(SERVICE_ALIASES),
+        )
+        if not rows:
+            continue
+        values = [(row["id"], normalize_services(row["services"])) for row in rows]
+        await conn.executemany(QUERIES["update_services"].format(table=table_for(place_type)), values)
+        updated += len(values)
+    return updated
+
+async def backfill_geohashes(conn) -> int:
+    """
+    Fill the geohash column for rows written before it existed.
+    
+    Args:
+        conn: Open connection (called from init_db before the pool is in use)
+        
+    Returns:
+        int: Number of rows updated.
+    """
+    updated = 0
+    for place_type in ("autoservice", "carwash"):
+        rows = await conn.fetch(QUERIES["places_missing_geohash"].format(table=table_for(place_type)))
+        if not rows:
+            continue
+        values = [(row["id"], geohash.encode(row["lat"], row["lon"])) for row in rows]
+        await conn.executemany(QUERIES["update_geohash"].format(table=table_for(place_type)), values)
+        updated += len(values)
+    return updated
+
+async def get_all_autoservices() -> List[Place]:
     """Retrieve all autoservices from the database."""
     return await _get_all_places("autoservice")
 
-async def get_all_carwashes() -> List[Dict[str, Any]]:
+async def get_all_carwashes() -> List[Place]:
     """Retrieve all carwashes from the database."""
     return await _get_all_places("carwash")
 
-async def _get_all_places(place_type: str) -> List[Dict[str, Any]]:
+async def _get_all_places(place_type: str) -> List[Place]:
     """Generic function to retrieve all places of a specific type."""
-    pool = get_pool()
-    if pool is None:
-        from .connection import init_db
-        await init_db()
-        pool = get_pool()
-    
-    query = f"SELECT * FROM {place_type}"
+    places: List[Place] = []
     try:
-        async with pool.acquire() as conn:  # pyright: ignore[reportOptionalMemberAccess]
-            rows = await conn.fetch(query)
-            return [dict(row) for row in rows]
+        async for chunk in iter_places(place_type):
+            places.extend(chunk)
+        return places
     except Exception as e:
         logger.error(f"❌ Error fetching {place_type}s: {e}")
         return []
 
-async def get_nearby_places(lat: float, lon: float, radius_km: float = 50.0, place_type: str = "autoservice") -> List[Dict[str, Any]]:
+async def iter_places(
+    place_type: str,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None,
+    updated_since: Optional[datetime] = None,
+) -> AsyncIterator[Union[List[Place], List[Dict[str, Any]]]]:
     """
-    Find nearby places within a specified radius using Haversine formula.
+    Stream places in chunks from a server-side cursor.
+    
+    The cursor runs inside a transaction on one pooled connection, so
+    memory use is bounded by ``chunk_size`` whatever the table size. The
+    connection is held until the iteration finishes; consume the iterator
+    to the end or close it (``aclose()``) to release it.
+    
+    Args:
+        place_type: Type of place ("autoservice" or "carwash")
+        chunk_size: Rows fetched per round trip
+        columns: Column names to project. By default every Place column
+            is selected and chunks contain Place objects; with a
+            projection they contain dicts of the requested columns.
+        updated_since: Only rows with ``updated_at`` strictly greater
+        
+    Yields:
+        List[Place] or List[Dict[str, Any]]: Up to ``chunk_size`` rows.
+        
+    Raises:
+        ValueError: If place_type, chunk_size or a column name is invalid.
+        asyncpg.PostgresError: If the query fails mid-stream; a partial
+            stream must not look complete, so errors are not swallowed.
+    """
+    if place_type not in ("autoservice", "carwash"):
+        logger.error(f"❌ Invalid place_type: {place_type}")
+        raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if columns is not None:
+        unknown = [column for column in columns if column not in SELECTABLE_COLUMNS]
+        if unknown or not columns:
+            logger.error(f"❌ Invalid columns: {unknown}")
+            raise ValueError(f"Invalid columns: {unknown}. Allowed: {sorted(SELECTABLE_COLUMNS)}")
+    
+    query = QUERIES["stream_places"].format(
+        table=table_for(place_type), columns=", ".join(columns) if columns else PLACE_COLUMNS
+    )
+    name = f"stream_places:{place_type}"
+    async with acquire_read(name) as conn:
+        async with conn.transaction():
+            cursor = await conn.cursor(query, updated_since)
+            while True:
+                async with metrics.timed(name) as timer:
+                    rows = await cursor.fetch(chunk_size)
+                    timer.rows = len(rows)
+                if not rows:
+                    break
+                if columns:
+                    yield [dict(row) for row in rows]
+                else:
+                    yield [Place.from_record(row) for row in rows]
+                if len(rows) < chunk_size:
+                    break
+
+async def get_places_updated_since(place_type: str, since: Optional[datetime] = None) -> List[Place]:
+    """
+    Retrieve places changed after a given timestamp.
+
+    Used by the in-memory spatial index for incremental refreshes driven
+    by the ``updated_at`` column. Always reads from the primary, so the
+    refresh watermark never trails a lagging replica.
+
+    Args:
+        place_type: Type of place ("autoservice" or "carwash")
+        since: Only return rows with ``updated_at`` strictly greater than this
+
+    Returns:
+        List[Place]: Changed places ordered by ``updated_at``.
+    """
+    if place_type not in ("autoservice", "carwash"):
+        logger.error(f"❌ Invalid place_type: {place_type}")
+        raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
+
+    pool = await ensure_pool()
+
+    name = statement_name("places_updated_since", place_type)
+    try:
+        async with metrics.acquire(pool, name) as conn:
+            rows = await statements.fetch(conn, name, since)
+            return [Place.from_record(row) for row in rows]
+    except Exception as e:
+        logger.error(f"❌ Error fetching updated {place_type}s: {e}")
+        return []
+
+def _search_filter_args(args: List[Any], service: Optional[str], open_now: bool) -> None:
+    """
+    Append the optional filter parameters of the proximity queries.
+    
+    The order (service, then the open-now clock) matches the placeholders
+    rendered by ``statements.filter_sql``.
+    """
+    if service:
+        args.append([service])
+    if open_now:
+        weekday, minute = local_clock()
+        args.extend([1 << weekday, minute, 1 << ((weekday - 1) % 7)])
+
+async def get_nearby_places(
+    lat: float,
+    lon: float,
+    radius_km: float = 50.0,
+    place_type: str = "autoservice",
+    service: Optional[str] = None,
+    open_now: bool = False,
+    limit: int = 10,
+    knn: bool = True,
+) -> List[Place]:
+    """
+    Find nearby places within a specified radius.
+    
+    Uses PostGIS KNN ordering when the extension is installed and
+    ``knn`` is set, and the bounding-box + Haversine query otherwise.
+    KNN ranks by spheroidal distance; pass ``knn=False`` when results
+    must rank like ``calc_distance`` and ``get_nearby_places_after``
+    (the in-memory index, keyset paging). When ``service`` is given,
+    the GIN index on ``services`` is combined with the distance ordering
+    in the same query. ``open_now`` evaluates the precomputed weekday
+    mask and opening minutes in SQL, without decoding ``working_hours``.
     
     Args:
         lat: User's latitude
         lon: User's longitude
         radius_km: Search radius in kilometers (default: 50.0)
         place_type: Type of place to search ("autoservice" or "carwash")
+        service: Only return places offering this service (optional)
+        open_now: Only return places open at the current local time
+        limit: Maximum number of places to return (default: 10)
+        knn: Use the PostGIS KNN query when available (default: True)
         
     Returns:
-        List[Dict[str, Any]]: List of nearby places sorted by distance.
+        List[Place]: List of nearby places sorted by distance.
     """
-    pool = get_pool()
-    if pool is None:
-        from .connection import init_db
-        await init_db()
-        pool = get_pool()
-        if pool is None:
-            logger.error("❌ Database pool not initialized")
-            return []
-    
     # Validate inputs
     if place_type not in ("autoservice", "carwash"):
         logger.error(f"❌ Invalid place_type: {place_type}")
@@ -120,50 +336,332 @@ async def get_nearby_places(lat: float, lon: float, radius_km: float = 50.0, pla
         logger.error("❌ Invalid longitude provided")
         raise ValueError(f"Invalid longitude. Must be between -180 and 180")
     
-    query = QUERIES["nearby_places"].format(table=place_type)
+    args: List[Any] = [lat, lon, radius_km, limit]
+    _search_filter_args(args, service, open_now)
+    query = "nearby_places" if knn or not has_postgis() else "nearby_places_haversine"
+    name = statement_name(query, place_type, bool(service), open_now)
     
     try:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(query, lat, lon, radius_km)
-            return [dict(row) for row in rows]
+        rows = await run_read(name, lambda conn: statements.fetch(conn, name, *args))
+        return [Place.from_record(row) for row in rows]
     except Exception as e:
         logger.error(f"❌ Error finding nearby places: {e}")
         return []
 
-async def search_places_by_service(service_name: str, place_type: str = "autoservice") -> List[Dict[str, Any]]:
+async def get_nearby_places_after(
+    lat: float,
+    lon: float,
+    after_mm: int,
+    after_id: str,
+    radius_km: float = 50.0,
+    place_type: str = "autoservice",
+    service: Optional[str] = None,
+    open_now: bool = False,
+    limit: int = 10,
+) -> List[Place]:
+    """
+    Next page of nearby places after a keyset cursor.
+    
+    Places are ordered by ``(distance in whole millimetres, id)``; only
+    places strictly after ``(after_mm, after_id)`` are returned, so pages
+    never overlap and no OFFSET is scanned. Distances are Haversine, as in
+    ``utils.misc.get_distance.calc_distance``, so a cursor computed there
+    matches the SQL ordering.
+    
+    Args:
+        lat: Origin latitude (the same for every page)
+        lon: Origin longitude
+        after_mm: Distance of the last shown place, ``floor(km * 1e6)``
+        after_id: ID of the last shown place
+        radius_km: Search radius in kilometers (default: 50.0)
+        place_type: Type of place to search ("autoservice" or "carwash")
+        service: Only return places offering this service (optional)
+        open_now: Only return places open at the current local time
+        limit: Page size (default: 10)
+        
+    Returns:
+        List[Place]: Following places sorted by distance.
+    """
+    if place_type not in ("autoservice", "carwash"):
+        logger.error(f"❌ Invalid place_type: {place_type}")
+        raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
+    
+    args: List[Any] = [lat, lon, radius_km, limit, after_mm, after_id]
+    _search_filter_args(args, service, open_now)
+    name = statement_name("nearby_places_after", place_type, bool(service), open_now)
+    
+    try:
+        rows = await run_read(name, lambda conn: statements.fetch(conn, name, *args))
+        return [Place.from_record(row) for row in rows]
+    except Exception as e:
+        logger.error(f"❌ Error fetching next nearby page: {e}")
+        return []
+
+async def get_places_by_geohash(
+    lat: float,
+    lon: float,
+    place_type: str = "autoservice",
+    limit: int = 10,
+    service: Optional[str] = None,
+    open_now: bool = False,
+    precisions: tuple = (7, 6, 5, 4),
+) -> List[Place]:
+    """
+    Find nearest places through the geohash column.
+    
+    Queries the user's geohash cell plus its 8 neighbours with btree prefix
+    ranges, starting at the finest precision. The precision is widened
+    until ``limit`` places are found within the radius the 3x3 block is
+    guaranteed to cover, so the result matches an exact nearest search.
+    
+    Args:
+        lat: User's latitude
+        lon: User's longitude
+        place_type: Type of place to search ("autoservice" or "carwash")
+        limit: Maximum number of places to return (default: 10)
+        service: Only return places offering this service (optional)
+        open_now: Only return places open at the current local time
+        precisions: Geohash lengths to try, finest first
+        
+    Returns:
+        List[Place]: Nearest places sorted by distance.
+    """
+    if place_type not in ("autoservice", "carwash"):
+        logger.error(f"❌ Invalid place_type: {place_type}")
+        raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
+    
+    user_hash = geohash.encode(lat, lon, max(precisions))
+    name = statement_name("places_by_geohash", place_type, bool(service), open_now)
+    
+    async def search(conn) -> List[Any]:
+        rows: List[Any] = []
+        for precision in precisions:
+            cells = geohash.neighbours(user_hash[:precision])
+            args: List[Any] = [lat, lon, cells, limit]
+            _search_filter_args(args, service, open_now)
+            rows = await statements.fetch(conn, name, *args)
+            
+            covered = geohash.covered_radius_km(lat, precision)
+            if len(rows) >= limit and rows[-1]["distance_km"] <= covered:
+                break
+        return rows
+    
+    try:
+        rows = await run_read(name, search)
+        return [Place.from_record(row) for row in rows]
+    except Exception as e:
+        logger.error(f"❌ Error finding places by geohash: {e}")
+        return []
+
+async def get_nearby_places_any_type(
+    lat: float,
+    lon: float,
+    radius_km: float = 50.0,
+    service: Optional[str] = None,
+    open_now: bool = False,
+    limit: int = 10,
+) -> List[Place]:
+    """
+    Find nearby places of every type, nearest first.
+    
+    With the unified ``places`` table this is a single indexed query over
+    all partitions; with the per-type tables each type is searched and the
+    results are merged. Returned places carry their ``place_type``.
+    
+    Args:
+        lat: User's latitude
+        lon: User's longitude
+        radius_km: Search radius in kilometers (default: 50.0)
+        service: Only return places offering this service (optional)
+        open_now: Only return places open at the current local time
+        limit: Maximum number of places to return (default: 10)
+        
+    Returns:
+        List[Place]: Nearby places of all types sorted by distance.
+    """
+    if not uses_unified_places():
+        places: List[Place] = []
+        for place_type in PLACE_TYPES:
+            found = await get_nearby_places(lat, lon, radius_km, place_type, service, open_now, limit)
+            places.extend(replace(place, place_type=place_type) for place in found)
+        return sorted(places, key=lambda place: place.distance_km)[:limit]
+    
+    args: List[Any] = [lat, lon, radius_km, limit]
+    _search_filter_args(args, service, open_now)
+    name = statement_name("nearby_places", statements.ALL_TYPES, bool(service), open_now)
+    
+    try:
+        rows = await run_read(name, lambda conn: statements.fetch(conn, name, *args))
+        return [Place.from_named_record(row) for row in rows]
+    except Exception as e:
+        logger.error(f"❌ Error finding nearby places: {e}")
+        return []
+
+async def get_place_by_id(place_id: str, place_type: str = "autoservice") -> Optional[Place]:
+    """
+    Look up one place by primary key.
+    
+    Backs the handlers' in-memory place caches, so buttons of old result
+    messages keep working after a restart or on another worker.
+    
+    Args:
+        place_id: Place ID
+        place_type: Type of place ("autoservice" or "carwash")
+        
+    Returns:
+        Optional[Place]: The place (without distance), or None if not found.
+    """
+    if place_type not in ("autoservice", "carwash"):
+        logger.error(f"❌ Invalid place_type: {place_type}")
+        raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
+    
+    name = statement_name("place_by_id", place_type)
+    try:
+        rows = await run_read(name, lambda conn: statements.fetch(conn, name, place_id))
+        return Place.from_record(rows[0]) if rows else None
+    except Exception as e:
+        logger.error(f"❌ Error fetching {place_type} {place_id}: {e}")
+        return None
+
+async def search_places_by_service(service_name: str, place_type: str = "autoservice") -> List[Place]:
     """Search places by service name."""
     if place_type not in ("autoservice", "carwash"):
         logger.error(f"❌ Invalid place_type: {place_type}")
         raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
     
-    query = f"SELECT * FROM {place_type} WHERE services @> $1::jsonb"
-    pool = get_pool()
+    name = statement_name("places_by_service", place_type)
     try:
-        async with pool.acquire() as conn:  # pyright: ignore[reportOptionalMemberAccess]
-            rows = await conn.fetch(query, json.dumps([service_name]))
-            return [dict(row) for row in rows]
+        rows = await run_read(name, lambda conn: statements.fetch(conn, name, [service_name]))
+        return [Place.from_record(row) for row in rows]
     except Exception as e:
         logger.error(f"❌ Error searching by service: {e}")
         return []
 
-async def batch_insert_autoservices(services_data: List[Dict[str, Any]]) -> bool:
-    """Insert multiple autoservices in a single transaction."""
-    return await _batch_insert(services_data, "autoservice")
+STAGING_COLUMNS = [
+    "ord", "id", "name", "lat", "lon", "address", "phone", "services", "working_days",
+    "working_hours", "is_24_7", "weekday_mask", "open_min", "close_min", "geohash",
+]
 
-async def batch_insert_carwashes(carwashes_data: List[Dict[str, Any]]) -> bool:
-    """Insert multiple carwashes in a single transaction."""
-    return await _batch_insert(carwashes_data, "carwash")
+# Above this many rows, listeners get one bulk notification instead of one per row
+BULK_NOTIFY_THRESHOLD = 100
 
-async def _batch_insert(data_list: List[Dict[str, Any]], place_type: str) -> bool:
-    """Generic batch insert function."""
-    pool = get_pool()
+async def batch_insert_autoservices(
+    services_data: List[Dict[str, Any]], stats: Optional[Dict[str, int]] = None
+) -> bool:
+    """Bulk insert or update autoservices in a single transaction."""
+    return await _batch_insert(services_data, "autoservice", stats)
+
+async def batch_insert_carwashes(
+    carwashes_data: List[Dict[str, Any]], stats: Optional[Dict[str, int]] = None
+) -> bool:
+    """Bulk insert or update carwashes in a single transaction."""
+    return await _batch_insert(carwashes_data, "carwash", stats)
+
+def _staging_record(index: int, data: Dict[str, Any]) -> tuple:
+    """Convert a place dict to a staging-table row."""
+    lat, lon = float(data["lat"]), float(data["lon"])
+    working_days = data.get("working_days", []) or []
+    working_hours = data.get("working_hours", {}) or {}
+    is_24_7 = bool(data.get("is_24_7", False))
+    weekday_mask, open_min, close_min = compile_schedule(working_days, working_hours, is_24_7)
+    return (
+        index,
+        str(data["id"]),
+        data["name"],
+        lat,
+        lon,
+        data.get("address"),
+        data.get("phone"),
+        jsonb.encode(normalize_services(data.get("services", []))),
+        [int(day) for day in working_days],
+        jsonb.encode(working_hours),
+        is_24_7,
+        weekday_mask,
+        open_min,
+        close_min,
+        geohash.encode(lat, lon),
+    )
+
+async def _batch_insert(
+    data_list: List[Dict[str, Any]], place_type: str, stats: Optional[Dict[str, int]] = None
+) -> bool:
+    """
+    Bulk upsert places on a single connection.
+    
+    Rows are streamed with COPY into a temporary staging table and merged
+    with one ``INSERT ... ON CONFLICT DO UPDATE``, so the whole batch costs
+    a handful of round trips regardless of its size.
+    
+    Args:
+        data_list: Place dictionaries (same shape as for insert_autoservice)
+        place_type: Type of place ("autoservice" or "carwash")
+        stats: Optional dict filled with the counts of ``inserted``,
+            ``updated`` and ``skipped`` (invalid) rows
+        
+    Returns:
+        bool: True if the batch was written (invalid rows are skipped, not
+        failures), False on error.
+    """
+    if place_type not in ("autoservice", "carwash"):
+        logger.error(f"❌ Invalid place_type: {place_type}")
+        raise ValueError(f"Invalid place_type: {place_type}. Must be 'autoservice' or 'carwash'")
+    
+    pool = await ensure_pool()
+    
+    required_fields = REQUIRED_FIELDS.get(place_type, [])
+    records = []
+    staged: List[Dict[str, Any]] = []
+    skipped = 0
+    for index, data in enumerate(data_list):
+        missing = [field for field in required_fields if field not in data]
+        if missing:
+            logger.error(f"❌ Skipping row {index}: missing required fields {missing}")
+            skipped += 1
+            continue
+        try:
+            records.append(_staging_record(index, data))
+            staged.append(data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"❌ Skipping row {index}: {e}")
+            skipped += 1
+    
+    result = {"inserted": 0, "updated": 0, "skipped": skipped}
+    if stats is not None:
+        stats.update(result)
+    if not records:
+        return True
+    
+    staging = f"{place_type}_staging"
+    geog = has_postgis()
+    upsert = QUERIES["upsert_from_staging"].format(
+        table=table_for(place_type),
+        staging=staging,
+        extra_columns=", geog" if geog else "",
+        extra_values=", ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography" if geog else "",
+        extra_updates="\n                geog = EXCLUDED.geog," if geog else "",
+    )
+    
+    name = f"batch_upsert:{place_type}"
     try:
-        async with pool.acquire() as conn:  # pyright: ignore[reportOptionalMemberAccess]
+        async with metrics.acquire(pool, name) as conn, metrics.timed(name) as timer:
             async with conn.transaction():
-                insert_func = insert_autoservice if place_type == "autoservice" else insert_carwash
-                for data in data_list:
-                    await insert_func(data)
-        return True
+                await conn.execute(QUERIES["create_staging"].format(staging=staging))
+                await conn.copy_records_to_table(staging, records=records, columns=STAGING_COLUMNS)
+                counts = await conn.fetchrow(upsert)
+            timer.rows = counts["inserted"] + counts["updated"]
     except Exception as e:
         logger.error(f"❌ Batch insert error: {e}")
-        return False
\ No newline at end of file
+        return False
+    
+    if len(records) > BULK_NOTIFY_THRESHOLD:
+        _notify_upsert(place_type, None)
+    else:
+        # Skipped rows were not written, so their listeners are not told
+        for data in staged:
+            _notify_upsert(place_type, data)
+    
+    result.update(inserted=counts["inserted"], updated=counts["updated"])
+    if stats is not None:
+        stats.update(result)
+    logger.info(f"✅ Batch upsert {place_type}: {result}")
+    return True
@@ -0,0 +1,120 @@
+"""
+Geohash encoding and neighbour cells.
+
+Places store a fixed-precision geohash so proximity search can use a plain
+btree prefix range on vanilla PostgreSQL. A shorter prefix is a larger cell,
+which lets a search widen simply by truncating the user's geohash.
+"""
+import math
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+
+# Precision stored in the geohash column (~4.8 m x 4.8 m cells)
+STORED_PRECISION = 9
+
+# Sorts after every BASE32 character, so [prefix, prefix + "~") covers a cell
+PREFIX_UPPER_BOUND = "~"
+
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LON_EQUATOR = 111.32
+
+
+def encode(lat: float, lon: float, precision: int = STORED_PRECISION) -> str:
+    """Encode a coordinate as a geohash of the given length."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if lon >= mid:
+                value = (value << 1) | 1
+                lon_range[0] = mid
+            else:
+                value <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def cell_size_deg(precision: int) -> Tuple[float, float]:
+    """Height and width in degrees of a cell at the given precision."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def decode_center(geohash: str) -> Tuple[float, float]:
+    """Return the center ``(lat, lon)`` of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lon_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if bit:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def neighbours(geohash: str) -> List[str]:
+    """
+    The cell itself followed by its 8 neighbours at the same precision.
+
+    Cells beyond the poles are skipped; longitude wraps at the antimeridian.
+    """
+    precision = len(geohash)
+    height, width = cell_size_deg(precision)
+    lat, lon = decode_center(geohash)
+
+    cells = [geohash]
+    for dlat in (-1, 0, 1):
+        for dlon in (-1, 0, 1):
+            if dlat == 0 and dlon == 0:
+                continue
+            n_lat = lat + dlat * height
+            if not -90.0 < n_lat < 90.0:
+                continue
+            n_lon = (lon + dlon * width + 180.0) % 360.0 - 180.0
+            cell = encode(n_lat, n_lon, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def covered_radius_km(lat: float, precision: int) -> float:
+    """
+    Radius around any point of a cell that its 3x3 neighbourhood fully covers.
+
+    Results closer than this radius are guaranteed to be found by a search
+    over the cell and its 8 neighbours.
+    """
+    height, width = cell_size_deg(precision)
+    lon_km = width * KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(min(abs(lat) + height, 90.0)))
+    return min(height * KM_PER_DEG_LAT, lon_km)
@@ -0,0 +1,95 @@
+"""
+JSONB codec for asyncpg connections.
+
+Without a codec asyncpg hands ``jsonb`` columns back as raw strings and
+expects strings as parameters. The codec registered here decodes
+``services`` / ``working_hours`` into Python objects and encodes lists and
+dicts on the way in, using orjson when it is installed and the stdlib
+``json`` module otherwise.
+
+Many places share the same services list and opening hours, so decoded
+values are cached by their JSON text and the same object is returned for
+identical text. To keep one place from changing another's values through
+the shared object, decoded values are immutable: arrays become tuples and
+objects read-only mappings (``types.MappingProxyType``).
+"""
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Distinct JSON texts whose decoded object is kept for sharing
+DECODE_CACHE_SIZE = 4096
+
+# Longer values are decoded without caching (they rarely repeat)
+MAX_CACHED_LENGTH = 512
+
+
+if orjson is not None:
+    def encode(value: Any) -> str:
+        """Serialize a Python value to JSON text."""
+        return orjson.dumps(value).decode()
+
+    _loads = orjson.loads
+else:
+    def encode(value: Any) -> str:
+        """Serialize a Python value to JSON text."""
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    _loads = json.loads
+
+
+_CONTAINERS = (list, dict)
+
+
+def _freeze(value: Any) -> Any:
+    """Immutable copy of a decoded value: tuples and read-only mappings."""
+    # Services and opening hours are flat, so nested values are rare
+    if isinstance(value, list):
+        if any(isinstance(item, _CONTAINERS) for item in value):
+            return tuple(map(_freeze, value))
+        return tuple(value)
+    if isinstance(value, dict):
+        if any(isinstance(item, _CONTAINERS) for item in value.values()):
+            value = {key: _freeze(item) for key, item in value.items()}
+        return MappingProxyType(value)
+    return value
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_shared(text: str) -> Any:
+    return _freeze(_loads(text))
+
+
+def decode(text: str) -> Any:
+    """Parse JSON text into an immutable value, shared between identical short values."""
+    if len(text) <= MAX_CACHED_LENGTH:
+        return _decode_shared(text)
+    return _freeze(_loads(text))
+
+
+def backend() -> str:
+    """Name of the JSON library in use ("orjson" or "json")."""
+    return "orjson" if orjson is not None else "json"
+
+
+async def register_jsonb_codec(conn: Any) -> None:
+    """
+    Register the codec for ``jsonb`` and ``json`` on a connection.
+
+    Must run before any statement is prepared on the connection, since
+    prepared statements keep the codecs they were created with.
+    """
+    for typename in ("jsonb", "json"):
+        await conn.set_type_codec(
+            typename,
+            schema="pg_catalog",
+            encoder=encode,
+            decoder=decode,
+            format="text",
+        )
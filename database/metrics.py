@@ -0,0 +1,198 @@
+"""
+Per-query instrumentation for the crud layer.
+
+Crud functions keep their contract of returning ``[]``/``False``/``None``
+on failure; this module records what happened underneath. For every named
+query it keeps histograms of the pool acquire wait, the execution time and
+the rows returned, and counts errors by exception type. Queries slower
+than ``DB_SLOW_QUERY_MS`` are written to the ``database.slow_queries``
+logger. ``snapshot()`` returns everything as plain dicts.
+"""
+import bisect
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger("database.slow_queries")
+
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+# Upper bucket bounds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+ROW_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 500, 1000, 10000)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with count, sum and max.
+
+    Percentiles are estimated as the upper bound of the bucket that holds
+    them (capped at the observed max), which is precise enough to spot regressions without keeping
+    every sample.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket containing the ``pct`` percentile."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class QueryMetrics:
+    """Histograms and error counts of one named query."""
+
+    def __init__(self) -> None:
+        self.acquire_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.exec_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.rows = Histogram(ROW_BUCKETS)
+        self.errors: Counter = Counter()
+        self.slow = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.exec_ms.count,
+            "slow": self.slow,
+            "errors": dict(self.errors),
+            "acquire_ms": self.acquire_ms.snapshot(),
+            "exec_ms": self.exec_ms.snapshot(),
+            "rows": self.rows.snapshot(),
+        }
+
+
+_queries: Dict[str, QueryMetrics] = {}
+
+
+def _metrics(name: str) -> QueryMetrics:
+    metrics = _queries.get(name)
+    if metrics is None:
+        metrics = _queries[name] = QueryMetrics()
+    return metrics
+
+
+def observe_query(name: str, elapsed_ms: float, rows: Optional[int] = None, error: Optional[BaseException] = None) -> None:
+    """
+    Record one execution of a named query.
+
+    Args:
+        name: Query name (statement name or crud operation)
+        elapsed_ms: Execution time in milliseconds
+        rows: Rows returned or affected, if known
+        error: Exception raised by the query, if any
+    """
+    metrics = _metrics(name)
+    metrics.exec_ms.observe(elapsed_ms)
+    if rows is not None:
+        metrics.rows.observe(rows)
+    if error is not None:
+        metrics.errors[type(error).__name__] += 1
+    if elapsed_ms >= SLOW_QUERY_MS:
+        metrics.slow += 1
+        slow_logger.warning(f"🐢 Slow query {name}: {elapsed_ms:.1f} ms, rows={rows}")
+
+
+def observe_acquire(name: str, wait_ms: float) -> None:
+    """Record how long a query waited for a pool connection."""
+    _metrics(name).acquire_ms.observe(wait_ms)
+
+
+def observe_error(name: str, error: BaseException) -> None:
+    """Count an error raised outside query execution (e.g. acquiring a connection)."""
+    _metrics(name).errors[type(error).__name__] += 1
+
+
+@asynccontextmanager
+async def acquire(pool: Any, name: str) -> AsyncIterator[Any]:
+    """
+    ``pool.acquire()`` that records the wait under ``name``.
+
+    Failures to get a connection (pool closed, timeout, server gone) are
+    counted as errors of ``name``; errors raised by the query itself are
+    left to ``observe_query``.
+    """
+    acquired = False
+    started = time.perf_counter()
+    try:
+        async with pool.acquire() as conn:
+            acquired = True
+            observe_acquire(name, (time.perf_counter() - started) * 1000)
+            yield conn
+    except Exception as e:
+        if not acquired:
+            observe_error(name, e)
+        raise
+
+
+class Timer:
+    """Execution timer yielded by ``timed``; set ``rows`` before leaving the block."""
+    __slots__ = ("rows",)
+
+    def __init__(self) -> None:
+        self.rows: Optional[int] = None
+
+
+@asynccontextmanager
+async def timed(name: str) -> AsyncIterator[Timer]:
+    """Time a block of non-prepared SQL as one execution of ``name``."""
+    timer = Timer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    except Exception as e:
+        observe_query(name, (time.perf_counter() - started) * 1000, timer.rows, e)
+        raise
+    observe_query(name, (time.perf_counter() - started) * 1000, timer.rows)
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every query seen so far, keyed by name."""
+    return {name: metrics.snapshot() for name, metrics in sorted(_queries.items())}
+
+
+def error_counts() -> Dict[str, int]:
+    """Errors of all queries, summed by exception type."""
+    total: Counter = Counter()
+    for metrics in _queries.values():
+        total.update(metrics.errors)
+    return dict(total)
+
+
+def reset() -> None:
+    """Forget all recorded metrics."""
+    _queries.clear()
@@ -1,6 +1,9 @@
 """
 Database table definitions and schemas.
 """
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence
 
 CREATE_TABLES_SQL = """
 CREATE TABLE IF NOT EXISTS autoservice (
@@ -14,6 +17,10 @@ CREATE TABLE IF NOT EXISTS autoservice (
     working_days INTEGER[],
     working_hours JSONB,
     is_24_7 BOOLEAN DEFAULT FALSE,
+    weekday_mask SMALLINT,
+    open_min SMALLINT,
+    close_min SMALLINT,
+    geohash TEXT COLLATE "C",
     created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
@@ -29,17 +36,192 @@ CREATE TABLE IF NOT EXISTS carwash (
     working_days INTEGER[],
     working_hours JSONB,
     is_24_7 BOOLEAN DEFAULT FALSE,
+    weekday_mask SMALLINT,
+    open_min SMALLINT,
+    close_min SMALLINT,
+    geohash TEXT COLLATE "C",
     created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
 
+-- Compact schedule columns for tables created before they existed
+ALTER TABLE autoservice ADD COLUMN IF NOT EXISTS weekday_mask SMALLINT;
+ALTER TABLE autoservice ADD COLUMN IF NOT EXISTS open_min SMALLINT;
+ALTER TABLE autoservice ADD COLUMN IF NOT EXISTS close_min SMALLINT;
+ALTER TABLE carwash ADD COLUMN IF NOT EXISTS weekday_mask SMALLINT;
+ALTER TABLE carwash ADD COLUMN IF NOT EXISTS open_min SMALLINT;
+ALTER TABLE carwash ADD COLUMN IF NOT EXISTS close_min SMALLINT;
+
+-- Fixed-precision geohash; "C" collation keeps prefix ranges bytewise
+ALTER TABLE autoservice ADD COLUMN IF NOT EXISTS geohash TEXT COLLATE "C";
+ALTER TABLE carwash ADD COLUMN IF NOT EXISTS geohash TEXT COLLATE "C";
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_autoservice_coords ON autoservice(lat, lon);
 CREATE INDEX IF NOT EXISTS idx_carwash_coords ON carwash(lat, lon);
 CREATE INDEX IF NOT EXISTS idx_autoservice_services ON autoservice USING GIN(services);
 CREATE INDEX IF NOT EXISTS idx_carwash_services ON carwash USING GIN(services);
+CREATE INDEX IF NOT EXISTS idx_autoservice_geohash ON autoservice(geohash);
+CREATE INDEX IF NOT EXISTS idx_carwash_geohash ON carwash(geohash);
+"""
+
+# Applied only when the PostGIS extension is installed in the database
+POSTGIS_TABLES_SQL = """
+ALTER TABLE autoservice ADD COLUMN IF NOT EXISTS geog geography(Point, 4326);
+ALTER TABLE carwash ADD COLUMN IF NOT EXISTS geog geography(Point, 4326);
+
+-- Backfill rows written before PostGIS was enabled
+UPDATE autoservice SET geog = ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography WHERE geog IS NULL;
+UPDATE carwash SET geog = ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography WHERE geog IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_autoservice_geog ON autoservice USING GIST(geog);
+CREATE INDEX IF NOT EXISTS idx_carwash_geog ON carwash USING GIST(geog);
+"""
+
+# Unified schema: one table list-partitioned by place_type. Writes and
+# per-type reads address a partition directly, so they touch one partition;
+# cross-type searches query the parent.
+UNIFIED_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS places (
+    place_type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    lat DOUBLE PRECISION NOT NULL,
+    lon DOUBLE PRECISION NOT NULL,
+    address TEXT,
+    phone TEXT,
+    services JSONB,
+    working_days INTEGER[],
+    working_hours JSONB,
+    is_24_7 BOOLEAN DEFAULT FALSE,
+    weekday_mask SMALLINT,
+    open_min SMALLINT,
+    close_min SMALLINT,
+    geohash TEXT COLLATE "C",
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    PRIMARY KEY (place_type, id)
+) PARTITION BY LIST (place_type);
+
+CREATE TABLE IF NOT EXISTS places_autoservice PARTITION OF places FOR VALUES IN ('autoservice');
+CREATE TABLE IF NOT EXISTS places_carwash PARTITION OF places FOR VALUES IN ('carwash');
+
+-- Direct partition writes: the default fills place_type and the unique id
+-- index lets the existing ON CONFLICT (id) upserts work unchanged
+ALTER TABLE places_autoservice ALTER COLUMN place_type SET DEFAULT 'autoservice';
+ALTER TABLE places_carwash ALTER COLUMN place_type SET DEFAULT 'carwash';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_places_autoservice_id ON places_autoservice(id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_places_carwash_id ON places_carwash(id);
+
+CREATE INDEX IF NOT EXISTS idx_places_coords ON places(lat, lon);
+CREATE INDEX IF NOT EXISTS idx_places_services ON places USING GIN(services);
+CREATE INDEX IF NOT EXISTS idx_places_geohash ON places(geohash);
 """
 
+# One-time copy from the per-type tables; the originals are kept as
+# *_legacy until dropped by hand
+MIGRATE_TO_UNIFIED_SQL = """
+INSERT INTO places (
+    place_type, id, name, lat, lon, address, phone, services, working_days, working_hours,
+    is_24_7, weekday_mask, open_min, close_min, geohash, created_at, updated_at
+)
+SELECT '{table}', id, name, lat, lon, address, phone, services, working_days, working_hours,
+    is_24_7, weekday_mask, open_min, close_min, geohash, created_at, updated_at
+FROM {table}
+ON CONFLICT DO NOTHING;
+
+ALTER TABLE {table} RENAME TO {table}_legacy;
+"""
+
+# Read-only compatibility views under the old table names
+COMPAT_VIEWS_SQL = """
+CREATE OR REPLACE VIEW autoservice AS
+    SELECT id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7,
+        weekday_mask, open_min, close_min, geohash, created_at, updated_at
+    FROM places WHERE place_type = 'autoservice';
+
+CREATE OR REPLACE VIEW carwash AS
+    SELECT id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7,
+        weekday_mask, open_min, close_min, geohash, created_at, updated_at
+    FROM places WHERE place_type = 'carwash';
+"""
+
+UNIFIED_POSTGIS_SQL = """
+ALTER TABLE places ADD COLUMN IF NOT EXISTS geog geography(Point, 4326);
+UPDATE places SET geog = ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography WHERE geog IS NULL;
+CREATE INDEX IF NOT EXISTS idx_places_geog ON places USING GIST(geog);
+"""
+
+# Fingerprint of the last applied DDL; lets startup skip unchanged schema work
+SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+"""
+
+PLACE_TYPES = ("autoservice", "carwash")
+
+
+def place_table(place_type: str, unified: bool) -> str:
+    """Table holding one place type: its partition in the unified schema."""
+    return f"places_{place_type}" if unified else place_type
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    """
+    A place row as returned by the search and listing queries.
+
+    Built once from an ``asyncpg.Record`` and passed unchanged through the
+    crud layer, the caches and the handlers. Field order mirrors
+    ``queries.PLACE_COLUMNS`` followed by the optional ``distance_km``
+    column of the proximity queries.
+
+    Attributes:
+        services: Service names; a tuple when read from the database
+        working_hours: Opening hours; a read-only mapping when read from
+            the database (JSONB values are shared, see ``database.jsonb``)
+        distance_km: Distance from the search origin, None for listings
+        place_type: Set only by searches spanning all place types
+    """
+    id: str
+    name: str
+    lat: float
+    lon: float
+    address: Optional[str]
+    phone: Optional[str]
+    services: Sequence[str]
+    working_days: List[int]
+    working_hours: Mapping[str, Any]
+    is_24_7: bool
+    weekday_mask: Optional[int]
+    open_min: Optional[int]
+    close_min: Optional[int]
+    updated_at: Optional[datetime]
+    distance_km: Optional[float] = None
+    place_type: Optional[str] = None
+
+    @classmethod
+    def from_record(cls, record: Any) -> "Place":
+        """Build a Place from a row selecting PLACE_COLUMNS (plus distance_km)."""
+        return cls(*record)
+
+    @classmethod
+    def from_named_record(cls, record: Any) -> "Place":
+        """Build a Place from a row with extra columns (e.g. place_type), by name."""
+        return cls(**record)
+
+    @property
+    def gmaps_url(self) -> str:
+        """Google Maps link to the place's coordinates."""
+        return f"https://maps.google.com/?q={self.lat},{self.lon}"
+
+    def with_distance(self, distance_km: float) -> "Place":
+        """Copy of the place with the distance from another origin."""
+        return replace(self, distance_km=distance_km)
+
 # Table field definitions for validation
 REQUIRED_FIELDS = {
     'autoservice': ['id', 'name', 'lat', 'lon'],
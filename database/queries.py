@@ -2,11 +2,23 @@
 SQL query definitions.
 """
 
+# Columns returned to the application, in the field order of models.Place.
+# Listed explicitly so optional columns (e.g. the PostGIS geography) never
+# leak into result rows.
+PLACE_COLUMNS = (
+    "id, name, lat, lon, address, phone, services, working_days, "
+    "working_hours, is_24_7, weekday_mask, open_min, close_min, updated_at"
+)
+
+# Columns that may be requested by name (e.g. for projected exports)
+SELECTABLE_COLUMNS = frozenset(PLACE_COLUMNS.replace(" ", "").split(",")) | {"created_at", "geohash"}
+
 QUERIES = {
-    "insert_autoservice": """
-        INSERT INTO autoservice (
-            id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+    "insert_place": """
+        INSERT INTO {table} (
+            id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7,
+            weekday_mask, open_min, close_min, geohash
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
         ON CONFLICT (id) DO UPDATE SET
             name = EXCLUDED.name,
             lat = EXCLUDED.lat,
@@ -17,13 +29,22 @@ QUERIES = {
             working_days = EXCLUDED.working_days,
             working_hours = EXCLUDED.working_hours,
             is_24_7 = EXCLUDED.is_24_7,
+            weekday_mask = EXCLUDED.weekday_mask,
+            open_min = EXCLUDED.open_min,
+            close_min = EXCLUDED.close_min,
+            geohash = EXCLUDED.geohash,
             updated_at = now()
     """,
     
-    "insert_carwash": """
-        INSERT INTO carwash (
-            id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+    # Same as insert_place, but also keeps the PostGIS geography in sync
+    "insert_place_geog": """
+        INSERT INTO {table} (
+            id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7,
+            weekday_mask, open_min, close_min, geohash, geog
+        ) VALUES (
+            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14,
+            ST_SetSRID(ST_MakePoint($4, $3), 4326)::geography
+        )
         ON CONFLICT (id) DO UPDATE SET
             name = EXCLUDED.name,
             lat = EXCLUDED.lat,
@@ -34,19 +55,246 @@ QUERIES = {
             working_days = EXCLUDED.working_days,
             working_hours = EXCLUDED.working_hours,
             is_24_7 = EXCLUDED.is_24_7,
+            weekday_mask = EXCLUDED.weekday_mask,
+            open_min = EXCLUDED.open_min,
+            close_min = EXCLUDED.close_min,
+            geohash = EXCLUDED.geohash,
+            geog = EXCLUDED.geog,
             updated_at = now()
     """,
     
+    # Bulk ingest: rows are COPYed into a per-transaction staging table, then
+    # upserted in one statement. JSONB columns are staged as text; "ord"
+    # keeps the last occurrence when a batch repeats an id.
+    "create_staging": """
+        CREATE TEMP TABLE {staging} (
+            ord INTEGER,
+            id TEXT,
+            name TEXT,
+            lat DOUBLE PRECISION,
+            lon DOUBLE PRECISION,
+            address TEXT,
+            phone TEXT,
+            services TEXT,
+            working_days INTEGER[],
+            working_hours TEXT,
+            is_24_7 BOOLEAN,
+            weekday_mask SMALLINT,
+            open_min SMALLINT,
+            close_min SMALLINT,
+            geohash TEXT
+        ) ON COMMIT DROP
+    """,
+    
+    # {extra_columns}/{extra_values}/{extra_updates} add the PostGIS geog column
+    "upsert_from_staging": """
+        WITH upserted AS (
+            INSERT INTO {table} (
+                id, name, lat, lon, address, phone, services, working_days, working_hours, is_24_7,
+                weekday_mask, open_min, close_min, geohash{extra_columns}
+            )
+            SELECT DISTINCT ON (id)
+                id, name, lat, lon, address, phone, services::jsonb, working_days, working_hours::jsonb,
+                is_24_7, weekday_mask, open_min, close_min, geohash{extra_values}
+            FROM {staging}
+            ORDER BY id, ord DESC
+            ON CONFLICT (id) DO UPDATE SET
+                name = EXCLUDED.name,
+                lat = EXCLUDED.lat,
+                lon = EXCLUDED.lon,
+                address = EXCLUDED.address,
+                phone = EXCLUDED.phone,
+                services = EXCLUDED.services,
+                working_days = EXCLUDED.working_days,
+                working_hours = EXCLUDED.working_hours,
+                is_24_7 = EXCLUDED.is_24_7,
+                weekday_mask = EXCLUDED.weekday_mask,
+                open_min = EXCLUDED.open_min,
+                close_min = EXCLUDED.close_min,
+                geohash = EXCLUDED.geohash,{extra_updates}
+                updated_at = now()
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT count(*) FILTER (WHERE inserted) AS inserted,
+               count(*) FILTER (WHERE NOT inserted) AS updated
+        FROM upserted
+    """,
+    
+    # Two stages: a lat/lon bounding box derived from the radius lets the
+    # planner use the (lat, lon) btree index, then the exact Haversine
+    # distance is computed only for the rows that survive the box.
     "nearby_places": """
-        SELECT *,
-            (6371 * acos(cos(radians($1)) * cos(radians(lat)) * 
-            cos(radians(lon) - radians($2)) + sin(radians($1)) * 
-            sin(radians(lat)))) AS distance_km
-        FROM {table}
-        WHERE (6371 * acos(cos(radians($1)) * cos(radians(lat)) * 
-            cos(radians(lon) - radians($2)) + sin(radians($1)) * 
-            sin(radians(lat)))) < $3
+        SELECT *
+        FROM (
+            SELECT {columns},
+                (2 * 6371 * asin(least(1.0, sqrt(
+                    power(sin(radians(lat - $1::float8) / 2), 2) +
+                    cos(radians($1::float8)) * cos(radians(lat)) *
+                    power(sin(radians(lon - $2::float8) / 2), 2)
+                )))) AS distance_km
+            FROM {table}
+            WHERE lat BETWEEN $1::float8 - degrees($3::float8 / 6371)
+                          AND $1::float8 + degrees($3::float8 / 6371)
+              AND lon BETWEEN $2::float8 - degrees(asin(least(1.0,
+                                  sin($3::float8 / 6371) / greatest(cos(radians($1::float8)), 1e-9))))
+                          AND $2::float8 + degrees(asin(least(1.0,
+                                  sin($3::float8 / 6371) / greatest(cos(radians($1::float8)), 1e-9))))
+              {filters}
+        ) AS candidates
+        WHERE distance_km < $3::float8
+        ORDER BY distance_km
+        LIMIT $4::int
+    """,
+    
+    # KNN variant used when PostGIS is installed: the GiST index on geog
+    # drives both the radius filter and the ordering.
+    "nearby_places_knn": """
+        SELECT {columns},
+            ST_Distance(geog, ref.point) / 1000.0 AS distance_km
+        FROM {table},
+            (SELECT ST_SetSRID(ST_MakePoint($2::float8, $1::float8), 4326)::geography AS point) AS ref
+        WHERE ST_DWithin(geog, ref.point, $3::float8 * 1000)
+          {filters}
+        ORDER BY geog <-> ref.point
+        LIMIT $4::int
+    """,
+    
+    # Next page after a keyset cursor: ($5 distance in mm, $6 id) of the
+    # last place shown. Ordered by (millimetre distance, id) so the cursor
+    # is exact and ties never repeat or skip a place. The first page must
+    # rank by the same Haversine distance (get_nearby_places(knn=False)).
+    "nearby_places_after": """
+        SELECT *
+        FROM (
+            SELECT {columns},
+                (2 * 6371 * asin(least(1.0, sqrt(
+                    power(sin(radians(lat - $1::float8) / 2), 2) +
+                    cos(radians($1::float8)) * cos(radians(lat)) *
+                    power(sin(radians(lon - $2::float8) / 2), 2)
+                )))) AS distance_km
+            FROM {table}
+            WHERE lat BETWEEN $1::float8 - degrees($3::float8 / 6371)
+                          AND $1::float8 + degrees($3::float8 / 6371)
+              AND lon BETWEEN $2::float8 - degrees(asin(least(1.0,
+                                  sin($3::float8 / 6371) / greatest(cos(radians($1::float8)), 1e-9))))
+                          AND $2::float8 + degrees(asin(least(1.0,
+                                  sin($3::float8 / 6371) / greatest(cos(radians($1::float8)), 1e-9))))
+              {filters}
+        ) AS candidates
+        WHERE distance_km < $3::float8
+          AND (floor(distance_km * 1000000)::bigint, id) > ($5::bigint, $6::text)
+        ORDER BY floor(distance_km * 1000000)::bigint, id
+        LIMIT $4::int
+    """,
+    
+    # Candidates from a set of geohash cells ($3), each matched as a btree
+    # range [prefix, prefix || '~'), ranked by Haversine distance.
+    "places_by_geohash": """
+        SELECT *
+        FROM (
+            SELECT {columns},
+                (2 * 6371 * asin(least(1.0, sqrt(
+                    power(sin(radians(lat - $1::float8) / 2), 2) +
+                    cos(radians($1::float8)) * cos(radians(lat)) *
+                    power(sin(radians(lon - $2::float8) / 2), 2)
+                )))) AS distance_km
+            FROM {table}
+            JOIN unnest($3::text[]) AS cell(prefix)
+              ON geohash >= cell.prefix AND geohash < cell.prefix || '~'
+            WHERE TRUE
+              {filters}
+        ) AS candidates
         ORDER BY distance_km
-        LIMIT 10
+        LIMIT $4::int
+    """,
+    
+    # Optional filters appended to the nearby queries; parameters are
+    # numbered from $5 in the order the filters are applied.
+    "filter_service": "AND services @> ${n}::jsonb",
+    
+    # Open at local weekday bit ${n}, minute ${m}; ${p} is yesterday's bit
+    # for schedules that run past midnight. Mirrors schedule.is_open().
+    "filter_open_now": """
+        AND (is_24_7 OR (open_min IS NOT NULL AND close_min IS NOT NULL AND (
+            (weekday_mask & ${n}::int <> 0 AND (
+                (open_min <= close_min AND ${m}::int >= open_min AND ${m}::int < close_min)
+                OR (open_min > close_min AND ${m}::int >= open_min)))
+            OR (open_min > close_min AND weekday_mask & ${p}::int <> 0 AND ${m}::int < close_min)
+        )))
+    """,
+    
+    "schema_fingerprint": """
+        SELECT fingerprint FROM schema_version WHERE name = $1
+    """,
+    
+    "set_schema_fingerprint": """
+        INSERT INTO schema_version (name, fingerprint) VALUES ($1, $2)
+        ON CONFLICT (name) DO UPDATE SET fingerprint = EXCLUDED.fingerprint, applied_at = now()
+    """,
+    
+    "places_missing_schedule": """
+        SELECT id, working_days, working_hours, is_24_7
+        FROM {table}
+        WHERE weekday_mask IS NULL
+    """,
+    
+    "places_missing_geohash": """
+        SELECT id, lat, lon
+        FROM {table}
+        WHERE geohash IS NULL
+    """,
+    
+    "update_geohash": """
+        UPDATE {table}
+        SET geohash = $2
+        WHERE id = $1
+    """,
+    
+    "places_unnormalized_services": """
+        SELECT id, services
+        FROM {table}
+        WHERE jsonb_typeof(services) = 'array'
+          AND EXISTS (
+              SELECT 1 FROM jsonb_array_elements_text(services) AS label
+              WHERE label !~ '^[[:alnum:]]' OR label = ANY($1::text[])
+          )
+    """,
+    
+    "update_services": """
+        UPDATE {table}
+        SET services = $2
+        WHERE id = $1
+    """,
+    
+    "update_schedule": """
+        UPDATE {table}
+        SET weekday_mask = $2, open_min = $3, close_min = $4
+        WHERE id = $1
+    """,
+    
+    "places_updated_since": """
+        SELECT {columns}
+        FROM {table}
+        WHERE $1::timestamptz IS NULL OR updated_at > $1::timestamptz
+        ORDER BY updated_at
+    """,
+    
+    # Server-side cursor source for streaming; {columns} is validated by crud
+    "stream_places": """
+        SELECT {columns}
+        FROM {table}
+        WHERE $1::timestamptz IS NULL OR updated_at > $1::timestamptz
+    """,
+    
+    "places_by_service": """
+        SELECT {columns}
+        FROM {table}
+        WHERE services @> $1::jsonb
+    """,
+    
+    "place_by_id": """
+        SELECT {columns}
+        FROM {table}
+        WHERE id = $1
     """
-}
\ No newline at end of file
+}
@@ -0,0 +1,298 @@
+"""
+Read-replica routing.
+
+Search traffic dominates, so read-only crud functions can be served by
+secondary pools listed in ``DATABASE_READ_URLS`` (comma-separated).
+``acquire_read()`` picks the least busy healthy replica (round-robin
+among equally busy ones) and falls back to the primary pool when no
+replica is usable. Writes always use the primary.
+
+A replica is skipped after a connection failure, or while its replay lag
+exceeds ``DB_REPLICA_MAX_LAG_SECONDS``. The read that hit the failure is
+retried once on the primary: ``run_read`` reruns the whole query there,
+``acquire_read`` can only switch pools if the replica failed before
+handing out a connection. ``run_replica_health_loop``
+re-checks every replica periodically and reconnects failed ones.
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import asyncpg
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+READ_URLS = [url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()]
+MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "30"))
+HEALTH_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_HEALTH_SECONDS", "10"))
+
+# Seconds since the last replayed transaction; 0 on a server that is not in recovery.
+# On an idle primary this grows without new writes, which only matters when
+# nothing is being written anyway.
+LAG_QUERY = """
+    SELECT CASE WHEN pg_is_in_recovery()
+        THEN COALESCE(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+        ELSE 0 END
+"""
+
+# Errors that mean the server is unreachable, as opposed to a bad query.
+# PostgresConnectionError covers a connection lost mid-query
+# (ConnectionDoesNotExistError).
+CONNECTION_ERRORS = (
+    OSError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+)
+
+# While getting a connection, a timeout or a closed/closing pool
+# (InterfaceError) also means the replica can't serve reads
+ACQUIRE_ERRORS = CONNECTION_ERRORS + (asyncio.TimeoutError, asyncpg.InterfaceError)
+
+
+def _is_outage(error: BaseException, connected: bool) -> bool:
+    """
+    Whether ``error`` means the replica is unreachable.
+
+    Once a connection is held, a timeout is the query's own
+    ``command_timeout`` (TimeoutError is an OSError on Python 3.11+) and
+    an InterfaceError is a usage bug such as "another operation is in
+    progress"; both are query errors and must not fail the replica over.
+    """
+    if not connected:
+        return isinstance(error, ACQUIRE_ERRORS)
+    return isinstance(error, CONNECTION_ERRORS) and not isinstance(error, asyncio.TimeoutError)
+
+
+@dataclass
+class ReadReplica:
+    """
+    One secondary pool and its routing state.
+
+    Attributes:
+        url: Connection URL
+        pool: Connection pool, None until connected
+        healthy: False after a connection failure until the next good health check
+        lag_seconds: Replay lag measured by the last health check
+        in_flight: Connections currently acquired from this replica
+        served: Number of acquisitions served
+        failures: Number of connection failures seen
+        checked_at: Monotonic time of the last successful health check
+    """
+    url: str
+    pool: Optional[asyncpg.Pool] = None
+    healthy: bool = False
+    lag_seconds: float = 0.0
+    in_flight: int = 0
+    served: int = 0
+    failures: int = 0
+    checked_at: Optional[float] = None
+
+    @property
+    def label(self) -> str:
+        """Host part of the URL, safe to log."""
+        return self.url.split("@")[-1]
+
+    @property
+    def usable(self) -> bool:
+        return self.pool is not None and self.healthy and self.lag_seconds <= MAX_LAG_SECONDS
+
+    def mark_failed(self, error: BaseException) -> None:
+        self.failures += 1
+        if self.healthy:
+            logger.error(f"❌ Read replica {self.label} marked unhealthy: {error}")
+        self.healthy = False
+
+
+replicas: List[ReadReplica] = []
+_next = 0
+_primary_reads = 0
+_primary_retries = 0
+
+T = TypeVar("T")
+
+PoolFactory = Callable[[str], Awaitable[asyncpg.Pool]]
+_pool_factory: Optional[PoolFactory] = None
+
+
+async def _connect(replica: ReadReplica) -> None:
+    """Create the replica's pool (if needed) and measure its lag."""
+    if replica.pool is None:
+        replica.pool = await _pool_factory(replica.url)  # type: ignore[misc]
+    async with replica.pool.acquire() as conn:
+        replica.lag_seconds = float(await conn.fetchval(LAG_QUERY) or 0.0)
+    replica.checked_at = time.monotonic()
+    if not replica.healthy:
+        logger.info(f"✅ Read replica {replica.label} available (lag {replica.lag_seconds:.1f}s)")
+    replica.healthy = True
+
+
+async def open_replicas(urls: List[str], pool_factory: PoolFactory) -> None:
+    """
+    Connect to every read replica; failures only disable that replica.
+
+    Args:
+        urls: Replica connection URLs
+        pool_factory: Creates a pool configured like the primary one
+    """
+    global _pool_factory
+    _pool_factory = pool_factory
+    await close_replicas()
+    replicas.extend(ReadReplica(url) for url in urls)
+    for replica in replicas:
+        try:
+            await _connect(replica)
+        except Exception as e:
+            logger.error(f"❌ Read replica {replica.label} unavailable: {e}")
+            replica.mark_failed(e)
+
+
+async def close_replicas() -> None:
+    """Close and forget every replica pool."""
+    for replica in replicas:
+        if replica.pool is not None:
+            await replica.pool.close()
+    replicas.clear()
+
+
+async def check_replicas() -> None:
+    """Refresh lag and health of every replica, reconnecting failed ones."""
+    for replica in replicas:
+        try:
+            await _connect(replica)
+            if replica.lag_seconds > MAX_LAG_SECONDS:
+                logger.warning(f"⚠️ Read replica {replica.label} lagging {replica.lag_seconds:.1f}s, skipped")
+        except Exception as e:
+            replica.mark_failed(e)
+
+
+async def run_replica_health_loop(interval: float = HEALTH_CHECK_INTERVAL) -> None:
+    """Periodically check all replicas until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        await check_replicas()
+
+
+def _choose() -> Optional[ReadReplica]:
+    """Least busy usable replica; round-robin breaks ties."""
+    global _next
+    usable = [replica for replica in replicas if replica.usable]
+    if not usable:
+        return None
+    _next += 1
+    start = _next % len(usable)
+    rotated = usable[start:] + usable[:start]
+    return min(rotated, key=lambda replica: replica.in_flight)
+
+
+def _retry_on_primary(replica: ReadReplica, name: str, error: BaseException) -> None:
+    """Mark the replica failed before its read is retried on the primary."""
+    global _primary_retries
+    replica.mark_failed(error)
+    _primary_retries += 1
+    logger.warning(f"⚠️ {name}: read replica {replica.label} failed, retrying on primary")
+
+
+async def _primary_pool() -> asyncpg.Pool:
+    global _primary_reads
+    from .connection import ensure_pool
+    pool = await ensure_pool()
+    _primary_reads += 1
+    return pool
+
+
+@asynccontextmanager
+async def acquire_read(name: str = "read") -> AsyncIterator[Any]:
+    """
+    Acquire a connection for a read-only query.
+
+    Uses a replica when one is usable, the primary pool otherwise. A
+    connection-level failure (see ``_is_outage``) marks the replica
+    unhealthy so the next reads go elsewhere. If the replica fails
+    before a connection is handed out, the primary serves this read;
+    failures inside the block are re-raised (use ``run_read`` for
+    queries that can be rerun).
+
+    Args:
+        name: Query name the acquire wait is recorded under (see metrics)
+    """
+    replica = _choose()
+    if replica is not None:
+        entered = False
+        replica.in_flight += 1
+        replica.served += 1
+        try:
+            async with metrics.acquire(replica.pool, name) as conn:
+                entered = True
+                yield conn
+            return
+        except Exception as e:
+            if not _is_outage(e, entered):
+                raise
+            if entered:
+                replica.mark_failed(e)
+                raise
+            _retry_on_primary(replica, name, e)
+        finally:
+            replica.in_flight -= 1
+
+    async with metrics.acquire(await _primary_pool(), name) as conn:
+        yield conn
+
+
+async def run_read(name: str, query: Callable[[Any], Awaitable[T]]) -> T:
+    """
+    Run ``query(conn)`` as a read-only query.
+
+    Like ``acquire_read``, but a connection-level failure on a replica
+    (at acquire time or mid-query) reruns the query once on the primary
+    instead of failing the read. Query errors, including a
+    ``command_timeout`` hit mid-query, are re-raised unchanged and leave
+    the replica healthy (see ``_is_outage``).
+
+    Args:
+        name: Query name the acquire wait is recorded under (see metrics)
+        query: Runs the query on the given connection
+    """
+    replica = _choose()
+    if replica is not None:
+        entered = False
+        replica.in_flight += 1
+        replica.served += 1
+        try:
+            async with metrics.acquire(replica.pool, name) as conn:
+                entered = True
+                return await query(conn)
+        except Exception as e:
+            if not _is_outage(e, entered):
+                raise
+            _retry_on_primary(replica, name, e)
+        finally:
+            replica.in_flight -= 1
+
+    async with metrics.acquire(await _primary_pool(), name) as conn:
+        return await query(conn)
+
+
+def get_replica_stats() -> Dict[str, Any]:
+    """Routing counters and health of every replica."""
+    return {
+        "primary_reads": _primary_reads,
+        "primary_retries": _primary_retries,
+        "replicas": [
+            {
+                "host": replica.label,
+                "healthy": replica.healthy,
+                "lag_seconds": round(replica.lag_seconds, 3),
+                "in_flight": replica.in_flight,
+                "served": replica.served,
+                "failures": replica.failures,
+            }
+            for replica in replicas
+        ],
+    }
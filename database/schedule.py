@@ -0,0 +1,125 @@
+"""
+Compact weekly schedule encoding.
+
+``working_days``/``working_hours``/``is_24_7`` are stored as shown to users.
+For filtering, each place also carries a precomputed schedule:
+
+- ``weekday_mask``: bit ``d`` set when the place works on day ``d`` (0=Monday)
+- ``open_min``/``close_min``: opening and closing time in minutes after midnight
+
+A closing time earlier than the opening time means the place works past
+midnight, into the next day.
+"""
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .models import Place
+
+APP_TIMEZONE = ZoneInfo(os.getenv("APP_TIMEZONE", "Asia/Tashkent"))
+
+ALL_DAYS_MASK = 0b1111111
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_hhmm(value: Any) -> Optional[int]:
+    """
+    Convert an "HH:MM" string to minutes after midnight.
+
+    Returns:
+        Optional[int]: Minutes, or None if the value is missing or malformed.
+    """
+    if not isinstance(value, str) or ":" not in value:
+        return None
+    hours, _, minutes = value.strip().partition(":")
+    try:
+        h, m = int(hours), int(minutes)
+    except ValueError:
+        return None
+    if not (0 <= h <= 24 and 0 <= m < 60) or h * 60 + m > MINUTES_PER_DAY:
+        return None
+    return h * 60 + m
+
+
+def compile_schedule(
+    working_days: Optional[Iterable[int]],
+    working_hours: Optional[Dict[str, Any]],
+    is_24_7: bool = False,
+) -> Tuple[int, Optional[int], Optional[int]]:
+    """
+    Build the compact schedule for a place.
+
+    Args:
+        working_days: Day numbers (0-6, where 0=Monday); empty means every day
+        working_hours: Dict with "start" and "end" in "HH:MM" format
+        is_24_7: Whether the place never closes
+
+    Returns:
+        Tuple[int, Optional[int], Optional[int]]: ``(weekday_mask, open_min, close_min)``.
+        Open/close are None when the hours are unknown.
+    """
+    mask = 0
+    for day in working_days or []:
+        if 0 <= int(day) <= 6:
+            mask |= 1 << int(day)
+    if mask == 0:
+        mask = ALL_DAYS_MASK
+
+    if is_24_7:
+        return ALL_DAYS_MASK, 0, MINUTES_PER_DAY
+
+    hours = working_hours or {}
+    open_min = parse_hhmm(hours.get("start"))
+    close_min = parse_hhmm(hours.get("end"))
+    if open_min is None or close_min is None:
+        return mask, None, None
+
+    # "23:59" is how partners write "until midnight"
+    if close_min == MINUTES_PER_DAY - 1:
+        close_min = MINUTES_PER_DAY
+    # Equal times ("00:00-00:00") mean the place works around the clock
+    if open_min == close_min:
+        open_min, close_min = 0, MINUTES_PER_DAY
+    return mask, open_min, close_min
+
+
+def local_clock(now: Optional[datetime] = None) -> Tuple[int, int]:
+    """
+    Current weekday (0=Monday) and minute of day in the app timezone.
+    """
+    now = now.astimezone(APP_TIMEZONE) if now else datetime.now(APP_TIMEZONE)
+    return now.weekday(), now.hour * 60 + now.minute
+
+
+def is_open(
+    weekday_mask: Optional[int],
+    open_min: Optional[int],
+    close_min: Optional[int],
+    is_24_7: bool,
+    weekday: int,
+    minute: int,
+) -> bool:
+    """
+    Evaluate a compact schedule at a given local weekday and minute.
+
+    Mirrors the ``filter_open_now`` SQL in ``database/queries.py``.
+    """
+    if is_24_7:
+        return True
+    if weekday_mask is None or open_min is None or close_min is None:
+        return False
+
+    today = weekday_mask & (1 << weekday)
+    if open_min <= close_min:
+        return bool(today) and open_min <= minute < close_min
+
+    # Overnight schedule: open from open_min today, or until close_min
+    # if the place opened yesterday.
+    yesterday = weekday_mask & (1 << ((weekday - 1) % 7))
+    return (bool(today) and minute >= open_min) or (bool(yesterday) and minute < close_min)
+
+
+def place_is_open(place: Place, weekday: int, minute: int) -> bool:
+    """Evaluate ``is_open`` for a place."""
+    return is_open(place.weekday_mask, place.open_min, place.close_min, bool(place.is_24_7), weekday, minute)
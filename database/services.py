@@ -0,0 +1,46 @@
+"""
+Canonical service names.
+
+Service filters match the plain names the menus use ("Elektrik",
+"Kuzov tamiri", ...). Partner submissions arrive as button labels with an
+emoji prefix ("⚡ Elektrik") and a few differently worded names, so every
+write normalizes the list to the canonical names.
+"""
+import re
+from typing import Any, Iterable, List
+
+# Leading emoji, variation selectors and spaces of a button label
+_LABEL_PREFIX = re.compile(r"^[^\w']+")
+
+# Partner-form and colloquial wording -> name used by the menus. Inline
+# search matches the same words, so a word means one service everywhere
+# ("Balon" is the menu's callback for the Razval button).
+SERVICE_ALIASES = {
+    "G'ildirak tekshirish": "Razval",
+    "Balon": "Razval",
+    "Tanirovka": "Tonirovka",
+    "Shovqun izolatsiyasi": "Shumka",
+    "Shumoizolyatsiya": "Shumka",
+    "Elektrika": "Elektrik",
+    "Avtoelektrik": "Elektrik",
+    "Kuzovchi": "Kuzov tamiri",
+    "Motor": "Dvigatel tamiri",
+    "Motorist": "Dvigatel tamiri",
+    "Shinomontaj": "Vulkanizatsiya",
+}
+
+
+def normalize_service(label: str) -> str:
+    """Strip a label's emoji prefix and map it to the canonical name."""
+    name = _LABEL_PREFIX.sub("", str(label)).strip()
+    return SERVICE_ALIASES.get(name, name)
+
+
+def normalize_services(services: Iterable[Any]) -> List[str]:
+    """Canonical names of a service list, without blanks and duplicates."""
+    result: List[str] = []
+    for label in services or []:
+        name = normalize_service(label)
+        if name and name not in result:
+            result.append(name)
+    return result
@@ -0,0 +1,176 @@
+"""
+Prepared-statement registry.
+
+Every hot-path query is registered here by name and executed through
+``fetch(conn, name, ...)``. The SQL goes through asyncpg's per-connection
+statement cache, which the pool's ``init`` callback fills for every name,
+so PostgreSQL parses and plans each query only once per connection.
+``PreparedStatement`` objects are deliberately not kept: asyncpg
+invalidates them when their connection is released back to the pool.
+Every execution is recorded in ``database.metrics`` under its statement
+name.
+"""
+import time
+import logging
+from typing import Any, Dict, List
+
+import asyncpg
+
+from . import metrics
+from .models import PLACE_TYPES, place_table
+from .queries import QUERIES, PLACE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Registry "table" of the cross-type search (unified schema only)
+ALL_TYPES = "places"
+
+# Filter combinations of the proximity queries: (service, open_now)
+FILTER_VARIANTS = ((False, False), (True, False), (False, True), (True, True))
+
+# Proximity queries take $1 lat, $2 lon, $3 radius/cells, $4 limit
+FIRST_FILTER_PARAM = 5
+
+# The keyset page query also takes $5 distance (mm) and $6 id of the cursor
+AFTER_FIRST_FILTER_PARAM = 7
+
+
+# Room in the statement cache for ad-hoc queries besides the named ones
+EXTRA_CACHED_STATEMENTS = 32
+
+
+# name -> SQL, fixed by configure() before the pool is created
+_sql: Dict[str, str] = {}
+
+
+def filter_sql(service: bool, open_now: bool, first: int = FIRST_FILTER_PARAM) -> str:
+    """
+    Optional WHERE clauses of the proximity queries.
+
+    Parameters are numbered from ``first`` ($5 by default): the service
+    first, then the three open-now parameters. crud builds its argument
+    lists in the same order.
+    """
+    filters = []
+    n = first
+    if service:
+        filters.append(QUERIES["filter_service"].format(n=n))
+        n += 1
+    if open_now:
+        filters.append(QUERIES["filter_open_now"].format(n=n, m=n + 1, p=n + 2))
+    return "\n".join(filters)
+
+
+def statement_name(query: str, table: str, service: bool = False, open_now: bool = False) -> str:
+    """Registry name of a query for a table and filter combination."""
+    name = f"{query}:{table}"
+    if service:
+        name += "+service"
+    if open_now:
+        name += "+open_now"
+    return name
+
+
+def configure(postgis: bool, unified: bool = False) -> None:
+    """
+    Render the SQL of every named statement.
+
+    Called by init_db before the pool is created. With PostGIS the insert
+    and nearby statements use their geography/KNN variants under the same
+    names, so callers don't need to know which one is active, and
+    ``nearby_places_haversine`` keeps the Haversine ranking that keyset
+    paging relies on. Names are keyed by place type; with the unified schema they target the type's
+    partition, and ``nearby_places:places`` searches every type at once.
+    """
+    _sql.clear()
+    insert_query = "insert_place_geog" if postgis else "insert_place"
+    nearby_query = "nearby_places_knn" if postgis else "nearby_places"
+
+    for place_type in PLACE_TYPES:
+        table = place_table(place_type, unified)
+        _sql[statement_name("insert_place", place_type)] = QUERIES[insert_query].format(table=table)
+        for query in ("places_updated_since", "places_by_service", "place_by_id"):
+            _sql[statement_name(query, place_type)] = QUERIES[query].format(table=table, columns=PLACE_COLUMNS)
+        for service, open_now in FILTER_VARIANTS:
+            filters = filter_sql(service, open_now)
+            _sql[statement_name("nearby_places", place_type, service, open_now)] = QUERIES[nearby_query].format(
+                table=table, columns=PLACE_COLUMNS, filters=filters
+            )
+            _sql[statement_name("places_by_geohash", place_type, service, open_now)] = QUERIES["places_by_geohash"].format(
+                table=table, columns=PLACE_COLUMNS, filters=filters
+            )
+            _sql[statement_name("nearby_places_after", place_type, service, open_now)] = QUERIES["nearby_places_after"].format(
+                table=table, columns=PLACE_COLUMNS, filters=filter_sql(service, open_now, AFTER_FIRST_FILTER_PARAM)
+            )
+            if postgis:
+                # Haversine ranking under KNN (get_nearby_places(knn=False))
+                _sql[statement_name("nearby_places_haversine", place_type, service, open_now)] = QUERIES["nearby_places"].format(
+                    table=table, columns=PLACE_COLUMNS, filters=filters
+                )
+
+    if unified:
+        for service, open_now in FILTER_VARIANTS:
+            _sql[statement_name("nearby_places", ALL_TYPES, service, open_now)] = QUERIES[nearby_query].format(
+                table=ALL_TYPES, columns=f"{PLACE_COLUMNS}, place_type", filters=filter_sql(service, open_now)
+            )
+
+
+def statement_cache_size() -> int:
+    """Statement cache size that keeps every named statement cached."""
+    return len(_sql) + EXTRA_CACHED_STATEMENTS
+
+
+async def prepare_statements(conn: asyncpg.Connection) -> None:
+    """
+    Pool ``init`` callback: put every named statement in the connection's cache.
+
+    ``_get_statement`` is the lookup ``conn.fetch`` itself uses, so later
+    fetches of the same SQL find the statement already prepared. The
+    public ``conn.prepare()`` does not fit a pool: its ``PreparedStatement``
+    is invalidated when the connection is released, and the statement is
+    not added to the cache ``conn.fetch`` reads. ``_get_statement`` is
+    private, so asyncpg is pinned in requirements.txt; if an upgrade drops
+    it, statements are prepared lazily on first use instead.
+    """
+    get_statement = getattr(conn, "_get_statement", None)
+    if get_statement is None:
+        logger.warning("⚠️ asyncpg has no _get_statement, statements will be prepared on first use")
+        return
+    for sql in _sql.values():
+        await get_statement(sql, None)
+
+
+async def fetch(conn: Any, name: str, *args: Any) -> List[asyncpg.Record]:
+    """
+    Run a named statement and return its rows.
+
+    Args:
+        conn: Connection acquired from the pool
+        name: Statement name (see statement_name)
+        *args: Query parameters
+
+    Raises:
+        KeyError: If no statement with that name is registered.
+    """
+    sql = _sql[name]
+    started = time.perf_counter()
+    try:
+        rows = await conn.fetch(sql, *args)
+    except Exception as e:
+        metrics.observe_query(name, (time.perf_counter() - started) * 1000, error=e)
+        raise
+    metrics.observe_query(name, (time.perf_counter() - started) * 1000, len(rows))
+    return rows
+
+
+def get_statement_stats() -> Dict[str, Dict[str, Any]]:
+    """Call counts and cumulative/average time (ms) per statement name."""
+    return {
+        name: {
+            "calls": stats["exec_ms"]["count"],
+            "total_ms": stats["exec_ms"]["sum"],
+            "avg_ms": stats["exec_ms"]["avg"],
+        }
+        for name, stats in metrics.snapshot().items()
+        if name in _sql
+    }
@@ -11,6 +11,7 @@ def setup_routers(dp):
 # handlers/__init__.py
 from .users.menuHendlers import router as menu_router
 from .users.locations_hendler import router as locations_router
+from .users.inline_search import router as inline_search_router
 from .users.start import router as start_router
 from .users.hamkorlik import router as hamkorlik_router
 from .users.echo import router as echo_router
@@ -21,6 +22,7 @@ def setup_routers(dp):
     dp.include_router(start_router)
     dp.include_router(menu_router)
     dp.include_router(locations_router)
+    dp.include_router(inline_search_router)
     dp.include_router(hamkorlik_router)
     dp.include_router(echo_router)
     # dp.include_router(admin_router)  # Agar admin panel bo'lsa
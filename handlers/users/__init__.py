@@ -1,6 +1,7 @@
 from . import start
 from . import menuHendlers
 from . import locations_hendler
+from . import inline_search
 from . import hamkorlik
 from . import echo
 
@@ -8,5 +9,6 @@ def setup(dp):
     dp.include_router(start.router)
     dp.include_router(menuHendlers.router)
     dp.include_router(locations_hendler.router)
+    dp.include_router(inline_search.router)
     dp.include_router(hamkorlik.router)
     dp.include_router(echo.router)
@@ -0,0 +1,203 @@
+# handlers/users/inline_search.py
+"""
+Inline-mode nearby search.
+
+Typing ``@bot moyka`` or ``@bot elektrik`` in any chat returns the nearest
+places to the inline query's location as venue results. Answers are
+personal and carry a ``cache_time``, so Telegram's own cache serves
+repeated queries.
+
+Inline queries arrive on every keystroke: a search only runs once the
+user stops typing for ``INLINE_DEBOUNCE_SECONDS``, and a repeat of a
+search that is still running waits for its result instead.
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Router
+from aiogram.types import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    InlineQuery,
+    InlineQueryResultsButton,
+    InlineQueryResultVenue,
+)
+
+from database import Place
+from database.services import SERVICE_ALIASES
+from handlers.users.locations_hendler import clean_phone, format_hours, short_address
+from utils.misc.get_distance import choose_shortest
+from utils.misc.paging import PAGING_SERVICES
+
+router = Router(name="inline_search")
+logger = logging.getLogger(__name__)
+
+INLINE_CACHE_SECONDS = int(os.getenv("INLINE_CACHE_SECONDS", "60"))
+INLINE_DEBOUNCE_SECONDS = float(os.getenv("INLINE_DEBOUNCE_SECONDS", "0.4"))
+INLINE_MAX_RESULTS = int(os.getenv("INLINE_MAX_RESULTS", "10"))
+
+# So'rov matnidagi so'zlar -> joy turi
+PLACE_TYPE_WORDS = {
+    "carwash": "carwash", "moyka": "carwash", "avtomoyka": "carwash",
+    "autoservice": "autoservice", "avtoservis": "autoservice", "servis": "autoservice",
+}
+
+# So'rovdagi so'z (kichik harflarda) -> xizmat; faqat avtoservislarda.
+# Sinonimlar database.services dan olinadi (menyu va hamkor formasi bilan bir xil).
+# Ko'p so'zli nomlar birinchi so'zi bilan ham topiladi ("kuzov tamiri" -> "kuzov")
+SERVICE_WORDS = {
+    **{service.lower().split()[0]: service for service in PAGING_SERVICES},
+    **{alias.lower().split()[0]: service for alias, service in SERVICE_ALIASES.items()},
+}
+
+# Lokatsiya shu aniqlikda yaxlitlanib, bir xil qidiruvlar birlashtiriladi (~10 m)
+COALESCE_PRECISION = 4
+
+# Foydalanuvchining oxirgi inline so'rovi (debounce uchun)
+_latest_query: Dict[int, str] = {}
+
+# Foydalanuvchining bajarilayotgan qidiruvi: (kalit, task)
+SearchKey = Tuple[str, Optional[str], float, float]
+_in_flight: Dict[int, Tuple[SearchKey, "asyncio.Future[List[Place]]"]] = {}
+
+INLINE_STATS: Dict[str, int] = {
+    "queries": 0,       # kelgan inline so'rovlar
+    "debounced": 0,     # yangi so'rov kelgani uchun tashlab ketilganlar
+    "coalesced": 0,     # bajarilayotgan qidiruv natijasini kutganlar
+    "searches": 0,      # choose_shortest chaqiruvlari
+    "no_location": 0,   # lokatsiyasiz so'rovlar
+}
+
+
+def get_inline_stats() -> Dict[str, int]:
+    """
+    Inline qidiruv metrikalarining nusxasi
+    """
+    return dict(INLINE_STATS)
+
+
+def parse_query(text: str) -> Tuple[str, Optional[str]]:
+    """
+    So'rov matnidan joy turi va xizmatni aniqlash.
+
+    Args:
+        text: Inline so'rov matni (masalan "moyka", "elektrik")
+
+    Returns:
+        Tuple[str, Optional[str]]: (place_type, service); noma'lum matn
+        avtoservis qidiruvi hisoblanadi.
+    """
+    place_type, service = "autoservice", None
+    for word in text.lower().split():
+        if word in PLACE_TYPE_WORDS:
+            place_type = PLACE_TYPE_WORDS[word]
+        elif word in SERVICE_WORDS:
+            service = SERVICE_WORDS[word]
+    if place_type != "autoservice":
+        service = None
+    return place_type, service
+
+
+def venue_result(place: Place, place_type: str) -> InlineQueryResultVenue:
+    """Joyni inline venue natijasiga aylantirish"""
+    # Inline xabarlarda callback tugmalari ishlamaydi, faqat URL tugmalar
+    buttons = [[InlineKeyboardButton(text="🗺 Xaritada ochish", url=place.gmaps_url)]]
+    if place.phone:
+        phone = clean_phone(place.phone)
+        if phone:
+            buttons.append([InlineKeyboardButton(text="📞 Aloqa", url=f'tg://resolve?phone={phone}')])
+
+    name = place.name or "Noma'lum joy"
+    address = short_address(place.address or "Manzil yo'q")
+    return InlineQueryResultVenue(
+        id=f"{place_type}:{place.id}"[:64],
+        latitude=place.lat,
+        longitude=place.lon,
+        title=f"{name} — {place.distance_km or 0.0:.2f} km",
+        address=f"{address} | 🕒 {format_hours(place)}",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons),
+    )
+
+
+async def _search(user_id: int, key: SearchKey, lat: float, lon: float) -> List[Place]:
+    """
+    Qidiruvni bajarish; foydalanuvchining xuddi shu qidiruvi bajarilayotgan
+    bo'lsa, yangisini boshlamasdan o'sha natijani kutish.
+    """
+    in_flight = _in_flight.get(user_id)
+    if in_flight is not None and in_flight[0] == key:
+        INLINE_STATS["coalesced"] += 1
+        return await asyncio.shield(in_flight[1])
+
+    place_type, service = key[0], key[1]
+    INLINE_STATS["searches"] += 1
+    task = asyncio.ensure_future(choose_shortest(
+        {"latitude": lat, "longitude": lon},
+        max_results=INLINE_MAX_RESULTS,
+        place_type=place_type,
+        service=service,
+    ))
+    _in_flight[user_id] = (key, task)
+    try:
+        return await asyncio.shield(task)
+    finally:
+        if _in_flight.get(user_id, (None, None))[1] is task:
+            _in_flight.pop(user_id, None)
+
+
+@router.inline_query()
+async def inline_nearby(inline_query: InlineQuery) -> None:
+    """
+    Return the nearest places for an inline query.
+
+    Args:
+        inline_query: Inline query (inline location must be enabled in BotFather)
+    """
+    user_id = inline_query.from_user.id
+    INLINE_STATS["queries"] += 1
+
+    location = inline_query.location
+    if location is None:
+        INLINE_STATS["no_location"] += 1
+        await inline_query.answer(
+            [],
+            cache_time=INLINE_CACHE_SECONDS,
+            is_personal=True,
+            button=InlineQueryResultsButton(text="📍 Lokatsiyaga ruxsat bering", start_parameter="location"),
+        )
+        return
+
+    # Debounce: yozish davom etayotgan bo'lsa, faqat oxirgi so'rovga javob beramiz
+    _latest_query[user_id] = inline_query.id
+    await asyncio.sleep(INLINE_DEBOUNCE_SECONDS)
+    if _latest_query.get(user_id) != inline_query.id:
+        INLINE_STATS["debounced"] += 1
+        return
+
+    place_type, service = parse_query(inline_query.query)
+    key = (
+        place_type,
+        service,
+        round(location.latitude, COALESCE_PRECISION),
+        round(location.longitude, COALESCE_PRECISION),
+    )
+    try:
+        places = await _search(user_id, key, location.latitude, location.longitude)
+    except Exception as e:
+        logger.error(f"inline search error: {e}")
+        places = []
+    finally:
+        if _latest_query.get(user_id) == inline_query.id:
+            _latest_query.pop(user_id, None)
+
+    try:
+        await inline_query.answer(
+            [venue_result(place, place_type) for place in places],
+            cache_time=INLINE_CACHE_SECONDS,
+            is_personal=True,
+        )
+    except Exception as e:
+        # So'rov eskirgan bo'lishi mumkin (Telegram javobni ~10 soniya kutadi)
+        logger.error(f"inline answer error: {e}")
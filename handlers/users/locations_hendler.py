@@ -8,22 +8,46 @@ and carwashes with detailed information.
 from aiogram import Router, F, types
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
+import os
+import time
 
 from loader import bot
+from database import Place, get_place_by_id
 from keyboards.default.location_button import keyboard, back, back2
-from utils.misc.get_distance import choose_shortest
+from utils.misc.get_distance import choose_next, choose_shortest, distance_mm
+from utils.misc.send_scheduler import scheduler
+from utils.misc.card_cache import CardTemplate, get_template
+from utils.misc.lru_cache import TTLCache
+from utils.misc.paging import PageCursor, to_micro
 
 router = Router()
 logger = logging.getLogger(__name__)
 
-# Cache saqlash uchun
-GEO_CACHE = {
-    "autoservice": {},
-    "carwash": {}
+# Natijalarni ko'rsatish usuli:
+#   "messages" - har bir joy alohida xabarda (xabarlar parallel yuboriladi)
+#   "single"   - barcha joylar bitta xabarda, umumiy inline klaviatura bilan
+RENDER_MODE = os.getenv("RESULTS_RENDER_MODE", "messages")
+if RENDER_MODE not in ("messages", "single"):
+    logger.warning(f"⚠️ Noma'lum RESULTS_RENDER_MODE={RENDER_MODE}, 'messages' ishlatiladi")
+    RENDER_MODE = "messages"
+
+# "single" rejimida joyning to'liq kartasini ochuvchi "🔎" tugmalari
+RENDER_EXPAND = os.getenv("RESULTS_EXPAND", "1") == "1"
+
+# Har bir rejim bo'yicha qidiruv natijalarini yuborish metrikalari
+RENDER_STATS: Dict[str, Dict[str, float]] = {
+    mode: {"searches": 0, "api_calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+    for mode in ("messages", "single")
 }
 
+# Ko'rsatilgan joylar keshi: (place_type, place_id) -> Place.
+# Cheklangan hajmli; topilmasa database dan olinadi (find_place)
+GEO_CACHE_SIZE = int(os.getenv("GEO_CACHE_SIZE", "5000"))
+GEO_CACHE_TTL_SECONDS = float(os.getenv("GEO_CACHE_TTL_SECONDS", "3600"))
+GEO_CACHE = TTLCache(max_size=GEO_CACHE_SIZE, ttl=GEO_CACHE_TTL_SECONDS)
+
 WEEK_DAYS_UZ = {
     0: "Dushanba", 1: "Seshanba", 2: "Chorshanba",
     3: "Payshanba", 4: "Juma", 5: "Shanba", 6: "Yakshanba"
@@ -46,9 +70,15 @@ CARWASH_SERVICES = [
     "Salon tozalash", "Disk tozalash"
 ]
 
+# Bir sahifadagi joylar soni
+PAGE_SIZE = 3
+
 # Joy turini saqlash uchun user ma'lumotlari
 user_place_type = {}
 
+# Tanlangan xizmat (masalan "Elektrik"); bo'lmasa barcha joylar qidiriladi
+user_service = {}
+
 # ================== FUNKSIYALAR ==================
 
 def format_working_days_compact(working_days_list: List[int]) -> str:
@@ -90,19 +120,16 @@ def format_services_with_status(available_services: List[str], service_type: str
     Returns:
         str: Formatted string with services marked as available (✅) or not (❌)
     """
-    services_text = ""
-    
     if service_type == "autoservice":
         service_list = SERVICE_ORDER
     else:  # carwash
         service_list = CARWASH_SERVICES
     
-    for service in service_list:
-        if service in available_services:
-            services_text += f"✅ {service}\n"
-        else:
-            services_text += f"❌ {service}\n"
-    return services_text
+    available = set(available_services)
+    return "".join(
+        f"✅ {service}\n" if service in available else f"❌ {service}\n"
+        for service in service_list
+    )
 
 def short_address(address: str, max_words: int = 5) -> str:
     """
@@ -120,6 +147,258 @@ def short_address(address: str, max_words: int = 5) -> str:
         return ' '.join(words[:max_words]) + '...'
     return address
 
+def format_hours(place: Place) -> str:
+    """Ish vaqti matni: "24/7", "09:00–18:00" yoki "Ma'lumot yo'q"."""
+    if place.is_24_7:
+        return "24/7"
+    working_hours = place.working_hours or {}
+    if not working_hours:
+        return "Ma'lumot yo'q"
+    return f"{working_hours.get('start','?')}–{working_hours.get('end','?')}"
+
+def clean_phone(phone: str) -> str:
+    """Telefon raqamidan faqat raqamlarni qoldirish"""
+    return ''.join(filter(str.isdigit, phone.replace('+', '')))
+
+def build_card(place: Place, place_type: str) -> CardTemplate:
+    """
+    Joyning to'liq kartasi (xizmatlar ro'yxati bilan) va klaviaturasi.
+    
+    Tartib raqami va masofa yuborish paytida qo'yiladi (card_cache).
+    """
+    name = place.name or "Noma'lum joy"
+    addr_short = short_address(place.address or "Manzil yo'q")
+    compact_days = format_working_days_compact(place.working_days or [])
+    services_block = format_services_with_status(place.services or [], place_type)
+    services_icon = "⚙️" if place_type == "autoservice" else "🧼"
+    
+    return CardTemplate(
+        parts=(
+            "<b>#",
+            f" — {name}</b>\n📍 {addr_short} | ",
+            f" km\n"
+            f"🕒 {format_hours(place)} |\n"
+            f"📅 {compact_days}\n\n"
+            f"────────────────\n"
+            f"{services_icon} Xizmatlar:\n"
+            f"{services_block}"
+            f"────────────────",
+        ),
+        keyboard=place_card_keyboard(place, place_type),
+    )
+
+def build_summary(place: Place) -> CardTemplate:
+    """Joyning qisqa ko'rinishi ("single" rejimi uchun)"""
+    name = place.name or "Noma'lum joy"
+    addr_short = short_address(place.address or "Manzil yo'q")
+    services = ", ".join(place.services) if place.services else "Ma'lumot yo'q"
+    return CardTemplate(parts=(
+        "<b>#",
+        f" — {name}</b> | ",
+        f" km\n"
+        f"📍 {addr_short}\n"
+        f"🕒 {format_hours(place)} | 📅 {format_working_days_compact(place.working_days or [])}\n"
+        f"🔧 {services}",
+    ))
+
+def place_card(place: Place, place_type: str) -> CardTemplate:
+    """Keshlangan to'liq karta"""
+    return get_template("card", place_type, place, lambda: build_card(place, place_type))
+
+def place_summary(place: Place, place_type: str) -> CardTemplate:
+    """Keshlangan qisqa karta"""
+    return get_template("summary", place_type, place, lambda: build_summary(place))
+
+def place_card_keyboard(place: Place, place_type: str) -> InlineKeyboardMarkup:
+    """Bitta joy kartasining klaviaturasi: geolokatsiya, xarita, aloqa"""
+    buttons = [
+        [
+            InlineKeyboardButton(text="📍 Geolokatsiya", callback_data=f"geo_id_{place_type}_{place.id}"),
+            InlineKeyboardButton(text="🗺 Xaritada ochish", url=place.gmaps_url),
+        ]
+    ]
+    if place.phone:
+        # Sanitize phone number (remove invalid characters)
+        phone = clean_phone(place.phone)
+        if phone:
+            buttons.append([
+                InlineKeyboardButton(text="📞 Aloqa", url=f'tg://resolve?phone={phone}'),
+            ])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+def results_keyboard(
+    places: List[Place],
+    place_type: str,
+    start: int = 1,
+    next_data: Optional[str] = None,
+) -> InlineKeyboardMarkup:
+    """
+    Barcha natijalar uchun umumiy klaviatura.
+    
+    Har bir joyga bitta qator (📍 / 🗺 / 📞, tartib raqami bilan);
+    RENDER_EXPAND yoqilgan bo'lsa, oxirida to'liq kartani ochuvchi tugmalar;
+    next_data berilsa, "➡️ Keyingi" tugmasi.
+    """
+    buttons = []
+    for index, place in enumerate(places, start=start):
+        row = [
+            InlineKeyboardButton(text=f"📍 {index}", callback_data=f"geo_id_{place_type}_{place.id}"),
+            InlineKeyboardButton(text=f"🗺 {index}", url=place.gmaps_url),
+        ]
+        phone = clean_phone(place.phone) if place.phone else ""
+        if phone:
+            row.append(InlineKeyboardButton(text=f"📞 {index}", url=f'tg://resolve?phone={phone}'))
+        buttons.append(row)
+    if RENDER_EXPAND:
+        buttons.append([
+            InlineKeyboardButton(text=f"🔎 #{index}", callback_data=f"expand_{place_type}_{index}_{place.id}")
+            for index, place in enumerate(places, start=start)
+        ])
+    if next_data:
+        buttons.append([InlineKeyboardButton(text="➡️ Keyingi", callback_data=next_data)])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+def next_page_data(
+    place_type: str,
+    service: Optional[str],
+    open_now: bool,
+    start: int,
+    lat_micro: int,
+    lon_micro: int,
+    last: Place,
+    edit: bool = True,
+) -> Optional[str]:
+    """
+    "➡️ Keyingi" tugmasining callback_data si (utils.misc.paging).
+    
+    Masofa boshlang'ich nuqtadan (mikrogradusda saqlangan) hisoblanadi,
+    keyingi sahifalar ham aynan shu nuqtadan qidiriladi.
+    
+    Returns:
+        Optional[str]: callback_data, yoki kursor tuzib bo'lmasa None
+    """
+    cursor = PageCursor(
+        place_type=place_type,
+        service=service,
+        open_now=open_now,
+        start=start,
+        lat_micro=lat_micro,
+        lon_micro=lon_micro,
+        after_mm=distance_mm(lat_micro / 1_000_000, lon_micro / 1_000_000, last),
+        after_id=last.id,
+        edit=edit,
+    )
+    data = cursor.encode()
+    if data is None:
+        logger.warning(f"⚠️ Paging cursor does not fit for place {last.id}")
+    return data
+
+def record_render(mode: str, api_calls: int, elapsed_ms: float) -> None:
+    """Bitta qidiruv natijasini yuborish metrikasini yozish"""
+    stats = RENDER_STATS[mode]
+    stats["searches"] += 1
+    stats["api_calls"] += api_calls
+    stats["total_ms"] += elapsed_ms
+    stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+def get_render_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Rejimlar bo'yicha qidiruvlar soni, API chaqiruvlari va kechikish (ms)
+    """
+    report = {}
+    for mode, stats in RENDER_STATS.items():
+        searches = stats["searches"] or 1
+        report[mode] = {
+            **stats,
+            "avg_api_calls": round(stats["api_calls"] / searches, 2),
+            "avg_ms": round(stats["total_ms"] / searches, 3),
+        }
+    return report
+
+async def send_place_cards(
+    message: Message,
+    places: List[Place],
+    place_type: str,
+    next_data: Optional[str] = None,
+) -> int:
+    """
+    Har bir joyni alohida xabarda yuborish (scheduler orqali, ketma-ket).
+    
+    Kartalar tartib bilan kelishi kerak: next_data berilsa, "➡️ Keyingi"
+    tugmasi oxirgi kartaga qo'shiladi va u chatda oxirgi bo'lib turadi.
+    
+    Returns:
+        int: Bot API chaqiruvlari soni
+    """
+    cards = [place_card(place, place_type) for place in places]
+    keyboards = [card.keyboard for card in cards]
+    if next_data:
+        keyboards[-1] = InlineKeyboardMarkup(inline_keyboard=[
+            *keyboards[-1].inline_keyboard,
+            [InlineKeyboardButton(text="➡️ Keyingi", callback_data=next_data)],
+        ])
+    results = await scheduler.sequence([
+        lambda card=card, place=place, index=index, markup=markup: message.answer(
+            card.render(index, place.distance_km or 0.0),
+            reply_markup=markup,
+            disable_web_page_preview=False,
+            parse_mode='HTML',
+        )
+        for index, (card, place, markup) in enumerate(zip(cards, places, keyboards), start=1)
+    ])
+    for index, result in enumerate(results, start=1):
+        if isinstance(result, Exception):
+            logger.error(f"Error sending message: {result}")
+        else:
+            logger.debug(f"Place #{index} sent to user")
+    return len(results)
+
+def page_text(places: List[Place], place_type: str, start: int = 1) -> str:
+    """Joylarning qisqa kartalari bitta xabar matni sifatida"""
+    return "\n\n".join(
+        place_summary(place, place_type).render(index, place.distance_km or 0.0)
+        for index, place in enumerate(places, start=start)
+    )
+
+async def send_places_single(
+    message: Message,
+    places: List[Place],
+    place_type: str,
+    next_data: Optional[str] = None,
+) -> int:
+    """
+    Barcha joylarni bitta xabarda yuborish.
+    
+    Returns:
+        int: Bot API chaqiruvlari soni
+    """
+    text = page_text(places, place_type)
+    try:
+        await scheduler.send(lambda: message.answer(
+            text,
+            reply_markup=results_keyboard(places, place_type, next_data=next_data),
+            disable_web_page_preview=True,
+            parse_mode='HTML',
+        ))
+    except Exception as e:
+        logger.error(f"Error sending message: {e}")
+    return 1
+
+async def find_place(place_type: str, place_id: str) -> Optional[Place]:
+    """
+    Joyni keshdan, bo'lmasa database dan (primary key bo'yicha) olish.
+    
+    Bot qayta ishga tushgandan keyin yoki boshqa worker da ham eski
+    xabarlardagi tugmalar ishlashi uchun.
+    """
+    key = (place_type, place_id)
+    place = GEO_CACHE.get(key)
+    if place is None:
+        place = await get_place_by_id(place_id, place_type)
+        if place is not None:
+            GEO_CACHE.set(key, place)
+    return place
+
 # ================== HANDLERS ==================
 
 @router.message(F.location)
@@ -156,11 +435,24 @@ async def get_nearest_places(message: Message) -> None:
         await message.answer("📍 Iltimos, avval servis turini tanlang (avtoservis yoki avtomoyka)")
         return
 
-    logger.debug(f"User {user_id} place_type: {place_type}")
+    service = user_service.get(user_id)
+    logger.debug(f"User {user_id} place_type: {place_type}, service: {service}")
     
+    # Kursor koordinatalarni mikrogradusda saqlaydi; 1-sahifa ham aynan shu
+    # nuqtadan hisoblanadi, aks holda sahifalar chegarasi siljiydi
+    lat_micro, lon_micro = to_micro(location.latitude), to_micro(location.longitude)
+    origin = {"latitude": lat_micro / 1_000_000, "longitude": lon_micro / 1_000_000}
+
+    started = time.perf_counter()
     try:
-        # Get nearest places from database
-        closest_places = await choose_shortest(location, max_results=3, place_type=place_type)
+        # Get nearest places offering the selected service, open ones first
+        closest_places = await choose_shortest(
+            origin, max_results=PAGE_SIZE, place_type=place_type, service=service, open_now=True
+        )
+        showing_closed = not closest_places
+        if showing_closed:
+            logger.debug("No open places found, falling back to all places")
+            closest_places = await choose_shortest(origin, max_results=PAGE_SIZE, place_type=place_type, service=service)
         logger.debug(f"choose_shortest returned {len(closest_places)} places")
     except Exception as e:
         logger.error(f"choose_shortest error: {e}")
@@ -174,82 +466,35 @@ async def get_nearest_places(message: Message) -> None:
 
     logger.debug(f"{len(closest_places)} places found, showing to user...")
 
-    for index, place in enumerate(closest_places, start=1):
-        place_id = place.get("id") or f"{place_type}_{index}"
-        GEO_CACHE[place_type][place_id] = place
-
-        name = place.get("name", "Noma'lum joy")
-        distance = place.get("distance_km", 0.0)
-        address = place.get("address", "Manzil yo'q")
-        services = place.get("services", []) or []
-        working_days = place.get("working_days", [])
-        working_hours = place.get("working_hours", {})
-        is_24_7 = place.get("is_24_7", False)
-        phone = place.get("phone")
-        gmaps_url = place.get("gmaps_url", "https://maps.google.com")
-
-        logger.debug(f"Place #{index}: {name}, distance: {distance} km")
-
-        # Format information for both service types
-        addr_short = short_address(address)
-        compact_days = format_working_days_compact(working_days)
-        services_block = format_services_with_status(services, place_type)
-        
-        hours_text = "24/7" if is_24_7 else (f"{working_hours.get('start','?')}–{working_hours.get('end','?')}" if working_hours else "Ma'lumot yo'q")
-
-        if place_type == "autoservice":
-            text = (
-                f"<b>#{index} — {name}</b>\n"
-                f"📍 {addr_short} | {distance:.2f} km\n"
-                f"🕒 {hours_text} |\n"
-                f"📅 {compact_days}\n\n"
-                f"────────────────\n"
-                f"⚙️ Xizmatlar:\n"
-                f"{services_block}"
-                f"────────────────"
-            )
-        else:  # carwash
-            text = (
-                f"<b>#{index} — {name}</b>\n"
-                f"📍 {addr_short} | {distance:.2f} km\n"
-                f"🕒 {hours_text} |\n"
-                f"📅 {compact_days}\n\n"
-                f"────────────────\n"
-                f"🧼 Xizmatlar:\n"
-                f"{services_block}"
-                f"────────────────"
-            )
-
-        buttons = [
-            [
-                InlineKeyboardButton(text="📍 Geolokatsiya", callback_data=f"geo_id_{place_type}_{place_id}"),
-                InlineKeyboardButton(text="🗺 Xaritada ochish", url=gmaps_url),
-            ]
-        ]
-        
-        if phone:
-            # Sanitize phone number (remove invalid characters)
-            clean_phone = ''.join(filter(str.isdigit, phone.replace('+', '')))
-            if clean_phone:
-                buttons.append([
-                    InlineKeyboardButton(text="📞 Aloqa", url=f'tg://resolve?phone={clean_phone}'),
-                ])
-            
-        info_keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
-
-        try:
-            await message.answer(text, reply_markup=info_keyboard, disable_web_page_preview=False, parse_mode='HTML')
-            logger.debug(f"Place #{index} sent to user")
-        except Exception as e:
-            logger.error(f"Error sending message: {e}")
+    for place in closest_places:
+        GEO_CACHE.set((place_type, place.id), place)
 
+    # Sahifa to'la bo'lsa, keyingi sahifa uchun kursor (foydalanuvchi holati kerak emas)
+    next_data = None
+    if len(closest_places) == PAGE_SIZE:
+        # "messages" rejimida tugma 3-kartada turadi: u tahrirlanmaydi,
+        # keyingi sahifa yangi xabar bo'lib keladi
+        next_data = next_page_data(
+            place_type, service, not showing_closed, PAGE_SIZE + 1,
+            lat_micro, lon_micro,
+            closest_places[-1], edit=RENDER_MODE == "single",
+        )
+
+    if RENDER_MODE == "single":
+        api_calls = await send_places_single(message, closest_places, place_type, next_data)
+    else:
+        api_calls = await send_place_cards(message, closest_places, place_type, next_data)
+
+    closed_note = "🌙 Hozir ochiq joy topilmadi, eng yaqinlari ko'rsatildi.\n" if showing_closed else ""
     if place_type == "carwash":
-        await message.answer("✅ Eng yaqin 3 ta avtomoyka ko'rsatildi!", reply_markup=back2)
+        await message.answer(f"{closed_note}✅ Eng yaqin 3 ta avtomoyka ko'rsatildi!", reply_markup=back2)
     else:
-        await message.answer("✅ Eng yaqin 3 ta avtoservis ko'rsatildi!", reply_markup=back)
+        await message.answer(f"{closed_note}✅ Eng yaqin 3 ta avtoservis ko'rsatildi!", reply_markup=back)
+    record_render(RENDER_MODE, api_calls + 1, (time.perf_counter() - started) * 1000)
     
     # Remove user from tracking
     user_place_type.pop(user_id, None)
+    user_service.pop(user_id, None)
     logger.debug(f"User {user_id} removed from user_place_type")
 
 @router.callback_query(F.data.startswith("geo_id_"))
@@ -276,22 +521,119 @@ async def send_geo(call: CallbackQuery) -> None:
         await call.answer("❌ Noto'g'ri ma'lumot / Invalid data", show_alert=True)
         return
     
-    place = GEO_CACHE.get(place_type, {}).get(place_id)
+    place = await find_place(place_type, place_id)
     if not place:
         await call.answer("❌ Lokatsiya topilmadi yoki eskirgan ma'lumot / Location not found", show_alert=True)
         return
 
-    lat = place.get("lat")
-    lon = place.get("lon")
-    if lat is None or lon is None:
-        await call.answer("❌ Bu joy uchun koordinata mavjud emas / No coordinates available", show_alert=True)
-        return
-
     try:
         if call.message:
-            await call.message.answer_location(latitude=float(lat), longitude=float(lon))
+            await call.message.answer_location(latitude=place.lat, longitude=place.lon)
         else:
             await call.answer("❌ Xabar topilmadi / Message not found", show_alert=True)
     except Exception as e:
         logger.error(f"send_geo error: {e}")
         await call.answer("❌ Lokatsiyani yuborishda xatolik / Error sending location", show_alert=True)
+
+@router.callback_query(F.data.startswith("expand_"))
+async def expand_place(call: CallbackQuery) -> None:
+    """
+    "single" rejimida tanlangan joyning to'liq kartasini yuborish.
+    
+    Args:
+        call: Callback query (expand_<place_type>_<index>_<place_id>)
+    """
+    parts = call.data.split("_", 3)
+    if len(parts) < 4 or parts[1] not in ("autoservice", "carwash") or not parts[2].isdigit():
+        await call.answer("❌ Ma'lumot xato / Invalid data", show_alert=True)
+        return
+
+    place_type, index, place_id = parts[1], int(parts[2]), parts[3]
+    # Masofa faqat qidiruv natijasida bor, shuning uchun database ga qaytilmaydi
+    place = GEO_CACHE.get((place_type, place_id))
+    if not place or place.distance_km is None or not call.message:
+        await call.answer("❌ Ma'lumot topilmadi yoki eskirgan / Not found", show_alert=True)
+        return
+
+    await call.answer()
+    card = place_card(place, place_type)
+    try:
+        await scheduler.send(lambda: call.message.answer(
+            card.render(index, place.distance_km or 0.0),
+            reply_markup=card.keyboard,
+            parse_mode='HTML',
+        ))
+    except Exception as e:
+        logger.error(f"expand_place error: {e}")
+
+@router.callback_query(F.data.startswith("nx:"))
+async def next_page(call: CallbackQuery) -> None:
+    """
+    "➡️ Keyingi": kursordan keyingi joylarni ko'rsatish.
+    
+    Sahifa xabari tahrirlanadi; "messages" rejimidagi 3-karta esa
+    saqlanib qoladi (faqat tugmasi olinadi), keyingi sahifa yangi xabar
+    bo'lib yuboriladi.
+    
+    Args:
+        call: Callback query (PageCursor formatidagi data)
+    """
+    cursor = PageCursor.decode(call.data)
+    if cursor is None:
+        await call.answer("❌ Ma'lumot xato / Invalid data", show_alert=True)
+        return
+    if not call.message:
+        await call.answer("❌ Xabar topilmadi / Message not found", show_alert=True)
+        return
+
+    place_type, start = cursor.place_type, cursor.start
+    # Bittasi ortiqcha olinadi: keyingi sahifa borligini bilish uchun
+    places = await choose_next(
+        cursor.lat,
+        cursor.lon,
+        cursor.after_mm,
+        cursor.after_id,
+        max_results=PAGE_SIZE + 1,
+        place_type=place_type,
+        service=cursor.service,
+        open_now=cursor.open_now,
+    )
+    if not places:
+        await call.answer("Boshqa yaqin joy topilmadi 😔", show_alert=True)
+        return
+
+    await call.answer()
+    page = places[:PAGE_SIZE]
+    for place in page:
+        GEO_CACHE.set((place_type, place.id), place)
+
+    next_data = None
+    if len(places) > PAGE_SIZE:
+        next_data = next_page_data(
+            place_type, cursor.service, cursor.open_now, start + PAGE_SIZE,
+            cursor.lat_micro, cursor.lon_micro, page[-1],
+        )
+    text = page_text(page, place_type, start)
+    markup = results_keyboard(page, place_type, start, next_data)
+
+    try:
+        if cursor.edit:
+            await scheduler.send(lambda: call.message.edit_text(
+                text, reply_markup=markup, disable_web_page_preview=True, parse_mode='HTML',
+            ))
+            return
+        # Karta o'zgarmaydi, faqat "➡️ Keyingi" tugmasi olib tashlanadi
+        card_rows = [
+            row for row in (call.message.reply_markup.inline_keyboard if call.message.reply_markup else [])
+            if not any(button.callback_data == call.data for button in row)
+        ]
+        await scheduler.gather([
+            lambda: call.message.answer(
+                text, reply_markup=markup, disable_web_page_preview=True, parse_mode='HTML',
+            ),
+            lambda: call.message.edit_reply_markup(
+                reply_markup=InlineKeyboardMarkup(inline_keyboard=card_rows),
+            ),
+        ])
+    except Exception as e:
+        logger.error(f"next_page error: {e}")
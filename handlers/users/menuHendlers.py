@@ -6,8 +6,8 @@ from aiogram.enums import ParseMode
 from keyboards.inline.menu import xizmatlar, categoryMenu
 from keyboards.default.location_button import keyboard
 
-# locations_hendler dan user_place_type ni import qilamiz
-from handlers.users.locations_hendler import user_place_type
+# locations_hendler dan user_place_type va user_service ni import qilamiz
+from handlers.users.locations_hendler import user_place_type, user_service
 
 try:
     from loader import dp  
@@ -21,6 +21,7 @@ async def on_avtoservis(call: CallbackQuery) -> None:
     await call.answer()
     # user_place_type ga qo'shamiz
     user_place_type[call.from_user.id] = "autoservice"
+    user_service.pop(call.from_user.id, None)
     print(f"DEBUG: avtoservis tanlandi - user_id: {call.from_user.id}")
     
     if call.message:
@@ -37,17 +38,19 @@ async def on_moyka(call: CallbackQuery) -> None:
     await call.answer()
     # user_place_type ga qo'shamiz
     user_place_type[call.from_user.id] = "carwash"
+    user_service.pop(call.from_user.id, None)
     print(f"DEBUG: moyka tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtomoyka</b>larni ko'rsatamiz 🤩"
     if call.message:
         await call.message.answer(text, parse_mode=ParseMode.HTML, reply_markup=keyboard)
 
-# HAR BIR XIZMAT TURI UCHUN user_place_type GA QO'SHAMIZ
+# HAR BIR XIZMAT TURI UCHUN user_place_type VA user_service GA QO'SHAMIZ
 @router.callback_query(F.data == "elektrik")
 async def on_elektrik(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Elektrik"
     print(f"DEBUG: elektrik tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Elektrik</b>larni ko'rsatamiz 🤩"
@@ -58,6 +61,7 @@ async def on_elektrik(call: CallbackQuery) -> None:
 async def on_kuzov(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Kuzov tamiri"
     print(f"DEBUG: kuzov tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtoservice</b>larni ko'rsatamiz 🤩"
@@ -68,6 +72,7 @@ async def on_kuzov(call: CallbackQuery) -> None:
 async def on_motor(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Dvigatel tamiri"
     print(f"DEBUG: motor tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtoservice</b>larni ko'rsatamiz 🤩"
@@ -78,6 +83,7 @@ async def on_motor(call: CallbackQuery) -> None:
 async def on_vulkanizatsiya(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Vulkanizatsiya"
     print(f"DEBUG: vulkanizatsiya tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Vulkanizatsiya</b>larni ko'rsatamiz 🤩"
@@ -88,6 +94,7 @@ async def on_vulkanizatsiya(call: CallbackQuery) -> None:
 async def on_balon(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Razval"
     print(f"DEBUG: balon tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtoservice</b>larni ko'rsatamiz 🤩"
@@ -98,6 +105,7 @@ async def on_balon(call: CallbackQuery) -> None:
 async def on_tanirovka(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Tonirovka"
     print(f"DEBUG: tanirovka tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtoservice</b>larni ko'rsatamiz 🤩"
@@ -108,6 +116,7 @@ async def on_tanirovka(call: CallbackQuery) -> None:
 async def on_shumka(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Shumka"
     print(f"DEBUG: shumka tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtoservice</b>larni ko'rsatamiz 🤩"
@@ -118,6 +127,7 @@ async def on_shumka(call: CallbackQuery) -> None:
 async def on_universal(call: CallbackQuery) -> None:
     await call.answer()
     user_place_type[call.from_user.id] = "autoservice"
+    user_service[call.from_user.id] = "Universal"
     print(f"DEBUG: universal tanlandi - user_id: {call.from_user.id}")
     
     text = "<b>📍 Joylashuvingizni yuboring</b>, biz sizga eng yaqin <b>Avtoservice</b>larni ko'rsatamiz 🤩"
@@ -33,9 +33,9 @@ async def migrate_data():
             "is_24_7": service["is_24_7"]
         })
     
-    success = await batch_insert_autoservices(autoservice_data)
-    if success:
-        print(f"✅ {len(autoservice_data)} ta avtoservis database ga qo'shildi")
+    result = {}
+    if await batch_insert_autoservices(autoservice_data, stats=result):
+        print(f"✅ Avtoservislar: {result['inserted']} ta qo'shildi, {result['updated']} ta yangilandi, {result['skipped']} ta o'tkazib yuborildi")
     else:
         print("❌ Avtoservislarni qo'shishda xatolik")
     
@@ -55,9 +55,9 @@ async def migrate_data():
             "is_24_7": carwash["is_24_7"]
         })
     
-    success = await batch_insert_carwashes(carwash_data)
-    if success:
-        print(f"✅ {len(carwash_data)} ta avtomoyka database ga qo'shildi")
+    result = {}
+    if await batch_insert_carwashes(carwash_data, stats=result):
+        print(f"✅ Avtomoykalar: {result['inserted']} ta qo'shildi, {result['updated']} ta yangilandi, {result['skipped']} ta o'tkazib yuborildi")
     else:
         print("❌ Avtomoykalarni qo'shishda xatolik")
     
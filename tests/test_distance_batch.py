@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.misc.distance_batch import as_coords, distance_matrix, distances_from, nearest_k, top_k
+from utils.misc.get_distance import calc_distance
+
+
+def random_points(rnd, count):
+    return [(rnd.uniform(-89, 89), rnd.uniform(-180, 180)) for _ in range(count)]
+
+
+def test_distances_from_matches_scalar():
+    rnd = random.Random(1)
+    points = random_points(rnd, 500)
+    # Near-identical, antipodal and antimeridian-crossing pairs included
+    points += [(41.3, 69.2), (41.3000001, 69.2), (-41.3, -110.8), (10.0, 179.999), (10.0, -179.999)]
+    lats, lons = as_coords([{"lat": lat, "lon": lon} for lat, lon in points])
+
+    for lat, lon in [(41.3, 69.2), (10.0, 179.999), (-89.0, 0.0)]:
+        expected = [calc_distance(lat, lon, p_lat, p_lon) for p_lat, p_lon in points]
+        np.testing.assert_allclose(distances_from(lat, lon, lats, lons), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_distance_matrix_matches_rows():
+    rnd = random.Random(2)
+    origins, points = random_points(rnd, 7), random_points(rnd, 50)
+    o_lats, o_lons = np.array(origins).T
+    p_lats, p_lons = np.array(points).T
+
+    matrix = distance_matrix(o_lats, o_lons, p_lats, p_lons)
+
+    assert matrix.shape == (7, 50)
+    for row, (lat, lon) in zip(matrix, origins):
+        np.testing.assert_allclose(row, distances_from(lat, lon, p_lats, p_lons), rtol=1e-12)
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 50, 100])
+def test_top_k_sorted(k):
+    distances = np.random.default_rng(3).uniform(0, 100, 50)
+    indices = top_k(distances, k)
+    assert list(indices) == list(np.argsort(distances)[:k])
+
+
+def test_nearest_k_with_radius():
+    rnd = random.Random(4)
+    points = [(41.3 + rnd.uniform(-0.5, 0.5), 69.2 + rnd.uniform(-0.5, 0.5)) for _ in range(1000)]
+    lats, lons = np.array(points).T
+
+    indices, distances = nearest_k(41.3, 69.2, lats, lons, k=10, radius_km=5.0)
+
+    expected = sorted(
+        (calc_distance(41.3, 69.2, lat, lon), index) for index, (lat, lon) in enumerate(points)
+    )
+    expected = [item for item in expected if item[0] <= 5.0][:10]
+    assert list(indices) == [index for _, index in expected]
+    np.testing.assert_allclose(distances, [distance for distance, _ in expected], rtol=1e-9)
@@ -0,0 +1,75 @@
+import math
+import random
+
+import pytest
+
+from database import geohash
+from database.geohash import PREFIX_UPPER_BOUND, STORED_PRECISION
+from utils.misc.get_distance import calc_distance
+
+
+def in_prefix_range(stored, prefix):
+    # The btree range the geohash search scans for one cell
+    return prefix <= stored < prefix + PREFIX_UPPER_BOUND
+
+
+def test_encode_known_value():
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    # A shorter geohash is a prefix of a longer one
+    assert geohash.encode(57.64911, 10.40744, 5) == "u4pru"
+
+
+def test_decode_center_inside_cell():
+    rnd = random.Random(3)
+    for _ in range(200):
+        lat, lon = rnd.uniform(-89, 89), rnd.uniform(-180, 179.999)
+        for precision in (1, 4, 7):
+            cell = geohash.encode(lat, lon, precision)
+            height, width = geohash.cell_size_deg(precision)
+            center_lat, center_lon = geohash.decode_center(cell)
+            assert abs(center_lat - lat) <= height / 2
+            assert abs(center_lon - lon) <= width / 2
+            assert geohash.encode(center_lat, center_lon, precision) == cell
+
+
+def test_prefix_range_matches_cell():
+    rnd = random.Random(5)
+    points = [(41.3 + rnd.uniform(-0.3, 0.3), 69.2 + rnd.uniform(-0.3, 0.3)) for _ in range(500)]
+    stored = [geohash.encode(lat, lon, STORED_PRECISION) for lat, lon in points]
+
+    for precision in (4, 5, 6):
+        prefix = geohash.encode(41.3, 69.2, precision)
+        for (lat, lon), value in zip(points, stored):
+            in_cell = geohash.encode(lat, lon, precision) == prefix
+            assert in_prefix_range(value, prefix) == in_cell
+
+
+@pytest.mark.parametrize("precision", [4, 5, 6])
+def test_neighbours_cover_radius(precision):
+    rnd = random.Random(precision)
+    for _ in range(100):
+        lat, lon = rnd.uniform(-60, 60), rnd.uniform(-180, 180)
+        cells = geohash.neighbours(geohash.encode(lat, lon, precision))
+        radius = geohash.covered_radius_km(lat, precision)
+        assert len(cells) == 9
+
+        for _ in range(20):
+            # A point at most `radius` away in a random direction
+            bearing = rnd.uniform(0, 2 * math.pi)
+            step_km = rnd.uniform(0, radius) * 0.999
+            other_lat = lat + step_km / 110.57 * math.cos(bearing)
+            other_lon = lon + step_km / (111.32 * math.cos(math.radians(lat))) * math.sin(bearing)
+            other_lon = (other_lon + 180.0) % 360.0 - 180.0
+            if calc_distance(lat, lon, other_lat, other_lon) > radius:
+                continue
+            assert geohash.encode(other_lat, other_lon, precision) in cells
+
+
+def test_neighbours_at_edges():
+    # Longitude wraps at the antimeridian
+    east = geohash.encode(10.0, 179.99, 3)
+    assert geohash.encode(10.0, -179.99, 3) in geohash.neighbours(east)
+
+    # Rows beyond the pole are skipped
+    polar = geohash.neighbours(geohash.encode(89.9, 0.0, 2))
+    assert len(polar) == 6
@@ -0,0 +1,46 @@
+from database.metrics import Histogram
+
+
+def test_percentile_is_bucket_upper_bound():
+    histogram = Histogram([1, 2, 5, 10])
+    for value in (0.5, 1.5, 2, 3, 20):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 0, 1]
+    assert histogram.percentile(20) == 1
+    assert histogram.percentile(50) == 2
+    assert histogram.percentile(60) == 2
+    assert histogram.percentile(80) == 5
+    # Beyond the last bound only the observed max is known
+    assert histogram.percentile(95) == 20
+    assert histogram.percentile(100) == 20
+
+
+def test_percentile_capped_at_max():
+    histogram = Histogram([1, 10, 100])
+    for value in (3, 4, 6):
+        histogram.observe(value)
+
+    assert histogram.percentile(50) == 6
+    assert histogram.percentile(99) == 6
+
+
+def test_percentile_uniform_samples():
+    histogram = Histogram([10, 20, 50, 100, 250])
+    for value in range(1, 201):
+        histogram.observe(value)
+
+    assert histogram.count == 200
+    assert histogram.max == 200
+    assert histogram.percentile(5) == 10
+    assert histogram.percentile(50) == 100
+    assert histogram.percentile(99) == 200
+
+
+def test_empty_histogram():
+    histogram = Histogram([1, 2])
+    assert histogram.percentile(50) == 0.0
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 0
+    assert snapshot["avg"] == 0.0
+    assert snapshot["buckets"] == {}
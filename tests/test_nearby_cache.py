@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from database import Place
+from utils.misc import nearby_cache
+from utils.misc.get_distance import calc_distance
+
+KEY = ("autoservice", None, False, "test")
+
+
+def make_place(index, lat, lon):
+    return Place(
+        id=f"p{index}", name=f"Place {index}", lat=lat, lon=lon, address=None, phone=None,
+        services=("Elektrik",), working_days=[], working_hours={}, is_24_7=True,
+        weekday_mask=None, open_min=None, close_min=None, updated_at=None,
+    )
+
+
+def nearest(places, lat, lon, limit):
+    ranked = sorted(places, key=lambda place: calc_distance(lat, lon, place.lat, place.lon))[:limit]
+    return [place.with_distance(calc_distance(lat, lon, place.lat, place.lon)) for place in ranked]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    nearby_cache.clear()
+    yield
+    nearby_cache.clear()
+
+
+def test_lookup_miss():
+    assert nearby_cache.lookup(KEY, 41.3, 69.2, 5) is None
+
+
+def test_lookup_is_exact_or_stale():
+    rnd = random.Random(17)
+    places = [make_place(i, 41.3 + rnd.uniform(-0.1, 0.1), 69.2 + rnd.uniform(-0.1, 0.1)) for i in range(500)]
+    origin = (41.3, 69.2)
+    limit = nearby_cache.candidate_limit(5)
+    nearby_cache.store(KEY, *origin, nearest(places, *origin, limit), limit)
+
+    hits = stale = 0
+    for _ in range(300):
+        lat, lon = origin[0] + rnd.uniform(-0.01, 0.01), origin[1] + rnd.uniform(-0.01, 0.01)
+        k = rnd.choice([1, 5, 10])
+        ranked = nearby_cache.lookup(KEY, lat, lon, k)
+        if ranked is None:
+            stale += 1
+            continue
+        hits += 1
+        # A hit must be the true k nearest over every place, not just the cached ones
+        assert [place.id for _, place in ranked] == [place.id for place in nearest(places, lat, lon, k)]
+
+    assert hits and stale
+
+
+def test_lookup_bound_uses_reach_and_shift():
+    # Candidates 1..4 km north of the origin; the set hit the limit, so more may exist
+    places = [make_place(i, 41.3 + i / 110.57, 69.2) for i in range(1, 5)]
+    candidates = [place.with_distance(calc_distance(41.3, 69.2, place.lat, place.lon)) for place in places]
+    nearby_cache.store(KEY, 41.3, 69.2, candidates, limit=4)
+    reach = candidates[-1].distance_km
+
+    # From the origin every cached place is within reach
+    assert [place.id for _, place in nearby_cache.lookup(KEY, 41.3, 69.2, 4)] == ["p1", "p2", "p3", "p4"]
+
+    # 1 km south: the 4th candidate is 5 km away but only reach - shift (3 km) is guaranteed
+    south = 41.3 - 1 / 110.57
+    assert nearby_cache.lookup(KEY, south, 69.2, 4) is None
+    ranked = nearby_cache.lookup(KEY, south, 69.2, 2)
+    assert [place.id for _, place in ranked] == ["p1", "p2"]
+    assert ranked[-1][0] <= reach - calc_distance(south, 69.2, 41.3, 69.2)
+
+    # More results than candidates can't be guaranteed either
+    assert nearby_cache.lookup(KEY, 41.3, 69.2, 5) is None
+
+
+def test_complete_set_always_hits():
+    places = [make_place(i, 41.3 + i / 110.57, 69.2) for i in range(1, 4)]
+    candidates = [place.with_distance(calc_distance(41.3, 69.2, place.lat, place.lon)) for place in places]
+    # Fewer rows than the limit: the database had nothing more to return
+    nearby_cache.store(KEY, 41.3, 69.2, candidates, limit=20)
+
+    # Re-ranked from the user's own location (north of every candidate)
+    ranked = nearby_cache.lookup(KEY, 41.35, 69.25, 10)
+    assert [place.id for _, place in ranked] == ["p3", "p2", "p1"]
+
+
+def test_predicate_is_rechecked():
+    places = [make_place(i, 41.3 + i / 110.57, 69.2) for i in range(1, 4)]
+    candidates = [place.with_distance(calc_distance(41.3, 69.2, place.lat, place.lon)) for place in places]
+    nearby_cache.store(KEY, 41.3, 69.2, candidates, limit=20)
+
+    ranked = nearby_cache.lookup(KEY, 41.3, 69.2, 10, predicate=lambda place: place.id != "p2")
+    assert [place.id for _, place in ranked] == ["p1", "p3"]
+
+
+def test_invalidate_place_near_cached_cell():
+    places = [make_place(i, 41.3 + i / 110.57, 69.2) for i in range(1, 5)]
+    candidates = [place.with_distance(calc_distance(41.3, 69.2, place.lat, place.lon)) for place in places]
+    nearby_cache.store(KEY, 41.3, 69.2, candidates, limit=4)
+
+    # Far outside the candidates' reach: the cell stays
+    assert nearby_cache.invalidate_place("autoservice", {"id": "new", "lat": 42.3, "lon": 69.2}) == 0
+    # Closer than the farthest candidate: it could be among the k nearest
+    assert nearby_cache.invalidate_place("autoservice", {"id": "new", "lat": 41.301, "lon": 69.2}) == 1
+    assert nearby_cache.lookup(KEY, 41.3, 69.2, 1) is None
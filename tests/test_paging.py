@@ -0,0 +1,57 @@
+import uuid
+
+from utils.misc.paging import CALLBACK_DATA_LIMIT, PAGING_SERVICES, PageCursor
+
+
+def make_cursor(**overrides):
+    fields = dict(
+        place_type="autoservice",
+        service="Dvigatel tamiri",
+        open_now=True,
+        start=997,
+        lat_micro=-41_311_080,
+        lon_micro=-179_279_770,
+        after_mm=999_999_999,
+        after_id=str(uuid.uuid4()),
+        edit=False,
+    )
+    fields.update(overrides)
+    return PageCursor(**fields)
+
+
+def test_uuid_id_fits_callback_data():
+    cursor = make_cursor()
+    assert len(cursor.after_id) == 36
+
+    data = cursor.encode()
+
+    assert data is not None
+    assert len(data.encode()) <= CALLBACK_DATA_LIMIT
+    assert PageCursor.decode(data) == cursor
+
+
+def test_every_service_round_trips():
+    for service in PAGING_SERVICES + (None,):
+        cursor = make_cursor(service=service, place_type="carwash", edit=True)
+        assert PageCursor.decode(cursor.encode()) == cursor
+
+
+def test_plain_id_round_trips():
+    cursor = make_cursor(after_id="ChIJ:abc-123", open_now=False)
+    assert PageCursor.decode(cursor.encode()) == cursor
+
+
+def test_too_long_id_is_not_encoded():
+    assert make_cursor(after_id="x" * 64).encode() is None
+
+
+def test_unknown_service_is_not_encoded():
+    assert make_cursor(service="Kasaprab").encode() is None
+
+
+def test_invalid_data_is_rejected():
+    data = make_cursor().encode()
+    assert PageCursor.decode("nx:zz") is None
+    assert PageCursor.decode("xx" + data[2:]) is None
+    assert PageCursor.decode("nx:x" + data[4:]) is None
+    assert PageCursor.decode(data.replace(":", ":!", 1)) is None
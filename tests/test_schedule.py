@@ -0,0 +1,98 @@
+import asyncio
+import itertools
+import os
+
+import pytest
+
+from database.queries import QUERIES
+from database.schedule import ALL_DAYS_MASK, MINUTES_PER_DAY, compile_schedule, is_open, parse_hhmm
+
+MONDAY, TUESDAY, SUNDAY = 0, 1, 6
+
+SCHEDULES = [
+    # (weekday_mask, open_min, close_min, is_24_7)
+    (ALL_DAYS_MASK, 0, MINUTES_PER_DAY, True),
+    (0b0011111, 9 * 60, 18 * 60, False),        # Mon-Fri 09:00-18:00
+    (0b1000001, 22 * 60, 2 * 60, False),        # Mon, Sun 22:00-02:00
+    (ALL_DAYS_MASK, 0, MINUTES_PER_DAY, False),  # round the clock, not flagged 24/7
+    (0b0000100, None, None, False),             # unknown hours
+    (None, None, None, False),                  # never compiled
+]
+
+
+def test_parse_hhmm():
+    assert parse_hhmm("09:30") == 570
+    assert parse_hhmm(" 24:00 ") == MINUTES_PER_DAY
+    assert parse_hhmm("24:01") is None
+    assert parse_hhmm("9") is None
+    assert parse_hhmm(None) is None
+
+
+def test_compile_schedule():
+    assert compile_schedule([0, 2], {"start": "09:00", "end": "18:00"}) == (0b101, 540, 1080)
+    # No days means every day; invalid days are ignored
+    assert compile_schedule([], {"start": "09:00", "end": "18:00"})[0] == ALL_DAYS_MASK
+    assert compile_schedule([7, -1], {"start": "09:00", "end": "18:00"})[0] == ALL_DAYS_MASK
+    assert compile_schedule([1], {}, is_24_7=True) == (ALL_DAYS_MASK, 0, MINUTES_PER_DAY)
+    assert compile_schedule([1], {"start": "09:00"}) == (0b10, None, None)
+    assert compile_schedule(None, {"start": "10:00", "end": "23:59"}) == (ALL_DAYS_MASK, 600, MINUTES_PER_DAY)
+    assert compile_schedule(None, {"start": "00:00", "end": "00:00"}) == (ALL_DAYS_MASK, 0, MINUTES_PER_DAY)
+    assert compile_schedule([6], {"start": "22:00", "end": "02:00"}) == (0b1000000, 1320, 120)
+
+
+def test_is_open_daytime():
+    mask, open_min, close_min = compile_schedule([0, 1, 2, 3, 4], {"start": "09:00", "end": "18:00"})
+    assert is_open(mask, open_min, close_min, False, MONDAY, 9 * 60)
+    assert not is_open(mask, open_min, close_min, False, MONDAY, 18 * 60)
+    assert not is_open(mask, open_min, close_min, False, MONDAY, 8 * 60 + 59)
+    assert not is_open(mask, open_min, close_min, False, SUNDAY, 12 * 60)
+
+
+def test_is_open_overnight():
+    mask, open_min, close_min = compile_schedule([6], {"start": "22:00", "end": "02:00"})
+    assert is_open(mask, open_min, close_min, False, SUNDAY, 23 * 60)
+    # Sunday's shift runs into Monday morning
+    assert is_open(mask, open_min, close_min, False, MONDAY, 60)
+    assert not is_open(mask, open_min, close_min, False, MONDAY, 2 * 60)
+    assert not is_open(mask, open_min, close_min, False, MONDAY, 23 * 60)
+    assert not is_open(mask, open_min, close_min, False, SUNDAY, 60)
+
+
+def test_is_open_unknown_hours():
+    assert is_open(None, None, None, True, TUESDAY, 0)
+    assert not is_open(0b10, None, None, False, TUESDAY, 600)
+    assert not is_open(None, None, None, False, TUESDAY, 600)
+
+
+def _sql(value):
+    return "NULL" if value is None else str(value)
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_sql_filter_matches_is_open():
+    asyncpg = pytest.importorskip("asyncpg")
+    values = ", ".join(
+        f"({index}, {_sql(mask)}, {_sql(open_min)}, {_sql(close_min)}, {always})"
+        for index, (mask, open_min, close_min, always) in enumerate(SCHEDULES)
+    )
+    query = f"""
+        SELECT ord FROM (VALUES {values}) AS places(ord, weekday_mask, open_min, close_min, is_24_7)
+        WHERE TRUE {QUERIES["filter_open_now"].format(n=1, m=2, p=3)}
+        ORDER BY ord
+    """
+    clocks = itertools.product(range(7), (0, 60, 119, 120, 540, 1079, 1080, 1320, 1439))
+
+    async def run():
+        conn = await asyncpg.connect(os.environ["TEST_DATABASE_URL"])
+        try:
+            for weekday, minute in clocks:
+                rows = await conn.fetch(query, 1 << weekday, minute, 1 << ((weekday - 1) % 7))
+                expected = [
+                    index for index, (mask, open_min, close_min, always) in enumerate(SCHEDULES)
+                    if is_open(mask, open_min, close_min, always, weekday, minute)
+                ]
+                assert [row["ord"] for row in rows] == expected, (weekday, minute)
+        finally:
+            await conn.close()
+
+    asyncio.run(run())
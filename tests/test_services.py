@@ -0,0 +1,25 @@
+from database.services import SERVICE_ALIASES, normalize_service, normalize_services
+
+
+def test_normalize_service_strips_label_prefix():
+    assert normalize_service("⚡ Elektrik") == "Elektrik"
+    assert normalize_service("🔧  Kuzov tamiri ") == "Kuzov tamiri"
+    assert normalize_service("Elektrik") == "Elektrik"
+
+
+def test_normalize_service_maps_aliases():
+    assert normalize_service("🔍 G'ildirak tekshirish") == "Razval"
+    assert normalize_service("Tanirovka") == "Tonirovka"
+    for alias, name in SERVICE_ALIASES.items():
+        assert normalize_service(alias) == name
+
+
+def test_normalize_services():
+    labels = ["⚡ Elektrik", "Elektrik", "", "  ", "🪟 Tanirovka", "Tonirovka", "Shovqun izolatsiyasi"]
+    assert normalize_services(labels) == ["Elektrik", "Tonirovka", "Shumka"]
+
+
+def test_normalize_services_empty():
+    assert normalize_services(None) == []
+    assert normalize_services([]) == []
+    assert normalize_services(("Razval",)) == ["Razval"]
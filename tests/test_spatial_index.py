@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from database import Place
+from utils.misc.get_distance import calc_distance
+from utils.misc.spatial_index import GridIndex
+
+SERVICES = ["Elektrik", "Razval", "Shumka"]
+
+
+def make_place(index, lat, lon, services=("Elektrik",)):
+    return Place(
+        id=f"p{index}", name=f"Place {index}", lat=lat, lon=lon, address=None, phone=None,
+        services=tuple(services), working_days=[], working_hours={}, is_24_7=True,
+        weekday_mask=None, open_min=None, close_min=None, updated_at=None,
+    )
+
+
+def random_places(rnd, count, center=(41.3, 69.2), spread=0.5):
+    return [
+        make_place(
+            index,
+            center[0] + rnd.uniform(-spread, spread),
+            center[1] + rnd.uniform(-spread, spread),
+            rnd.sample(SERVICES, rnd.randint(1, len(SERVICES))),
+        )
+        for index in range(count)
+    ]
+
+
+def brute_force(places, lat, lon, k, radius_km, predicate=None):
+    ranked = sorted(
+        (calc_distance(lat, lon, place.lat, place.lon), place.id)
+        for place in places
+        if predicate is None or predicate(place)
+    )
+    return [(distance, place_id) for distance, place_id in ranked if distance <= radius_km][:k]
+
+
+@pytest.mark.parametrize("cell_deg", [0.01, 0.05, 0.3])
+def test_nearest_matches_brute_force(cell_deg):
+    rnd = random.Random(7)
+    places = random_places(rnd, 2000)
+    index = GridIndex("autoservice", cell_deg=cell_deg)
+    index.upsert_many(places)
+
+    for _ in range(50):
+        lat, lon = 41.3 + rnd.uniform(-0.7, 0.7), 69.2 + rnd.uniform(-0.7, 0.7)
+        k = rnd.choice([1, 3, 10, 50])
+        radius_km = rnd.choice([2.0, 10.0, 50.0])
+        hits = index.nearest(lat, lon, k=k, radius_km=radius_km)
+        assert [(distance, place.id) for distance, place in hits] == brute_force(places, lat, lon, k, radius_km)
+
+
+def test_nearest_with_predicate():
+    rnd = random.Random(11)
+    places = random_places(rnd, 1000)
+    index = GridIndex("autoservice")
+    index.upsert_many(places)
+
+    def predicate(place):
+        return "Shumka" in place.services
+
+    for _ in range(20):
+        lat, lon = 41.3 + rnd.uniform(-0.5, 0.5), 69.2 + rnd.uniform(-0.5, 0.5)
+        hits = index.nearest(lat, lon, k=10, radius_km=50.0, predicate=predicate)
+        assert [(distance, place.id) for distance, place in hits] == brute_force(places, lat, lon, 10, 50.0, predicate)
+
+
+def test_nearest_after_upsert_and_remove():
+    index = GridIndex("autoservice")
+    index.upsert_many([make_place(1, 41.30, 69.20), make_place(2, 41.31, 69.21)])
+
+    # Moving a place re-buckets it; removing it drops it from results
+    index.upsert(make_place(1, 41.50, 69.50))
+    index.remove("p2")
+
+    hits = index.nearest(41.30, 69.20, k=5, radius_km=100.0)
+    assert [place.id for _, place in hits] == ["p1"]
+    assert hits[0][1].lat == 41.50
+    assert len(index) == 1
+
+
+def test_nearest_empty_and_out_of_radius():
+    index = GridIndex("autoservice")
+    assert index.nearest(41.3, 69.2, k=5) == []
+
+    index.upsert(make_place(1, 42.3, 69.2))
+    assert index.nearest(41.3, 69.2, k=5, radius_km=50.0) == []
+    assert index.nearest(41.3, 69.2, k=0, radius_km=500.0) == []
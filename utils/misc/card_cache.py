@@ -0,0 +1,105 @@
+# utils/misc/card_cache.py
+"""
+Cache of pre-rendered place cards.
+
+Everything on a result card except its position in the list and the
+distance is fixed per place, so the card text is rendered once into
+three segments around those two values and reused until the place
+changes. Entries are keyed by ``(kind, place_type, place_id, updated_at,
+locale)``: a newer row never matches an old entry, and upserts evict the
+place's entries so memory is not held by stale versions.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+from database import Place, add_upsert_listener
+from utils.misc.lru_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = int(os.getenv("CARD_CACHE_SIZE", "2048"))
+
+# Cards are only rendered in Uzbek for now
+DEFAULT_LOCALE = "uz"
+
+
+@dataclass(frozen=True)
+class CardTemplate:
+    """
+    A rendered card waiting for its index and distance.
+
+    Attributes:
+        parts: Text before the index, between index and distance, after the distance
+        keyboard: Keyboard of the card, if it does not depend on the index
+    """
+    parts: Tuple[str, str, str]
+    keyboard: Optional[InlineKeyboardMarkup] = None
+
+    def render(self, index: int, distance_km: float) -> str:
+        """Card text for one search result."""
+        head, middle, tail = self.parts
+        return f"{head}{index}{middle}{distance_km:.2f}{tail}"
+
+
+_cache = TTLCache(max_size=MAX_SIZE, ttl=None)
+_stats = {"invalidated": 0}
+
+
+def get_template(
+    kind: str,
+    place_type: str,
+    place: Place,
+    build: Callable[[], CardTemplate],
+    locale: str = DEFAULT_LOCALE,
+) -> CardTemplate:
+    """
+    Cached template of a place card, built with ``build()`` on a miss.
+
+    Args:
+        kind: Card layout ("card", "summary", ...)
+        place_type: "autoservice" or "carwash"
+        place: Place the card shows
+        build: Renders the template for ``place``
+        locale: Language of the card
+    """
+    key = (kind, place_type, place.id, place.updated_at, locale)
+    template = _cache.get(key)
+    if template is None:
+        template = build()
+        _cache.set(key, template)
+    return template
+
+
+def invalidate_place(place_type: str, data: Optional[Dict[str, Any]]) -> int:
+    """
+    Drop the cards of an upserted place.
+
+    ``data=None`` (bulk upsert) drops every card of the place type.
+    """
+    place_id = data.get("id") if data is not None else None
+
+    def affected(key: Hashable, template: CardTemplate) -> bool:
+        return key[1] == place_type and (place_id is None or key[2] == place_id)
+
+    removed = _cache.evict_where(affected)
+    _stats["invalidated"] += removed
+    if removed:
+        logger.debug(f"Card cache: {removed} cards invalidated by {place_type} upsert")
+    return removed
+
+
+def clear() -> None:
+    """Drop every cached card."""
+    _cache.clear()
+
+
+def get_card_cache_stats() -> Dict[str, Any]:
+    """Size, hit rate and invalidations of the card cache."""
+    return {**_cache.stats(), **_stats}
+
+
+add_upsert_listener(invalidate_place)
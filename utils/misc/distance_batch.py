@@ -0,0 +1,123 @@
+# utils/misc/distance_batch.py
+"""
+Vectorized great-circle distances with NumPy.
+
+Batch counterpart of ``calc_distance``: works on contiguous float64
+latitude/longitude arrays instead of lists of places, for in-memory
+ranking, bulk analytics and offline jobs.
+"""
+from operator import attrgetter, itemgetter
+from typing import Any, Iterable, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from database import Place
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def as_coords(places: Iterable[Union[Place, Mapping[str, Any]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract contiguous float64 lat/lon arrays from places.
+
+    Args:
+        places: ``Place`` objects (or anything with ``lat``/``lon``
+            attributes) or dicts with "lat" and "lon" keys, not mixed
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ``(lats, lons)`` in degrees.
+    """
+    places = places if isinstance(places, list) else list(places)
+    if places and isinstance(places[0], Mapping):
+        get_lat, get_lon = itemgetter("lat"), itemgetter("lon")
+    else:
+        get_lat, get_lon = attrgetter("lat"), attrgetter("lon")
+    count = len(places)
+    lats = np.fromiter(map(get_lat, places), dtype=np.float64, count=count)
+    lons = np.fromiter(map(get_lon, places), dtype=np.float64, count=count)
+    return lats, lons
+
+
+def distances_from(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Haversine distances from one origin to N points.
+
+    Args:
+        lat: Origin latitude in degrees
+        lon: Origin longitude in degrees
+        lats: Array of N latitudes in degrees
+        lons: Array of N longitudes in degrees
+
+    Returns:
+        np.ndarray: N distances in kilometers.
+    """
+    lat1 = np.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(lons, dtype=np.float64)) - np.radians(lon)
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distance_matrix(
+    lats_a: np.ndarray,
+    lons_a: np.ndarray,
+    lats_b: np.ndarray,
+    lons_b: np.ndarray,
+) -> np.ndarray:
+    """
+    Haversine distances between M origins and N points.
+
+    The result holds M×N float64 values, so callers with large inputs
+    should process the origins in chunks.
+
+    Returns:
+        np.ndarray: Matrix of shape (M, N) in kilometers.
+    """
+    lat1 = np.radians(np.asarray(lats_a, dtype=np.float64))[:, np.newaxis]
+    lon1 = np.radians(np.asarray(lons_a, dtype=np.float64))[:, np.newaxis]
+    lat2 = np.radians(np.asarray(lats_b, dtype=np.float64))[np.newaxis, :]
+    lon2 = np.radians(np.asarray(lons_b, dtype=np.float64))[np.newaxis, :]
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def top_k(distances: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the ``k`` smallest distances, sorted ascending.
+
+    Uses ``argpartition`` so the cost is O(N + k log k) instead of a full sort.
+    """
+    n = distances.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(distances, kind="stable")
+    part = np.argpartition(distances, k - 1)[:k]
+    return part[np.argsort(distances[part], kind="stable")]
+
+
+def nearest_k(
+    lat: float,
+    lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    k: int,
+    radius_km: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The ``k`` nearest points to an origin, optionally within a radius.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ``(indices, distances_km)`` sorted by distance.
+    """
+    distances = distances_from(lat, lon, lats, lons)
+    if radius_km is not None:
+        candidates = np.flatnonzero(distances <= radius_km)
+        order = top_k(distances[candidates], k)
+        indices = candidates[order]
+    else:
+        indices = top_k(distances, k)
+    return indices, distances[indices]
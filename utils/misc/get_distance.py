@@ -1,21 +1,49 @@
 # utils/misc/get_distance.py
 import math
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Callable
 from aiogram.types import Location
-from database import get_nearby_places
+from database import Place, get_nearby_places, get_nearby_places_after
+from database.schedule import local_clock, place_is_open
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Adaptiv qidiruv: kichik radiusdan boshlab, k ta joy topilguncha kengaytiramiz
+SEARCH_START_RADIUS_KM = 2.0
+SEARCH_MAX_RADIUS_KM = 50.0
+SEARCH_GROWTH_FACTOR = 3.0
+
+# Database qidiruvlari bo'yicha metrikalar
+SEARCH_STATS: Dict[str, int] = {
+    "searches": 0,      # database ga borgan qidiruvlar
+    "queries": 0,       # bajarilgan SQL so'rovlar
+    "expansions": 0,    # radius kengaytirishlar soni
+    "candidates": 0,    # database qaytargan qatorlar
+}
+
+def get_search_stats() -> Dict[str, int]:
+    """
+    Adaptiv qidiruv metrikalarining nusxasi
+    """
+    return dict(SEARCH_STATS)
+
 async def choose_shortest(
     location: Union[Location, dict],
     max_results: Optional[int] = 10,
-    place_type: str = "autoservice"
-) -> List[Dict[str, Any]]:
+    place_type: str = "autoservice",
+    service: Optional[str] = None,
+    open_now: bool = False
+) -> List[Place]:
     """
     Database dan eng yaqin joylarni topish
+
+    service berilsa, faqat shu xizmatni ko'rsatadigan joylar qaytariladi.
+    open_now=True bo'lsa, faqat hozir ochiq joylar qaytariladi.
     """
-    logger.debug(f"choose_shortest chaqirildi: place_type={place_type}, max_results={max_results}")
+    logger.debug(
+        f"choose_shortest chaqirildi: place_type={place_type}, max_results={max_results}, "
+        f"service={service}, open_now={open_now}"
+    )
     
     if isinstance(location, Location):
         user_lat = location.latitude
@@ -31,39 +59,57 @@ async def choose_shortest(
 
     logger.debug(f"Foydalanuvchi koordinatalari: lat={user_lat}, lon={user_lon}")
 
+    from utils.misc.spatial_index import get_index
+    from utils.misc import nearby_cache
+    k = max_results or 10
+    index = get_index(place_type)
+
+    # Yaqin atrofdagi qidiruvlar keshi: nomzodlar saqlanadi, masofa har safar
+    # qayta hisoblanadi. Filtrsiz qidiruvga issiq indeks keshsiz ham tez javob
+    # beradi; xizmat bo'yicha qidiruvda mos joylar siyrak, indeks ko'p katakni
+    # ko'rib chiqadi - shuning uchun kesh indeksdan oldin turadi.
+    key = None
+    if service or index is None:
+        key = nearby_cache.cache_key(user_lat, user_lon, place_type, service, open_now)
+        cached = nearby_cache.lookup(key, user_lat, user_lon, k, predicate=_build_predicate(None, open_now))
+        if cached is not None:
+            logger.debug(f"Keshdan {len(cached)} ta joy olindi")
+            return [place.with_distance(round(distance, 2)) for distance, place in cached]
+    # Kesh to'ldiriladigan bo'lsa, keyingi foydalanuvchilar uchun ko'proq nomzod olamiz
+    limit = nearby_cache.candidate_limit(k) if key is not None else k
+
+    # Issiq indeks bo'lsa, DB ga bormasdan javob beramiz
+    if index is not None:
+        predicate = _build_predicate(service, open_now)
+        hits = index.nearest(user_lat, user_lon, k=limit, radius_km=SEARCH_MAX_RADIUS_KM, predicate=predicate)
+        if hits:
+            logger.debug(f"Indeksdan {len(hits)} ta joy topildi")
+            places = [place.with_distance(distance) for distance, place in hits]
+            if key is not None:
+                nearby_cache.store(key, user_lat, user_lon, places, limit)
+            return [place.with_distance(round(place.distance_km, 2)) for place in places[:k]]
+        logger.debug("Indeksda joy topilmadi, database ga murojaat qilamiz")
+
     try:
         # Database dan ma'lumot olish
-        places = await get_nearby_places(
-            user_lat, 
-            user_lon, 
-            radius_km=50.0,
-            place_type=place_type
+        places = await _search_database(
+            user_lat,
+            user_lon,
+            k=limit,
+            place_type=place_type,
+            service=service,
+            open_now=open_now
         )
+        if places and key is not None:
+            # Bo'sh natija xatolik ham bo'lishi mumkin, uni keshlamaymiz
+            nearby_cache.store(key, user_lat, user_lon, places, limit)
         
         if not places:
             logger.debug("Database dan hech qanday joy topilmadi")
             return []
         
-        # Kerakli formatga o'tkazish
-        results = []
-        for place in places[:max_results]:
-            # Google Maps URL yaratish
-            gmaps_url = f"https://maps.google.com/?q={place['lat']},{place['lon']}"
-            
-            results.append({
-                "id": place["id"],
-                "name": place["name"],
-                "distance_km": round(place["distance_km"], 2),
-                "address": place["address"],
-                "phone": place["phone"],
-                "lat": place["lat"],
-                "lon": place["lon"],
-                "services": place["services"],
-                "working_days": place["working_days"],
-                "working_hours": place["working_hours"],
-                "is_24_7": place["is_24_7"],
-                "gmaps_url": gmaps_url
-            })
+        # Masofani yaxlitlash (qolgan maydonlar o'zgarmaydi)
+        results = [place.with_distance(round(place.distance_km, 2)) for place in places[:k]]
         
         logger.debug(f"Jami {len(results)} ta joy topildi")
         return results
@@ -72,6 +118,105 @@ async def choose_shortest(
         logger.error(f"Database dan ma'lumot olishda xatolik: {e}")
         return []
 
+async def _search_database(
+    lat: float,
+    lon: float,
+    k: int,
+    place_type: str,
+    service: Optional[str],
+    open_now: bool
+) -> List[Place]:
+    """
+    Radiusni geometrik kengaytirib, k ta eng yaqin joyni database dan olish
+
+    Har bir bosqich radius ichidagi eng yaqin k ta joyni qaytaradi, shuning
+    uchun k ta topilgan zahoti natija aniq bo'ladi.
+    """
+    SEARCH_STATS["searches"] += 1
+    radius_km = SEARCH_START_RADIUS_KM
+    while True:
+        places = await get_nearby_places(
+            lat,
+            lon,
+            radius_km=radius_km,
+            place_type=place_type,
+            service=service,
+            open_now=open_now,
+            limit=k,
+            # Indeks, kesh va "Keyingi" sahifalari Haversine bo'yicha tartiblaydi;
+            # PostGIS KNN (sferoid) tartibi ular bilan mos kelmaydi
+            knn=False
+        )
+        SEARCH_STATS["queries"] += 1
+        SEARCH_STATS["candidates"] += len(places)
+
+        if len(places) >= k or radius_km >= SEARCH_MAX_RADIUS_KM:
+            logger.debug(f"Qidiruv radiusi: {radius_km:.1f} km, topildi: {len(places)}")
+            return places
+
+        radius_km = min(radius_km * SEARCH_GROWTH_FACTOR, SEARCH_MAX_RADIUS_KM)
+        SEARCH_STATS["expansions"] += 1
+
+async def choose_next(
+    lat: float,
+    lon: float,
+    after_mm: int,
+    after_id: str,
+    max_results: int = 3,
+    place_type: str = "autoservice",
+    service: Optional[str] = None,
+    open_now: bool = False
+) -> List[Place]:
+    """
+    Keyingi sahifa: kursordan (after_mm, after_id) keyingi eng yaqin joylar
+
+    Radius oxirgi ko'rsatilgan joy masofasidan boshlab kengaytiriladi,
+    shuning uchun har sahifada butun 50 km qayta ko'rib chiqilmaydi.
+    """
+    SEARCH_STATS["searches"] += 1
+    radius_km = min(after_mm / 1_000_000 + SEARCH_START_RADIUS_KM, SEARCH_MAX_RADIUS_KM)
+    while True:
+        places = await get_nearby_places_after(
+            lat,
+            lon,
+            after_mm,
+            after_id,
+            radius_km=radius_km,
+            place_type=place_type,
+            service=service,
+            open_now=open_now,
+            limit=max_results
+        )
+        SEARCH_STATS["queries"] += 1
+        SEARCH_STATS["candidates"] += len(places)
+
+        if len(places) >= max_results or radius_km >= SEARCH_MAX_RADIUS_KM:
+            return [place.with_distance(round(place.distance_km, 2)) for place in places]
+
+        radius_km = min(radius_km * SEARCH_GROWTH_FACTOR, SEARCH_MAX_RADIUS_KM)
+        SEARCH_STATS["expansions"] += 1
+
+def offers_service(place: Place, service: str) -> bool:
+    """
+    Joy berilgan xizmatni ko'rsatadimi
+    """
+    return service in (place.services or [])
+
+def _build_predicate(service: Optional[str], open_now: bool) -> Optional[Callable[[Place], bool]]:
+    """
+    Indeks uchun filtr funksiyasini yaratish
+    """
+    if not service and not open_now:
+        return None
+    weekday, minute = local_clock()
+
+    def predicate(place: Place) -> bool:
+        if service and not offers_service(place, service):
+            return False
+        return not open_now or place_is_open(place, weekday, minute)
+
+    return predicate
+
 def calc_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Ikkita nuqta orasidagi masofani hisoblash (km)
@@ -88,6 +233,14 @@ def calc_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
 
+def distance_mm(lat: float, lon: float, place: Place) -> int:
+    """
+    Sahifalash kursori uchun masofa (butun millimetr)
+
+    database dagi nearby_places_after tartibiga mos keladi.
+    """
+    return math.floor(calc_distance(lat, lon, place.lat, place.lon) * 1_000_000)
+
 def format_distance(distance_km: float) -> str:
     """
     Masofani formatlash
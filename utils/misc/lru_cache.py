@@ -0,0 +1,91 @@
+# utils/misc/lru_cache.py
+"""
+Bounded in-memory cache with TTL expiry and LRU eviction.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Dictionary-like cache limited by size and entry age.
+
+    The least recently used entry is evicted once ``max_size`` is reached,
+    and entries older than ``ttl`` seconds are treated as missing.
+
+    Attributes:
+        max_size: Maximum number of entries kept
+        ttl: Entry lifetime in seconds (None keeps entries until evicted)
+        hits: Number of successful lookups
+        misses: Number of lookups that found nothing or an expired entry
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None, counting a hit or a miss."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove an entry and return its value, if present."""
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def evict_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Remove every entry for which ``predicate(key, value)`` is true.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        doomed = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in doomed:
+            del self._data[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,179 @@
+# utils/misc/nearby_cache.py
+"""
+Cache of nearby-search candidates keyed by quantized location.
+
+Users often search from the same spots (malls, metro stations, home
+districts). An index or database search for one user stores a larger
+candidate set under ``(place_type, service, open_now, cell)``. Later
+searches from the same cell rank those candidates by their own exact
+distance. The cached set is only used when it provably contains the
+user's true k nearest places; otherwise the lookup counts as stale and
+the caller goes to the database.
+
+``choose_shortest`` consults the cache for service-filtered searches,
+ahead of the spatial index: matching places are sparse, so the index
+has to scan many grid cells to find k of them. Unfiltered searches go
+straight to a loaded index, and the cache only serves them on cold start.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from database import Place, add_upsert_listener
+from database.geohash import encode as geohash_encode
+from utils.misc.get_distance import SEARCH_MAX_RADIUS_KM, calc_distance
+from utils.misc.lru_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Cells are geohash prefixes (precision 6 is ~1.2 km x 0.6 km)
+CELL_PRECISION = int(os.getenv("NEARBY_CACHE_GEOHASH_PRECISION", "6"))
+MAX_SIZE = int(os.getenv("NEARBY_CACHE_SIZE", "2048"))
+TTL_SECONDS = float(os.getenv("NEARBY_CACHE_TTL_SECONDS", "120"))
+
+# How many candidates to fetch per cached cell, relative to k
+CANDIDATE_FACTOR = 4
+MIN_CANDIDATES = 20
+
+
+@dataclass(frozen=True)
+class CandidateSet:
+    """
+    Places fetched around one origin.
+
+    Attributes:
+        origin: ``(lat, lon)`` the database search was made from
+        places: Places sorted by distance from ``origin``
+        reach_km: Distance from ``origin`` of the farthest candidate
+        complete: True if the database had no more places to return
+    """
+    origin: Tuple[float, float]
+    places: List[Place]
+    reach_km: float
+    complete: bool
+
+
+_cache = TTLCache(max_size=MAX_SIZE, ttl=TTL_SECONDS)
+_stats = {"stale": 0, "invalidated": 0}
+
+
+def candidate_limit(k: int) -> int:
+    """Number of candidates to fetch when filling the cache for ``k`` results."""
+    return max(k * CANDIDATE_FACTOR, MIN_CANDIDATES)
+
+
+def cache_key(lat: float, lon: float, place_type: str, service: Optional[str], open_now: bool) -> Hashable:
+    """Key of the geohash cell containing ``(lat, lon)``."""
+    return (place_type, service, open_now, geohash_encode(lat, lon, CELL_PRECISION))
+
+
+def lookup(
+    key: Hashable,
+    lat: float,
+    lon: float,
+    k: int,
+    predicate: Optional[Callable[[Place], bool]] = None,
+) -> Optional[List[Tuple[float, Place]]]:
+    """
+    Rank cached candidates for a user location.
+
+    ``predicate`` re-checks time-dependent filters (open now) on every hit,
+    since the candidates were filtered when they were fetched.
+
+    Returns:
+        Optional[List[Tuple[float, Place]]]: ``(distance_km, place)``
+        pairs for the ``k`` nearest places, or None on a miss or when the
+        cached set cannot guarantee the exact answer.
+    """
+    entry: Optional[CandidateSet] = _cache.get(key)
+    if entry is None:
+        return None
+
+    ranked = sorted(
+        (
+            (calc_distance(lat, lon, p.lat, p.lon), p)
+            for p in entry.places
+            if predicate is None or predicate(p)
+        ),
+        key=lambda item: item[0],
+    )[:k]
+
+    if not entry.complete:
+        # Any place outside the set is at least reach_km - shift from the user
+        shift = calc_distance(lat, lon, entry.origin[0], entry.origin[1])
+        if len(ranked) < k or ranked[-1][0] > entry.reach_km - shift:
+            _stats["stale"] += 1
+            return None
+    return ranked
+
+
+def store(key: Hashable, lat: float, lon: float, places: List[Place], limit: int) -> None:
+    """Store the candidates of a database search made from ``(lat, lon)``."""
+    reach = max((p.distance_km for p in places), default=0.0)
+    _cache.set(key, CandidateSet(
+        origin=(lat, lon),
+        places=places,
+        reach_km=reach,
+        complete=len(places) < limit,
+    ))
+
+
+def invalidate_place(place_type: str, data: Optional[Dict[str, Any]]) -> int:
+    """
+    Drop cached cells that an upserted place could belong to.
+
+    A cell is affected if it already holds the place, or if the place's
+    position falls within the cell's candidate reach (the whole search
+    radius for complete sets). ``data=None`` (bulk upsert) drops every
+    cell of the place type.
+    """
+    if data is None:
+        removed = _cache.evict_where(lambda key, entry: key[0] == place_type)
+        _stats["invalidated"] += removed
+        return removed
+
+    try:
+        lat, lon = float(data["lat"]), float(data["lon"])
+    except (KeyError, TypeError, ValueError):
+        lat = lon = None
+    place_id = data.get("id")
+
+    def affected(key: Hashable, entry: CandidateSet) -> bool:
+        if key[0] != place_type:
+            return False
+        if any(p.id == place_id for p in entry.places):
+            return True
+        if lat is None:
+            return True
+        reach = SEARCH_MAX_RADIUS_KM if entry.complete else entry.reach_km
+        return calc_distance(entry.origin[0], entry.origin[1], lat, lon) <= reach
+
+    removed = _cache.evict_where(affected)
+    _stats["invalidated"] += removed
+    if removed:
+        logger.debug(f"Nearby cache: {removed} cells invalidated by {place_type} upsert")
+    return removed
+
+
+def clear() -> None:
+    """Drop every cached cell."""
+    _cache.clear()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters of the nearby-results cache.
+
+    Stale lookups found an entry but still had to go to the database,
+    so they are reported as misses.
+    """
+    stats = {**_cache.stats(), **_stats}
+    stats["hits"] -= _stats["stale"]
+    stats["misses"] += _stats["stale"]
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+add_upsert_listener(invalidate_place)
@@ -0,0 +1,154 @@
+# utils/misc/paging.py
+"""
+Keyset cursor of the "➡️ Keyingi" button, packed into callback data.
+
+Telegram limits callback data to 64 bytes, so the cursor is compact:
+
+    nx:<type><service><open_now><edit>:<start>:<distance mm>:<lat>:<lon>:<id>
+
+Numbers are base36, the origin is stored in integer microdegrees and a
+canonical UUID id (partner places) is stored as 22 characters of
+URL-safe base64 behind a ``*``. Other ids are stored as they are.
+"""
+import base64
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+# Telegram callback_data chegarasi (bayt)
+CALLBACK_DATA_LIMIT = 64
+
+PREFIX = "nx:"
+
+# Kursordagi xizmat raqamlari (faqat oxiriga qo'shing, aks holda eski
+# tugmalardagi raqamlar boshqa xizmatni bildiradi)
+PAGING_SERVICES = (
+    "Elektrik", "Kuzov tamiri", "Dvigatel tamiri", "Vulkanizatsiya",
+    "Razval", "Tonirovka", "Shumka", "Universal",
+)
+
+TYPE_CODES = {"autoservice": "a", "carwash": "c"}
+CODE_TYPES = {code: place_type for place_type, code in TYPE_CODES.items()}
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def to_base36(number: int) -> str:
+    """Butun sonni base36 ga o'tkazish (manfiy sonlar "-" bilan)"""
+    if number < 0:
+        return "-" + to_base36(-number)
+    digits = []
+    while True:
+        number, rest = divmod(number, 36)
+        digits.append(_DIGITS[rest])
+        if not number:
+            return "".join(reversed(digits))
+
+
+def to_micro(degrees: float) -> int:
+    """Koordinatani mikrogradusga (butun son) o'tkazish"""
+    return round(degrees * 1_000_000)
+
+
+def pack_id(place_id: str) -> str:
+    """Kanonik UUID ni 22 belgiga qisqartirish; boshqa ID lar o'zgarmaydi"""
+    try:
+        parsed = uuid.UUID(place_id)
+    except ValueError:
+        return place_id
+    if str(parsed) != place_id:
+        return place_id
+    return "*" + base64.urlsafe_b64encode(parsed.bytes).decode().rstrip("=")
+
+
+def unpack_id(packed: str) -> str:
+    """pack_id natijasini asl ID ga qaytarish"""
+    if packed.startswith("*"):
+        return str(uuid.UUID(bytes=base64.urlsafe_b64decode(packed[1:] + "==")))
+    return packed
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Keyingi sahifani topish uchun hamma narsa (foydalanuvchi holati kerak emas).
+
+    Attributes:
+        place_type: "autoservice" yoki "carwash"
+        service: Xizmat filtri (PAGING_SERVICES dan) yoki None
+        open_now: Faqat hozir ochiq joylar
+        start: Keyingi sahifadagi birinchi joyning tartib raqami
+        lat_micro: Qidiruv nuqtasi kengligi (mikrogradus)
+        lon_micro: Qidiruv nuqtasi uzunligi (mikrogradus)
+        after_mm: Oxirgi ko'rsatilgan joy masofasi (butun millimetr)
+        after_id: Oxirgi ko'rsatilgan joy ID si
+        edit: True - tugma bosilgan xabar tahrirlanadi, False - yangi xabar yuboriladi
+    """
+    place_type: str
+    service: Optional[str]
+    open_now: bool
+    start: int
+    lat_micro: int
+    lon_micro: int
+    after_mm: int
+    after_id: str
+    edit: bool = True
+
+    @property
+    def lat(self) -> float:
+        return self.lat_micro / 1_000_000
+
+    @property
+    def lon(self) -> float:
+        return self.lon_micro / 1_000_000
+
+    def encode(self) -> Optional[str]:
+        """
+        callback_data matni, yoki sig'masa / xizmat noma'lum bo'lsa None.
+        """
+        if self.service is None:
+            service_code = "-"
+        elif self.service in PAGING_SERVICES:
+            service_code = _DIGITS[PAGING_SERVICES.index(self.service)]
+        else:
+            return None
+        data = (
+            f"{PREFIX}{TYPE_CODES[self.place_type]}{service_code}{int(self.open_now)}{int(self.edit)}:"
+            f"{to_base36(self.start)}:{to_base36(self.after_mm)}:"
+            f"{to_base36(self.lat_micro)}:{to_base36(self.lon_micro)}:{pack_id(self.after_id)}"
+        )
+        if len(data.encode()) > CALLBACK_DATA_LIMIT:
+            return None
+        return data
+
+    @classmethod
+    def decode(cls, data: str) -> Optional["PageCursor"]:
+        """encode natijasini qayta o'qish; xato bo'lsa None"""
+        if not data.startswith(PREFIX):
+            return None
+        parts = data[len(PREFIX):].split(":", 5)
+        if len(parts) != 6 or len(parts[0]) != 4:
+            return None
+        flags, start, after_mm, lat_micro, lon_micro, packed_id = parts
+        type_code, service_code, open_now, edit = flags
+        place_type = CODE_TYPES.get(type_code)
+        try:
+            service = None if service_code == "-" else PAGING_SERVICES[_DIGITS.index(service_code)]
+            cursor = cls(
+                place_type=place_type or "",
+                service=service,
+                open_now=open_now == "1",
+                start=int(start, 36),
+                lat_micro=int(lat_micro, 36),
+                lon_micro=int(lon_micro, 36),
+                after_mm=int(after_mm, 36),
+                after_id=unpack_id(packed_id),
+                edit=edit == "1",
+            )
+        except (ValueError, IndexError):
+            return None
+        if place_type is None or not packed_id:
+            return None
+        if not (-90 <= cursor.lat <= 90) or not (-180 <= cursor.lon <= 180):
+            return None
+        return cursor
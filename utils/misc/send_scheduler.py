@@ -0,0 +1,94 @@
+# utils/misc/send_scheduler.py
+"""
+Concurrent Bot API sends with a shared concurrency limit.
+
+All Bot API sends go through one scheduler, so at most
+``SEND_CONCURRENCY`` requests are in flight across the whole bot, and a
+``TelegramRetryAfter`` (flood control) is honoured once before the send
+is given up. Messages to one chat whose order matters (result cards) go
+through ``scheduler.sequence``: they are sent one after another, while
+sends to other chats still run alongside them. ``scheduler.gather`` is
+for independent sends whose order doesn't matter.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List
+
+from aiogram.exceptions import TelegramRetryAfter
+
+logger = logging.getLogger(__name__)
+
+SEND_CONCURRENCY = int(os.getenv("SEND_CONCURRENCY", "3"))
+
+# Longest flood-control wait we are willing to sleep through
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+SendFactory = Callable[[], Awaitable[Any]]
+
+
+class SendScheduler:
+    """
+    Runs send coroutines under a semaphore.
+
+    Sends are passed as factories (``lambda: message.answer(...)``) so a
+    flood-controlled request can be created again for its retry.
+    """
+
+    def __init__(self, concurrency: int = SEND_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._stats = {"calls": 0, "retries": 0, "failed": 0}
+
+    async def send(self, factory: SendFactory) -> Any:
+        """Run one send; re-raises its error after counting it."""
+        async with self._semaphore:
+            self._stats["calls"] += 1
+            try:
+                return await factory()
+            except TelegramRetryAfter as e:
+                if e.retry_after > MAX_RETRY_AFTER_SECONDS:
+                    self._stats["failed"] += 1
+                    raise
+                logger.warning(f"⚠️ Flood control, {e.retry_after}s kutilmoqda")
+                await asyncio.sleep(e.retry_after)
+            except Exception:
+                self._stats["failed"] += 1
+                raise
+            self._stats["calls"] += 1
+            self._stats["retries"] += 1
+            try:
+                return await factory()
+            except Exception:
+                self._stats["failed"] += 1
+                raise
+
+    async def sequence(self, factories: List[SendFactory]) -> List[Any]:
+        """
+        Run sends one after another, e.g. messages to one chat.
+
+        Returns:
+            List[Any]: Result or exception of each send, in the given order.
+        """
+        results = []
+        for factory in factories:
+            try:
+                results.append(await self.send(factory))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def gather(self, factories: List[SendFactory]) -> List[Any]:
+        """
+        Run sends concurrently; they may complete in any order.
+
+        Returns:
+            List[Any]: Result or exception of each send, in the given order.
+        """
+        return await asyncio.gather(*(self.send(factory) for factory in factories), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        """API calls made (retries included), retries and failed sends."""
+        return dict(self._stats)
+
+
+scheduler = SendScheduler()
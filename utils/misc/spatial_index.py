@@ -0,0 +1,243 @@
+# utils/misc/spatial_index.py
+"""
+In-process spatial index for nearest-place lookups.
+
+Each place type (autoservice, carwash) is kept in a uniform lat/lon grid.
+The grid is loaded from the database at startup and refreshed incrementally
+using the ``updated_at`` column, so ``choose_shortest`` can answer
+k-nearest queries without a database round trip.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from database import Place, get_places_updated_since, iter_places
+from utils.misc.get_distance import calc_distance
+
+logger = logging.getLogger(__name__)
+
+PLACE_TYPES = ("autoservice", "carwash")
+
+# ~5.5 km of latitude per cell; small enough for dense cities,
+# large enough to keep the number of scanned cells low elsewhere.
+DEFAULT_CELL_DEG = 0.05
+
+# Rows committed by a transaction that started before the previous refresh
+# carry an older updated_at, so every refresh re-reads a short overlap window.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+REFRESH_INTERVAL = float(os.getenv("SPATIAL_INDEX_REFRESH_SECONDS", "30"))
+
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LON_EQUATOR = 111.32
+
+Cell = Tuple[int, int]
+
+
+class GridIndex:
+    """
+    Uniform grid index over the places of a single type.
+
+    Attributes:
+        place_type: Type of place stored ("autoservice" or "carwash")
+        cell_deg: Grid cell size in degrees
+        loaded: True once the initial load from the database succeeded
+        last_updated: Largest ``updated_at`` seen so far
+    """
+
+    def __init__(self, place_type: str, cell_deg: float = DEFAULT_CELL_DEG):
+        self.place_type = place_type
+        self.cell_deg = cell_deg
+        self.loaded = False
+        self.last_updated: Optional[datetime] = None
+        self._places: Dict[str, Place] = {}
+        self._cells: Dict[Cell, Dict[str, Place]] = {}
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def upsert(self, place: Place) -> None:
+        """Insert a place or move it to its new cell if it already exists."""
+        place_id = place.id
+        self.remove(place_id)
+
+        cell = self._cell(place.lat, place.lon)
+        self._cells.setdefault(cell, {})[place_id] = place
+        self._places[place_id] = place
+
+        updated_at = place.updated_at
+        if updated_at is not None and (self.last_updated is None or updated_at > self.last_updated):
+            self.last_updated = updated_at
+
+    def upsert_many(self, places: Iterable[Place]) -> int:
+        """Upsert several places and return how many were processed."""
+        count = 0
+        for place in places:
+            self.upsert(place)
+            count += 1
+        return count
+
+    def remove(self, place_id: str) -> None:
+        """Remove a place from the index if present."""
+        old = self._places.pop(place_id, None)
+        if old is None:
+            return
+        cell = self._cell(old.lat, old.lon)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(place_id, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def _ring(self, center: Cell, radius: int) -> Iterable[Cell]:
+        """Yield the cells lying exactly ``radius`` steps away from ``center``."""
+        ci, cj = center
+        if radius == 0:
+            yield center
+            return
+        for dj in range(-radius, radius + 1):
+            yield (ci - radius, cj + dj)
+            yield (ci + radius, cj + dj)
+        for di in range(-radius + 1, radius):
+            yield (ci + di, cj - radius)
+            yield (ci + di, cj + radius)
+
+    def _ring_min_km(self, lat: float, radius: int) -> float:
+        """
+        Lower bound of the distance to any cell outside ring ``radius``.
+
+        Uses the narrowest longitude span within the rings scanned so far,
+        so the bound stays conservative away from the equator.
+        """
+        span_deg = radius * self.cell_deg
+        widest_lat = min(abs(lat) + span_deg + self.cell_deg, 89.9)
+        km_per_deg = min(KM_PER_DEG_LAT, KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(widest_lat)))
+        return span_deg * km_per_deg
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        radius_km: float = 50.0,
+        predicate: Optional[Callable[[Place], bool]] = None,
+    ) -> List[Tuple[float, Place]]:
+        """
+        Find the ``k`` nearest places within ``radius_km``.
+
+        Args:
+            lat: Origin latitude
+            lon: Origin longitude
+            k: Maximum number of places to return
+            radius_km: Search radius in kilometers
+            predicate: Optional filter; places for which it returns False are skipped
+
+        Returns:
+            List[Tuple[float, Place]]: ``(distance_km, place)`` pairs
+            sorted by distance.
+        """
+        if k <= 0 or not self._cells:
+            return []
+
+        center = self._cell(lat, lon)
+        # Max-heap of the best k candidates, stored as (-distance, id, place)
+        best: List[Tuple[float, str, Place]] = []
+        max_rings = int(radius_km / self._ring_min_km(lat, 1)) + 2 if radius_km > 0 else 0
+
+        for ring in range(max_rings + 1):
+            for cell in self._ring(center, ring):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                for place_id, place in bucket.items():
+                    if predicate is not None and not predicate(place):
+                        continue
+                    distance = calc_distance(lat, lon, place.lat, place.lon)
+                    if distance > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, place_id, place))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, place_id, place))
+
+            # Everything beyond this ring is at least this far away
+            bound = self._ring_min_km(lat, ring)
+            if bound > radius_km:
+                break
+            if len(best) == k and bound >= -best[0][0]:
+                break
+
+        return sorted(((-neg, place) for neg, _, place in best), key=lambda item: item[0])
+
+    async def load(self) -> None:
+        """
+        Load every place of this type from the database.
+
+        Rows are streamed in chunks into a fresh grid that replaces the
+        current one only once the whole table has been read.
+        """
+        fresh = GridIndex(self.place_type, self.cell_deg)
+        async for chunk in iter_places(self.place_type):
+            fresh.upsert_many(chunk)
+        self._places, self._cells = fresh._places, fresh._cells
+        self.last_updated = fresh.last_updated
+        self.loaded = True
+        logger.info(f"✅ Spatial index loaded: {self.place_type} ({len(self)} places)")
+
+    async def refresh(self) -> int:
+        """
+        Apply rows changed since the last load or refresh.
+
+        Returns:
+            int: Number of rows applied.
+        """
+        if not self.loaded:
+            await self.load()
+            return len(self)
+
+        since = self.last_updated - REFRESH_OVERLAP if self.last_updated else None
+        rows = await get_places_updated_since(self.place_type, since)
+        applied = self.upsert_many(rows)
+        if applied:
+            logger.debug(f"Spatial index refreshed: {self.place_type} (+{applied})")
+        return applied
+
+
+place_indexes: Dict[str, GridIndex] = {
+    place_type: GridIndex(place_type) for place_type in PLACE_TYPES
+}
+
+
+def get_index(place_type: str) -> Optional[GridIndex]:
+    """Return the loaded index for a place type, or None on cold start."""
+    index = place_indexes.get(place_type)
+    if index is None or not index.loaded:
+        return None
+    return index
+
+
+async def load_indexes() -> None:
+    """Load all place indexes; failures leave the DB fallback in place."""
+    for index in place_indexes.values():
+        try:
+            await index.load()
+        except Exception as e:
+            logger.error(f"❌ Spatial index load error ({index.place_type}): {e}")
+
+
+async def run_refresh_loop(interval: float = REFRESH_INTERVAL) -> None:
+    """Periodically refresh all indexes until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        for index in place_indexes.values():
+            try:
+                await index.refresh()
+            except Exception as e:
+                logger.error(f"❌ Spatial index refresh error ({index.place_type}): {e}")